@@ -1,19 +1,1149 @@
 #!/usr/bin/env python3
 """
 TrustWipe Backend - Core wiping functionality
-Handles the actual data wiping operations using dd and shred commands
+Handles the actual data wiping operations using dd and shred commands,
+or the in-process native engine (O_DIRECT + pwrite)
 """
 
 import subprocess
 import os
+import re
+import errno
+import fcntl
+import mmap
+import stat
+import struct
 import time
 import psutil
 import platform
 from datetime import datetime
 import logging
+import threading
+import bisect
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from buffer_pool import BufferPool
+from write_pipeline import WritePipeline, WriteWatermark
+from wipe_journal import WipeJournal, JOURNAL_DIR
+from coverage_map import CoverageMap, COVERAGE_GRANULARITY, coverage_summary, describe_coverage
+from merkle_digest import MerkleDigest
+from wipe_verifier import (verify_device, skipped_result, StreamingVerifier, FAIL, VERIFY_LAG, VERIFY_REGION_SIZE,
+                           DEFAULT_RESIDUAL_FRACTION, MEDIA_ERRNOS)
+from pattern_generator import (FixedPattern, KeystreamPattern, PATTERN_BUFFER_SIZE, PASS_TABLES, KEY_SIZE,
+                               KEY_DERIVATION, DEFAULT_ALGORITHM, build_pass_patterns, pass_key, seed_commitment,
+                               write_seed_file)
+
+# Wipe engines selectable per wipe
+WIPE_ENGINES = ['dd', 'native', 'zerocopy']
+
+# Kernel-side copy methods tried in order by zero-copy passes
+ZERO_COPY_METHODS = ['copy_file_range', 'sendfile', 'splice']
+
+# dd's closing status line: "<n> bytes (...) copied, ..."
+DD_BYTES_COPIED = re.compile(r'^(\d+) bytes\b.*\bcopied', re.MULTILINE)
+
+# Native engine settings
+# All sizes are multiples of 3 so Gutmann's 3-byte patterns are generated once per pass
+NATIVE_BLOCK_SIZE = PATTERN_BUFFER_SIZE       # 48 MiB, close to the dd zero pass (bs=64M)
+QUEUED_BLOCK_SIZE = 12 * 1024 * 1024          # Per-write size when several writes are in flight
+STRIPE_SIZE = 2 * PATTERN_BUFFER_SIZE         # Unit of work claimed by parallel writers
+DIRECT_IO_ALIGNMENT = 4096             # Safe O_DIRECT alignment for 512e and 4Kn drives
+ZEROOUT_CHUNK = 1024 * 1024 * 1024    # Bytes per BLKZEROOUT/BLKDISCARD ioctl
+PROGRESS_INTERVAL = 0.5                # Seconds between progress callbacks
+FEED_CHUNK_SIZE = 8 * 1024 * 1024      # Keystream bytes generated per write into dd's stdin
+
+# Bad-sector tolerance: failing writes are bisected down to the logical sector
+BAD_SECTOR_RETRIES = 3                 # Attempts per sector after the bisection reaches it
+BAD_SECTOR_BACKOFF = 0.05              # Seconds before the first retry, doubled each time
+MAX_BAD_SECTORS = 65536                # Give up on a device with more unwritable sectors than this
+
+# Skip-if-clean final passes rewrite only the regions of a block that differ from the pattern
+REPAIR_REGION_SIZE = 1024 * 1024
+
+# Block device ioctls (linux/fs.h): _IO(0x12, nr)
+BLKDISCARD = 0x1277
+BLKZEROOUT = 0x127F
+
+
+def probe_zero_offload(device_path):
+    """
+    Probe whether a target can zero ranges in the kernel or on the device
+    
+    Args:
+        device_path (str): Device or file path
+        
+    Returns:
+        dict: block_device, write_zeroes_max_bytes, discard_max_bytes,
+              discard_granularity, logical_block_size
+    """
+    caps = {
+        'block_device': False,
+        'write_zeroes_max_bytes': 0,
+        'discard_max_bytes': 0,
+        'discard_granularity': 0,
+        'logical_block_size': 512,
+    }
+    
+    try:
+        st = os.stat(device_path)
+    except OSError:
+        return caps
+    if not stat.S_ISBLK(st.st_mode):
+        return caps
+    caps['block_device'] = True
+    
+    # Partitions keep their queue limits on the parent disk
+    sys_dir = os.path.realpath(f'/sys/dev/block/{os.major(st.st_rdev)}:{os.minor(st.st_rdev)}')
+    queue_dir = os.path.join(sys_dir, 'queue')
+    if not os.path.isdir(queue_dir):
+        queue_dir = os.path.join(os.path.dirname(sys_dir), 'queue')
+    
+    for key in ['write_zeroes_max_bytes', 'discard_max_bytes', 'discard_granularity', 'logical_block_size']:
+        try:
+            with open(os.path.join(queue_dir, key), 'r') as f:
+                caps[key] = int(f.read().strip())
+        except (OSError, ValueError):
+            pass
+    
+    return caps
+
+
+class StripeScheduler:
+    """
+    Splits a byte range into aligned stripes that workers claim one at a time
+    
+    Completed ranges are recorded exactly, so coverage can be checked after a
+    parallel pass instead of trusting every worker's exit status.
+    """
+
+    def __init__(self, size, stripe_size, start=0):
+        """
+        Args:
+            size (int): Total bytes to cover
+            stripe_size (int): Bytes per stripe (multiple of DIRECT_IO_ALIGNMENT)
+            start (int): Offset the first stripe starts at (resumed passes)
+        """
+        if stripe_size <= 0 or stripe_size % DIRECT_IO_ALIGNMENT:
+            raise ValueError(f"Stripe size must be a multiple of {DIRECT_IO_ALIGNMENT} bytes")
+        
+        self.size = size
+        self.stripe_size = stripe_size
+        self.start = start
+        self.completed_bytes = 0
+        self._next_offset = start
+        self._completed = []
+        self._lock = threading.Lock()
+    
+    def claim(self):
+        """Claim the next stripe; returns (start, end) or None when exhausted"""
+        with self._lock:
+            if self._next_offset >= self.size:
+                return None
+            start = self._next_offset
+            end = min(start + self.stripe_size, self.size)
+            self._next_offset = end
+            return start, end
+    
+    def complete(self, start, end):
+        """Record [start, end) as written"""
+        with self._lock:
+            self._completed.append((start, end))
+            self.completed_bytes += end - start
+    
+    def completed_ranges(self):
+        """Merged list of written (start, end) ranges"""
+        with self._lock:
+            ranges = sorted(self._completed)
+        
+        merged = []
+        for start, end in ranges:
+            if merged and start <= merged[-1][1]:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+            else:
+                merged.append((start, end))
+        return merged
+    
+    def high_water(self):
+        """End of the contiguous completed range that begins at `start`"""
+        ranges = self.completed_ranges()
+        if ranges and ranges[0][0] <= self.start:
+            return ranges[0][1]
+        return self.start
+    
+    def missing_ranges(self):
+        """Ranges of [start, size) that were never completed"""
+        missing = []
+        position = self.start
+        for start, end in self.completed_ranges():
+            if start > position:
+                missing.append((position, start))
+            position = max(position, end)
+        if position < self.size:
+            missing.append((position, self.size))
+        return missing
+
+
+class NativeWipeEngine:
+    """
+    In-process wipe engine
+    
+    Opens the target with O_DIRECT and writes page-aligned, reusable
+    buffers with os.pwrite, counting every byte in-process. With a queue
+    depth above 1, up to that many aligned writes are kept in flight at
+    once on a thread pool (os.pwrite releases the GIL), which is what
+    NVMe drives and SAN LUNs need to reach full bandwidth. Random and other
+    non-repeating patterns are generated by producer threads while the
+    writes run (see write_pipeline.py). Every completed write is marked in
+    an optional coverage map (see coverage_map.py). Works on block devices,
+    loop devices and regular files.
+    
+    With tolerate_errors, a write that fails with a media error is split in
+    halves until the failing logical sectors are isolated; those are retried
+    with backoff and, if they still fail, recorded in bad_ranges and left out
+    of the coverage map while the rest of the device is written as usual.
+    """
+
+    def __init__(self, device_path, block_size=None, direct=True, callback=None, queue_depth=1,
+                 pool=None, huge_pages=False, producers=1, tolerate_errors=False):
+        """
+        Args:
+            device_path (str): Device or file to overwrite
+            block_size (int): Bytes per write (multiple of DIRECT_IO_ALIGNMENT)
+            direct (bool): Bypass the page cache with O_DIRECT when supported
+            callback (callable): Progress callback (message, progress)
+            queue_depth (int): Number of writes kept in flight
+            pool (BufferPool): Shared buffer pool (default: a private pool on the shared budget)
+            huge_pages (bool): Back a private pool with transparent huge pages
+            producers (int): Threads generating data for non-repeating patterns
+            tolerate_errors (bool): Isolate, retry and record unwritable sectors instead of failing
+        """
+        if queue_depth < 1:
+            raise ValueError("Queue depth must be at least 1")
+        if producers < 1:
+            raise ValueError("Producer count must be at least 1")
+        if block_size is None:
+            block_size = NATIVE_BLOCK_SIZE if queue_depth == 1 else QUEUED_BLOCK_SIZE
+        if block_size <= 0 or block_size % DIRECT_IO_ALIGNMENT:
+            raise ValueError(f"Block size must be a multiple of {DIRECT_IO_ALIGNMENT} bytes")
+        
+        self.device_path = device_path
+        self.block_size = block_size
+        self.direct = direct
+        self.callback = callback
+        self.queue_depth = queue_depth
+        self.producers = producers
+        self.is_running = False
+        self.fd = None
+        self.size = None
+        self.direct_active = False
+        self.direct_supported = False
+        self.zero_capabilities = None
+        self.pool = pool
+        self.huge_pages = huge_pages
+        self._owns_pool = pool is None
+        self.buffers = []
+        self.bytes_done = 0
+        self.high_water = 0
+        self.verification = None
+        self.pass_stats = []
+        self.coverage = None
+        self.coverage_pass = 1
+        self.tolerate_errors = tolerate_errors
+        self.sector_size = 512
+        self.bad_ranges = []      # Sorted, merged [start, end) byte ranges that could not be written
+        self._bad_lock = threading.Lock()
+        self._side_fds = {}       # Extra descriptors on the target by open flags (see _side_fd)
+        self._fd_lock = threading.Lock()
+        self._pipeline = None
+        self.logger = logging.getLogger(__name__)
+    
+    def open(self):
+        """Open the target and take the first aligned write buffer from the pool"""
+        flags = os.O_RDWR
+        if hasattr(os, 'O_CLOEXEC'):
+            flags |= os.O_CLOEXEC
+        
+        if self.direct and hasattr(os, 'O_DIRECT'):
+            try:
+                self.fd = os.open(self.device_path, flags | os.O_DIRECT)
+                self.direct_active = self.direct_supported = True
+            except OSError as e:
+                # tmpfs and some network filesystems reject O_DIRECT
+                if e.errno != errno.EINVAL:
+                    raise
+                self.logger.warning(f"O_DIRECT not supported on {self.device_path}, using buffered I/O")
+        
+        if self.fd is None:
+            self.fd = os.open(self.device_path, flags)
+        
+        self.size = os.lseek(self.fd, 0, os.SEEK_END)
+        if self.tolerate_errors:
+            self.sector_size = probe_zero_offload(self.device_path)['logical_block_size'] or 512
+        if self._owns_pool:
+            buffer_size = min(self.block_size, self._round_up(max(self.size, 1)))
+            self.pool = BufferPool(buffer_size, huge_pages=self.huge_pages)
+        self._buffer(0)
+        self.is_running = True
+        return self
+    
+    def close(self):
+        """Return the buffers to the pool and close the file descriptor"""
+        self.is_running = False
+        for buffer in self.buffers:
+            buffer.release()
+        self.buffers = []
+        if self._owns_pool and self.pool is not None:
+            self.pool.close()
+            self.pool = None
+        for fd in self._side_fds.values():
+            os.close(fd)
+        self._side_fds = {}
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
+    
+    def __enter__(self):
+        return self.open()
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+    
+    def stop(self):
+        """Stop after the in-flight writes complete"""
+        self.is_running = False
+        if self._pipeline is not None:
+            self._pipeline.stop()
+    
+    def _buffer(self, slot):
+        """Return the pooled buffer for a queue slot, acquiring it on first use"""
+        while len(self.buffers) <= slot:
+            self.buffers.append(self.pool.acquire())
+        return self.buffers[slot]
+    
+    def _reserve_slots(self, count):
+        """
+        Acquire buffers for up to `count` slots without waiting on the budget
+        
+        Returns:
+            int: Slots that have a buffer (at least 1)
+        """
+        while len(self.buffers) < count:
+            buffer = self.pool.acquire(block=False)
+            if buffer is None:
+                self.logger.warning(
+                    f"Memory budget allows {len(self.buffers)} of {count} buffers; running with fewer in flight"
+                )
+                break
+            self.buffers.append(buffer)
+        return max(1, min(count, len(self.buffers)))
+    
+    def write_pass(self, pattern, description="pass", start=0):
+        """
+        Overwrite the target with a pattern source
+        
+        Args:
+            pattern: Object with fill(view, offset) and an optional period
+            description (str): Label used in progress messages
+            start (int): Offset to start at (resumed passes); earlier bytes are skipped
+            
+        Returns:
+            int: Bytes written
+        """
+        buffer_size = len(self._buffer(0))
+        self._restore_direct()
+        start = self._start_offset(start)
+        
+        # Fixed patterns whose period divides the buffer are generated once and
+        # shared by every in-flight write; other patterns go through the
+        # producer/consumer pipeline so generation overlaps the writes
+        reusable = bool(pattern.period) and buffer_size % pattern.period == 0
+        if not reusable:
+            return self._pipeline_pass(pattern, description, start)
+        
+        with self._buffer(0).view() as view:
+            pattern.fill(view, start)
+        
+        queue_depth = self.queue_depth
+        offset = start
+        watermark = WriteWatermark(start)
+        self.bytes_done = 0
+        free_slots = list(range(queue_depth - 1, -1, -1))
+        in_flight = {}
+        start_time = time.time()
+        last_report = start_time
+        
+        try:
+            with ThreadPoolExecutor(max_workers=queue_depth) as pool:
+                while in_flight or (offset < self.size and self.is_running):
+                    # Keep the queue full
+                    while free_slots and offset < self.size and self.is_running:
+                        slot = free_slots.pop()
+                        length = min(buffer_size, self.size - offset)
+                        view = self._buffer(0).view(length)
+                        future = pool.submit(self._pwrite_all, view, offset)
+                        in_flight[future] = (slot, view, offset)
+                        offset += length
+                    
+                    done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        slot, view, write_offset = in_flight.pop(future)
+                        length = len(view)
+                        view.release()
+                        free_slots.append(slot)
+                        future.result()
+                        watermark.complete(write_offset, write_offset + length)
+                        self._written(write_offset, write_offset + length)
+                        self.bytes_done += length
+                    self.high_water = watermark.offset
+                    
+                    now = time.time()
+                    if now - last_report >= PROGRESS_INTERVAL or self.high_water >= self.size:
+                        last_report = now
+                        self._report(description, self.high_water, now - start_time, start)
+            
+            os.fsync(self.fd)
+        finally:
+            for slot, view, _ in in_flight.values():
+                view.release()
+        
+        elapsed = time.time() - start_time
+        self.pass_stats.append({
+            'description': description,
+            'pattern': pattern.name,
+            'bytes_written': self.bytes_done,
+            'seconds': round(elapsed, 3),
+            'mb_per_sec': round((self.bytes_done / (1024 * 1024)) / elapsed, 1) if elapsed > 0 else None,
+            'direct_io': self.direct_active,
+            'queue_depth': queue_depth,
+        })
+        return self.bytes_done
+    
+    def written_offset(self):
+        """Contiguous high-water offset of the running pass, updated as writes complete"""
+        pipeline = self._pipeline
+        if pipeline is not None:
+            return pipeline.high_water
+        return self.high_water
+    
+    def write_verify_pass(self, pattern, description="pass", start=0,
+                          region_size=VERIFY_REGION_SIZE, lag=VERIFY_LAG, coverage=None, digest=None):
+        """
+        Write a pass and read it back region by region while it is being written
+        
+        Args:
+            pattern: Object with fill(view, offset) and an optional period
+            description (str): Label used in progress messages
+            start (int): Offset to start at (resumed passes)
+            region_size (int): Bytes per verified region
+            lag (int): Bytes the write front stays ahead of the read-back
+            coverage (CoverageMap): Marked with the ranges that read back correctly
+            digest (MerkleDigest): Fed every block read back
+            
+        Returns:
+            int: Bytes written (the result is left in self.verification)
+        """
+        start = self._start_offset(start)
+        verifier = StreamingVerifier(self.device_path, pattern, self.written_offset,
+                                     region_size=region_size, lag=lag, start=start, coverage=coverage,
+                                     digest=digest)
+        verifier.start()
+        try:
+            written = self.write_pass(pattern, description, start)
+        finally:
+            if not self.is_running:
+                verifier.stop()
+            self.verification = verifier.finish()
+        
+        self.pass_stats[-1]['verification'] = {
+            'status': self.verification['status'],
+            'bytes_checked': self.verification['bytes_checked'],
+            'seconds': self.verification['seconds'],
+        }
+        return written
+    
+    def repair_pass(self, pattern, description="repair pass", start=0, region_size=REPAIR_REGION_SIZE):
+        """
+        Skip-if-clean pass: read the target back and rewrite only what differs from the pattern
+        
+        Each block is read (the next one while the current one is checked) and
+        compared with the pattern by a single memcmp (bytes.startswith). A
+        block that differs is narrowed down to regions of `region_size`, and
+        only those are overwritten; a block that cannot be read is rewritten
+        whole. Bytes that already hold the pattern are counted as skipped
+        rather than written. Meant only for the final pass of a verified
+        wipe, typically a re-run over a device that is already mostly wiped.
+        
+        Args:
+            pattern: Object with fill(view, offset) and an optional period
+            description (str): Label used in progress messages
+            start (int): Offset to start at (resumed passes)
+            region_size (int): Bytes rewritten per mismatching region (multiple of DIRECT_IO_ALIGNMENT)
+            
+        Returns:
+            int: Bytes written
+        """
+        if region_size <= 0 or region_size % DIRECT_IO_ALIGNMENT:
+            raise ValueError(f"Region size must be a multiple of {DIRECT_IO_ALIGNMENT} bytes")
+        
+        slots = self._reserve_slots(2)
+        block_size = len(self._buffer(0))
+        self._restore_direct()
+        start = self._start_offset(start)
+        
+        # The expected data is compared with bytes.startswith, so it lives in a bytearray on the budget
+        budget = self.pool.budget
+        budget.reserve(block_size)
+        expected = bytearray(block_size)
+        reusable = bool(pattern.period) and block_size % pattern.period == 0
+        if reusable:
+            pattern.fill(memoryview(expected), start)
+        
+        self.bytes_done = 0
+        bytes_read = 0
+        bytes_skipped = 0
+        rewritten_regions = 0
+        start_time = time.time()
+        last_report = start_time
+        
+        try:
+            with ThreadPoolExecutor(max_workers=1) as reader:
+                def submit(index, offset):
+                    length = min(block_size, self.size - offset)
+                    buffer = self._buffer(index % slots)
+                    return reader.submit(self._read_block, buffer, offset, length), index, offset, length
+                
+                pending = submit(0, start) if start < self.size else None
+                try:
+                    while pending and self.is_running:
+                        future, index, offset, length = pending
+                        pending = None
+                        try:
+                            view = future.result()
+                        except OSError as e:
+                            if e.errno not in MEDIA_ERRNOS:
+                                raise
+                            view = None
+                        next_offset = offset + length
+                        if slots > 1 and next_offset < self.size:
+                            pending = submit(index + 1, next_offset)
+                        
+                        if not reusable:
+                            with memoryview(expected)[:length] as target:
+                                pattern.fill(target, offset)
+                        
+                        if view is not None and len(view) == length:
+                            bytes_read += length
+                            dirty = [] if expected.startswith(view) else self._dirty_regions(expected, view,
+                                                                                               region_size)
+                        else:
+                            # Unreadable or short: rewrite the whole block
+                            if view is None:
+                                self.logger.warning(f"Read error in block at {offset:,}; rewriting it")
+                            else:
+                                view.release()
+                            view = self._buffer(index % slots).view(length)
+                            dirty = [(0, length)]
+                        
+                        with view, memoryview(expected) as source:
+                            for region_start, region_end in dirty:
+                                view[region_start:region_end] = source[region_start:region_end]
+                                with view[region_start:region_end] as piece:
+                                    self._pwrite_all(piece, offset + region_start)
+                                self.bytes_done += region_end - region_start
+                                rewritten_regions += 1
+                        bytes_skipped += length - sum(region_end - region_start for region_start, region_end in dirty)
+                        self._written(offset, next_offset)
+                        self.high_water = next_offset
+                        
+                        if pending is None and next_offset < self.size and self.is_running:
+                            pending = submit(index + 1, next_offset)
+                        
+                        now = time.time()
+                        if now - last_report >= PROGRESS_INTERVAL or self.high_water >= self.size:
+                            last_report = now
+                            self._report(f"{description} (skip-if-clean, {bytes_skipped:,} bytes already clean)",
+                                         self.high_water, now - start_time, start)
+                finally:
+                    # Release the read-ahead buffer's view before the buffers go back to the pool
+                    if pending:
+                        try:
+                            pending[0].result().release()
+                        except OSError:
+                            pass
+            
+            if self.bytes_done:
+                os.fsync(self.fd)
+        finally:
+            budget.release(block_size)
+        
+        elapsed = time.time() - start_time
+        processed = self.high_water - start
+        self.pass_stats.append({
+            'description': description,
+            'pattern': pattern.name,
+            'mode': 'skip-if-clean',
+            'bytes_written': self.bytes_done,
+            'bytes_read': bytes_read,
+            'bytes_skipped': bytes_skipped,
+            'regions_rewritten': rewritten_regions,
+            'seconds': round(elapsed, 3),
+            'mb_per_sec': round((processed / (1024 * 1024)) / elapsed, 1) if elapsed > 0 else None,
+            'direct_io': self.direct_active,
+            'queue_depth': 1,
+        })
+        return self.bytes_done
+    
+    def _read_block(self, buffer, offset, length):
+        """Read `length` bytes at `offset` into a pooled buffer; returns a view of what was read"""
+        # O_DIRECT needs an aligned length; the buffer always has room for it
+        request = min(self._round_up(length), len(buffer))
+        with buffer.view(request) as target:
+            total = 0
+            while total < length:
+                with target[total:] as rest:
+                    count = os.preadv(self.fd, [rest], offset + total)
+                if count == 0:
+                    break
+                total += count
+        return buffer.view(min(total, length))
+    
+    @staticmethod
+    def _dirty_regions(expected, view, region_size):
+        """Merged [start, end) regions of `view` that differ from `expected`"""
+        dirty = []
+        for region_start in range(0, len(view), region_size):
+            region_end = min(region_start + region_size, len(view))
+            with view[region_start:region_end] as region:
+                if expected.startswith(region, region_start):
+                    continue
+            if dirty and dirty[-1][1] == region_start:
+                dirty[-1] = (dirty[-1][0], region_end)
+            else:
+                dirty.append((region_start, region_end))
+        return dirty
+    
+    def _pipeline_pass(self, pattern, description, start=0):
+        """
+        Overwrite the target with generated data through a WritePipeline
+        
+        Producers fill pooled buffers while `queue_depth` consumers write the
+        previous ones, with one spare buffer per producer so neither side
+        waits when both keep up (double buffering at queue depth 1).
+        
+        Returns:
+            int: Bytes written
+        """
+        consumers = self.queue_depth
+        slots = self._reserve_slots(consumers + self.producers)
+        consumers = max(1, min(consumers, slots - 1))
+        
+        pipeline = WritePipeline(self.buffers[:slots], pattern, self._pwrite_all, self.size,
+                                 producers=self.producers, consumers=consumers, start=start,
+                                 completed=self._written)
+        self._pipeline = pipeline
+        self.bytes_done = 0
+        start_time = time.time()
+        
+        def report(bytes_done):
+            self.bytes_done = bytes_done
+            self.high_water = pipeline.high_water
+            self._report(description, self.high_water, time.time() - start_time, start)
+        
+        try:
+            self.bytes_done = pipeline.run(report, PROGRESS_INTERVAL)
+            self.high_water = pipeline.high_water
+            os.fsync(self.fd)
+        finally:
+            self._pipeline = None
+        
+        elapsed = time.time() - start_time
+        self.pass_stats.append({
+            'description': description,
+            'pattern': pattern.name,
+            'bytes_written': self.bytes_done,
+            'seconds': round(elapsed, 3),
+            'mb_per_sec': round((self.bytes_done / (1024 * 1024)) / elapsed, 1) if elapsed > 0 else None,
+            'direct_io': self.direct_active,
+            'queue_depth': consumers,
+            'pipeline': pipeline.stats,
+        })
+        return self.bytes_done
+    
+    def write_pass_parallel(self, pattern, workers, stripe_size=STRIPE_SIZE, description="pass", start=0):
+        """
+        Overwrite the target with workers that each claim and fill whole stripes
+        
+        Every worker generates the pattern into its own buffer, so pattern
+        generation is parallel as well as the I/O.
+        
+        Args:
+            pattern: Object with fill(view, offset) and an optional period
+            workers (int): Number of worker threads
+            stripe_size (int): Bytes per claimed stripe
+            description (str): Label used in progress messages
+            start (int): Offset to start at (resumed passes)
+            
+        Returns:
+            StripeScheduler: Scheduler holding the exact completed ranges
+        """
+        buffer_size = len(self._buffer(0))
+        self._restore_direct()
+        start = self._start_offset(start)
+        
+        scheduler = StripeScheduler(self.size, stripe_size, start)
+        reusable = (bool(pattern.period) and buffer_size % pattern.period == 0
+                    and stripe_size % pattern.period == 0)
+        if reusable:
+            with self._buffer(0).view() as view:
+                pattern.fill(view, start)
+        else:
+            # Every worker needs its own buffer; take them up front, within budget
+            workers = self._reserve_slots(workers)
+        
+        worker_stats = [{'worker': i, 'bytes_written': 0, 'seconds': 0.0} for i in range(workers)]
+        
+        def run_worker(worker_id):
+            try:
+                write_stripes(worker_id)
+            except Exception:
+                # Stop the other workers claiming stripes
+                self.is_running = False
+                raise
+        
+        def write_stripes(worker_id):
+            buffer = self._buffer(0 if reusable else worker_id)
+            worker_start = time.time()
+            with buffer.view() as full_view:
+                while self.is_running:
+                    stripe = scheduler.claim()
+                    if stripe is None:
+                        break
+                    
+                    start, end = stripe
+                    position = start
+                    while position < end:
+                        length = min(buffer_size, end - position)
+                        with full_view[:length] as view:
+                            if not reusable:
+                                pattern.fill(view, position)
+                            self._pwrite_all(view, position)
+                        position += length
+                    
+                    scheduler.complete(start, end)
+                    self._written(start, end)
+                    worker_stats[worker_id]['bytes_written'] += end - start
+            worker_stats[worker_id]['seconds'] = time.time() - worker_start
+        
+        start_time = time.time()
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(run_worker, i) for i in range(workers)]
+            pending = set(futures)
+            while pending:
+                _, pending = wait(pending, timeout=PROGRESS_INTERVAL)
+                self.bytes_done = scheduler.completed_bytes
+                self.high_water = scheduler.high_water()
+                self._report(description, start + self.bytes_done, time.time() - start_time, start)
+            
+            for future in futures:
+                future.result()
+        
+        os.fsync(self.fd)
+        elapsed = time.time() - start_time
+        
+        for stats in worker_stats:
+            seconds = stats['seconds']
+            stats['seconds'] = round(seconds, 3)
+            stats['mb_per_sec'] = round((stats['bytes_written'] / (1024 * 1024)) / seconds, 1) if seconds > 0 else None
+        
+        self.pass_stats.append({
+            'description': description,
+            'pattern': pattern.name,
+            'bytes_written': scheduler.completed_bytes,
+            'seconds': round(elapsed, 3),
+            'mb_per_sec': round((scheduler.completed_bytes / (1024 * 1024)) / elapsed, 1) if elapsed > 0 else None,
+            'direct_io': self.direct_active,
+            'workers': worker_stats,
+        })
+        return scheduler
+    
+    def zero_offload_pass(self, description="zero pass", discard=False, start=0):
+        """
+        Zero the target inside the kernel with BLKZEROOUT
+        
+        The kernel uses the device's write-zeroes command when
+        write_zeroes_max_bytes is non-zero and writes zero pages itself
+        otherwise; either way no data crosses from user space.
+        
+        Args:
+            description (str): Label used in progress messages
+            discard (bool): BLKDISCARD the range first so SSDs drop their mappings
+            start (int): Offset to start at (resumed passes)
+            
+        Returns:
+            int: Bytes zeroed, or None if the target cannot be zeroed this way
+        """
+        caps = probe_zero_offload(self.device_path)
+        self.zero_capabilities = caps
+        if not caps['block_device']:
+            return None
+        
+        start = self._start_offset(start)
+        start_time = time.time()
+        
+        if discard and caps['discard_max_bytes']:
+            try:
+                self._range_ioctl(BLKDISCARD, "discard", start_time, start)
+            except OSError as e:
+                self.logger.warning(f"BLKDISCARD failed on {self.device_path}: {e}")
+        
+        try:
+            zeroed = self._range_ioctl(BLKZEROOUT, description, start_time, start) - start
+        except OSError as e:
+            if e.errno in (errno.ENOTTY, errno.EOPNOTSUPP, errno.EINVAL):
+                self.logger.warning(f"BLKZEROOUT not supported on {self.device_path}: {e}")
+                return None
+            raise
+        
+        os.fsync(self.fd)
+        elapsed = time.time() - start_time
+        self.bytes_done = zeroed
+        self.pass_stats.append({
+            'description': description,
+            'pattern': 'zeros',
+            'bytes_written': zeroed,
+            'seconds': round(elapsed, 3),
+            'mb_per_sec': round((zeroed / (1024 * 1024)) / elapsed, 1) if elapsed > 0 else None,
+            'offload': 'write_zeroes' if caps['write_zeroes_max_bytes'] else 'kernel',
+            'discard': bool(discard and caps['discard_max_bytes']),
+        })
+        return zeroed
+    
+    def zero_copy_pass(self, pattern, description="pass", start=0):
+        """
+        Write a fixed pattern without copying it through user space
+        
+        The pattern is written once into a page-cache-resident memfd (zeros
+        need no writing at all - an empty memfd reads as zeros), then the
+        kernel moves it to the target with copy_file_range, sendfile or
+        splice, whichever the target accepts first.
+        
+        Args:
+            pattern: FixedPattern to write
+            description (str): Label used in progress messages
+            start (int): Offset to start at (resumed passes)
+            
+        Returns:
+            int: Bytes written
+        """
+        if not pattern.period:
+            raise ValueError("Zero-copy passes need a fixed pattern")
+        
+        source_size = PATTERN_BUFFER_SIZE - PATTERN_BUFFER_SIZE % pattern.period
+        source_fd = os.memfd_create('trustwipe-pattern', os.MFD_CLOEXEC)
+        
+        # Page cache copies cannot use O_DIRECT; the pass ends with an fsync
+        if self.direct_active:
+            self._set_direct(False)
+        
+        start = self._start_offset(start)
+        offset = start
+        method = None
+        start_time = time.time()
+        last_report = start_time
+        
+        try:
+            os.ftruncate(source_fd, source_size)
+            if pattern.pattern.strip(b'\x00'):
+                with mmap.mmap(source_fd, source_size) as source, memoryview(source) as view:
+                    pattern.fill(view, 0)
+            
+            while offset < self.size and self.is_running:
+                # The source repeats every source_size bytes, a multiple of the period
+                source_offset = offset % source_size
+                count = min(source_size - source_offset, self.size - offset)
+                written, method = self._zero_copy_chunk(source_fd, source_offset, offset, count, method)
+                self._written(offset, offset + written)
+                offset += written
+                self.high_water = offset
+                
+                now = time.time()
+                if now - last_report >= PROGRESS_INTERVAL or offset >= self.size:
+                    last_report = now
+                    self._report(description, offset, now - start_time, start)
+            
+            os.fsync(self.fd)
+        finally:
+            os.close(source_fd)
+        
+        elapsed = time.time() - start_time
+        self.bytes_done = offset - start
+        self.pass_stats.append({
+            'description': description,
+            'pattern': pattern.name,
+            'bytes_written': self.bytes_done,
+            'seconds': round(elapsed, 3),
+            'mb_per_sec': round((self.bytes_done / (1024 * 1024)) / elapsed, 1) if elapsed > 0 else None,
+            'zero_copy': method,
+        })
+        return self.bytes_done
+    
+    def _zero_copy_chunk(self, source_fd, source_offset, offset, count, method):
+        """Copy one chunk in the kernel; probes ZERO_COPY_METHODS until one works"""
+        methods = [method] if method else ZERO_COPY_METHODS
+        
+        for candidate in methods:
+            try:
+                if candidate == 'copy_file_range':
+                    written = os.copy_file_range(source_fd, self.fd, count, source_offset, offset)
+                elif candidate == 'sendfile':
+                    os.lseek(self.fd, offset, os.SEEK_SET)
+                    written = os.sendfile(self.fd, source_fd, source_offset, count)
+                else:
+                    written = self._splice_chunk(source_fd, source_offset, offset, count)
+            except OSError as e:
+                if method or e.errno not in (errno.EXDEV, errno.EINVAL, errno.ENOSYS, errno.EOPNOTSUPP):
+                    raise
+                continue
+            
+            if written <= 0:
+                if method:
+                    raise IOError(f"{candidate} made no progress at offset {offset}")
+                continue
+            return written, candidate
+        
+        raise IOError(f"No zero-copy method supported for {self.device_path}")
+    
+    def _splice_chunk(self, source_fd, source_offset, offset, count):
+        """Move a chunk source -> pipe -> target with splice"""
+        read_end, write_end = os.pipe()
+        try:
+            try:
+                fcntl.fcntl(write_end, fcntl.F_SETPIPE_SZ, 1024 * 1024)
+            except OSError:
+                pass
+            
+            moved = os.splice(source_fd, write_end, count, offset_src=source_offset)
+            written = 0
+            while written < moved:
+                written += os.splice(read_end, self.fd, moved - written, offset_dst=offset + written)
+            return written
+        finally:
+            os.close(read_end)
+            os.close(write_end)
+    
+    def _range_ioctl(self, request, description, start_time, start=0):
+        """Issue a (start, length) block ioctl from `start` to the end in large ranges"""
+        offset = start
+        last_report = time.time()
+        while offset < self.size and self.is_running:
+            length = min(ZEROOUT_CHUNK, self.size - offset)
+            fcntl.ioctl(self.fd, request, struct.pack('QQ', offset, length))
+            if request == BLKZEROOUT:
+                self._written(offset, offset + length)
+                self.high_water = offset + length
+            offset += length
+            
+            now = time.time()
+            if now - last_report >= PROGRESS_INTERVAL or offset >= self.size:
+                last_report = now
+                self._report(description, offset, now - start_time, start)
+        return offset
+    
+    def _written(self, start, end):
+        """Mark [start, end) as written by the current pass in the coverage map, minus unwritable sectors"""
+        if self.coverage is None:
+            return
+        position = start
+        for bad_start, bad_end in self.bad_within(start, end):
+            self.coverage.mark(position, bad_start, self.coverage_pass)
+            position = bad_end
+        self.coverage.mark(position, end, self.coverage_pass)
+    
+    def bad_within(self, start, end):
+        """Recorded unwritable ranges that overlap [start, end)"""
+        with self._bad_lock:
+            if not self.bad_ranges:
+                return []
+            index = max(0, bisect.bisect_right(self.bad_ranges, (start, start)) - 1)
+            found = []
+            for bad_start, bad_end in self.bad_ranges[index:]:
+                if bad_start >= end:
+                    break
+                if bad_end > start:
+                    found.append((max(bad_start, start), min(bad_end, end)))
+            return found
+    
+    def _record_bad(self, start, end):
+        """Add an unwritable range, merged with its neighbours"""
+        with self._bad_lock:
+            index = bisect.bisect_left(self.bad_ranges, (start, end))
+            if index and self.bad_ranges[index - 1][1] >= start:
+                index -= 1
+                start = self.bad_ranges[index][0]
+                end = max(end, self.bad_ranges.pop(index)[1])
+            while index < len(self.bad_ranges) and self.bad_ranges[index][0] <= end:
+                end = max(end, self.bad_ranges.pop(index)[1])
+            self.bad_ranges.insert(index, (start, end))
+            bad_bytes = sum(bad_end - bad_start for bad_start, bad_end in self.bad_ranges)
+        
+        self.logger.warning(f"Unwritable sectors at {start:,}-{end:,} after {BAD_SECTOR_RETRIES} retries")
+        if bad_bytes > MAX_BAD_SECTORS * self.sector_size:
+            raise IOError(f"More than {MAX_BAD_SECTORS:,} unwritable sectors; the device is failing")
+    
+    def _bisect_write(self, view, offset):
+        """
+        Write a range whose write failed with a media error, isolating the bad sectors
+        
+        The range is halved (on sector boundaries) until each failing piece is
+        one logical sector; a sector is retried with exponential backoff and
+        recorded in bad_ranges if it never succeeds. The pieces are written
+        through their own synchronous descriptor (see _pwrite_sync), so every
+        media error surfaces at the write that hit it.
+        """
+        sector = self.sector_size
+        pending = [(0, len(view))]
+        while pending:
+            start, end = pending.pop()
+            if end - start > sector:
+                middle = start + max(sector, (end - start) // 2 // sector * sector)
+                for piece_start, piece_end in ((start, middle), (middle, end)):
+                    try:
+                        with view[piece_start:piece_end] as piece:
+                            self._pwrite_sync(piece, offset + piece_start)
+                    except OSError as e:
+                        if e.errno not in MEDIA_ERRNOS:
+                            raise
+                        pending.append((piece_start, piece_end))
+                continue
+            
+            for attempt in range(BAD_SECTOR_RETRIES):
+                time.sleep(BAD_SECTOR_BACKOFF * 2 ** attempt)
+                try:
+                    with view[start:end] as piece:
+                        self._pwrite_sync(piece, offset + start)
+                    break
+                except OSError as e:
+                    if e.errno not in MEDIA_ERRNOS:
+                        raise
+            else:
+                self._record_bad(offset + start, offset + end)
+    
+    def _pwrite_sync(self, view, offset):
+        """
+        pwrite a sector-aligned piece with O_DIRECT|O_SYNC, so the write itself reports media errors
+        
+        Pieces O_DIRECT cannot take (an unaligned last sector, filesystems without
+        O_DIRECT) fall back to O_SYNC through the page cache.
+        """
+        flags = os.O_SYNC
+        if self.direct_supported and not len(view) % self.sector_size:
+            flags |= os.O_DIRECT
+        while len(view):
+            try:
+                written = os.pwrite(self._side_fd(flags), view, offset)
+            except OSError as e:
+                if e.errno == errno.EINVAL and flags & getattr(os, 'O_DIRECT', 0):
+                    flags = os.O_SYNC
+                    continue
+                raise
+            view = view[written:]
+            offset += written
+    
+    def _restore_direct(self):
+        """Re-enable O_DIRECT at the start of a pass if the previous one ran without it"""
+        if self.direct_supported and not self.direct_active:
+            self._set_direct(True)
+    
+    def _pwrite_all(self, view, offset):
+        """pwrite a buffer completely; with tolerate_errors, media errors are isolated instead of raised"""
+        if not self.tolerate_errors:
+            return self._pwrite_range(view, offset)
+        try:
+            self._pwrite_range(view, offset)
+        except OSError as e:
+            if e.errno not in MEDIA_ERRNOS:
+                raise
+            self.logger.warning(f"Write error at {offset:,} ({len(view):,} bytes): {e}; isolating bad sectors")
+            self._bisect_write(view, offset)
+    
+    def _pwrite_range(self, view, offset):
+        """
+        pwrite a buffer completely, handling short writes and unaligned tails
+        
+        The flags of the shared descriptor are never changed here: with a
+        queue depth above 1 other writes are in flight on it. Unaligned tails
+        and writes O_DIRECT rejects go through a separate buffered descriptor
+        instead; the pass's closing fsync covers both.
+        """
+        fd = self.fd
+        if self.direct_supported and (not self.direct_active or len(view) % DIRECT_IO_ALIGNMENT):
+            # Unaligned tail (regular files only) - finish it through the page cache
+            fd = self._side_fd(0)
+        
+        while len(view):
+            try:
+                written = os.pwrite(fd, view, offset)
+            except OSError as e:
+                if e.errno == errno.EINVAL and fd == self.fd and self.direct_active:
+                    self.logger.warning(f"O_DIRECT write rejected at {offset:,}; using buffered I/O for this pass")
+                    with self._fd_lock:
+                        self.direct_active = False
+                    fd = self._side_fd(0)
+                    continue
+                raise
+            view = view[written:]
+            offset += written
+    
+    def _side_fd(self, flags):
+        """
+        Extra descriptor on the target with its own open flags, opened once and kept until close()
+        
+        Args:
+            flags (int): Flags added to O_RDWR (0 for buffered I/O)
+        """
+        with self._fd_lock:
+            fd = self._side_fds.get(flags)
+            if fd is None:
+                fd = os.open(self.device_path, os.O_RDWR | getattr(os, 'O_CLOEXEC', 0) | flags)
+                self._side_fds[flags] = fd
+            return fd
+    
+    def _set_direct(self, enabled):
+        """Toggle O_DIRECT on the shared descriptor; only while no other write is in flight"""
+        flags = fcntl.fcntl(self.fd, fcntl.F_GETFL)
+        flags = flags | os.O_DIRECT if enabled else flags & ~os.O_DIRECT
+        fcntl.fcntl(self.fd, fcntl.F_SETFL, flags)
+        self.direct_active = enabled
+    
+    def _start_offset(self, start):
+        """Align a resume offset down for O_DIRECT and reset the high-water mark to it"""
+        start = max(0, min(start, self.size))
+        start -= start % DIRECT_IO_ALIGNMENT
+        self.high_water = start
+        return start
+    
+    def _report(self, description, offset, elapsed, start=0):
+        """Report byte-exact progress through the callback"""
+        if not self.callback:
+            return
+        speed_mbps = ((offset - start) / (1024 * 1024)) / elapsed if elapsed > 0 else 0
+        progress = (offset / self.size) * 100 if self.size else 100
+        self.callback(
+            f"{description}: {offset:,}/{self.size:,} bytes @ {speed_mbps:.1f} MB/s",
+            round(progress, 1)
+        )
+    
+    @staticmethod
+    def _round_up(value):
+        return -(-value // DIRECT_IO_ALIGNMENT) * DIRECT_IO_ALIGNMENT
+
 
 class DataWiper:
-    def __init__(self, device_path, method="zeros", passes=3, callback=None):
+    def __init__(self, device_path, method="zeros", passes=3, callback=None, engine="dd", queue_depth=1,
+                 zero_offload=True, discard=False, resume=False, journal_dir=JOURNAL_DIR,
+                 verify=False, verify_fraction=1.0, fused_verify=False, verify_lag=VERIFY_LAG,
+                 verify_samples=None, residual_fraction=DEFAULT_RESIDUAL_FRACTION, verify_seed=None,
+                 seed_file=None, coverage_granularity=COVERAGE_GRANULARITY, tolerate_errors=False,
+                 skip_clean=False):
         """
         Initialize the data wiper
         
@@ -22,13 +1152,80 @@ class DataWiper:
             method (str): Wiping method (zeros, random, dod, gutmann)
             passes (int): Number of passes for supported methods
             callback (callable): Progress callback function
+            engine (str): Write engine - "dd" (subprocess), "native" (in-process pwrite)
+                or "zerocopy" (native, with fixed patterns moved by the kernel)
+            queue_depth (int): Writes kept in flight by the native engine
+            zero_offload (bool): Let the kernel/device zero ranges (BLKZEROOUT) on zero passes
+            discard (bool): BLKDISCARD before offloaded zero passes
+            resume (bool): Continue an interrupted wipe of the same device from its journal
+            journal_dir (str): Directory holding checkpoint journals
+            verify (bool): Read the device back after the final pass
+            verify_fraction (float): Share of the device read back, spread evenly
+            fused_verify (bool): Native engine: verify regions while the final pass is still writing
+            verify_lag (int): Bytes the write front stays ahead of fused read-back
+            verify_samples (int): Read back a stratified sample of this many sectors
+                instead of the whole device (0 = sized for 99% confidence)
+            residual_fraction (float): Unwiped share sampled verification reports a detection probability for
+            verify_seed (int): Sample plan seed (default: random; recorded in the result)
+            seed_file (str): Save the random pattern seed here (owner-only) for later verification
+            coverage_granularity (int): Bytes per block of the written/verified coverage maps
+            tolerate_errors (bool): Native engines: isolate and record unwritable sectors and keep
+                going instead of failing the wipe on the first media error
+            skip_clean (bool): Native engines, verified runs only: the final pass reads the device and
+                rewrites only the regions that do not already hold its pattern (re-wipes, repairs)
         """
+        if engine not in WIPE_ENGINES:
+            raise ValueError(f"Unknown wipe engine: {engine}")
+        if tolerate_errors and engine == "dd":
+            raise ValueError("Bad-sector tolerance needs the native or zerocopy engine")
+        if skip_clean and engine == "dd":
+            raise ValueError("Skip-if-clean needs the native or zerocopy engine")
+        if skip_clean and not verify:
+            raise ValueError("Skip-if-clean is only allowed on verified runs (verify=True)")
+        
         self.device_path = device_path
         self.method = method
         self.passes = passes
         self.callback = callback
+        self.engine = engine
+        self.queue_depth = queue_depth
+        self.zero_offload = zero_offload
+        self.discard = discard
         self.is_running = False
         self.current_process = None
+        self.native_engine = None
+        self.pass_stats = []
+        self.resume = resume
+        self.journal_dir = journal_dir
+        self.journal = None
+        self.resume_summary = None
+        self.resume_pass = 0
+        self.resume_offset = 0
+        self.current_pass = 0
+        self.verify = verify
+        self.verify_fraction = verify_fraction
+        self.fused_verify = fused_verify
+        self.verify_lag = verify_lag
+        self.verify_samples = verify_samples
+        self.residual_fraction = residual_fraction
+        self.verify_seed = verify_seed
+        self.seed_file = seed_file
+        self.seed = None
+        self.seed_record = None
+        self.device_size = None
+        self.final_pattern = None
+        self.verification = None
+        self.coverage_granularity = coverage_granularity
+        self.coverage = None
+        self.verified_coverage = None
+        self.coverage_summary = None
+        self.digest = None
+        self.device_digest = None
+        self.device_digest_leaves = None
+        self.tolerate_errors = tolerate_errors
+        self.bad_sectors = None
+        self.skip_clean = skip_clean
+        self.skip_clean_summary = None
         
         # Setup logging
         self.setup_logging()
@@ -72,7 +1269,7 @@ class DataWiper:
             raise ValueError(f"Device {self.device_path} has mounted partitions: {mounted_devices}")
     
     def get_device_size(self):
-        """Get the size of the device in bytes"""
+        """Get the size of the device (or image file) in bytes"""
         try:
             result = subprocess.run(
                 ['blockdev', '--getsize64', self.device_path],
@@ -82,8 +1279,25 @@ class DataWiper:
             )
             return int(result.stdout.strip())
         except subprocess.CalledProcessError:
+            # blockdev rejects image files; their size is simply the file size
+            try:
+                if stat.S_ISREG(os.stat(self.device_path).st_mode):
+                    return os.path.getsize(self.device_path)
+            except OSError:
+                pass
             return None
     
+    def _dd_target_args(self):
+        """Extra dd operands that keep dd inside a regular file's current size"""
+        try:
+            if not stat.S_ISREG(os.stat(self.device_path).st_mode):
+                return []
+        except OSError:
+            return []
+        
+        # Without these, dd truncates the file and then grows it until the disk is full
+        return [f'count={os.path.getsize(self.device_path)}', 'iflag=count_bytes', 'conv=notrunc']
+    
     def update_progress(self, message, progress=None):
         """Update progress via callback"""
         if self.callback:
@@ -105,6 +1319,26 @@ class DataWiper:
         start_time = time.time()
         
         try:
+            if self.engine in ("native", "zerocopy"):
+                self.native_engine = NativeWipeEngine(
+                    self.device_path,
+                    callback=self._native_progress,
+                    queue_depth=self.queue_depth,
+                    tolerate_errors=self.tolerate_errors
+                )
+                self.native_engine.open()
+                device_size = self.native_engine.size
+                self.logger.info(
+                    f"Native engine: direct I/O {'enabled' if self.native_engine.direct_active else 'disabled'}, "
+                    f"queue depth {self.queue_depth}"
+                )
+            
+            self.device_size = device_size
+            self._begin_journal(device_size)
+            self._begin_seed()
+            self._begin_coverage(device_size)
+            self._begin_digest(device_size)
+            
             if self.method == "zeros":
                 self._wipe_with_zeros()
             elif self.method == "random":
@@ -116,9 +1350,23 @@ class DataWiper:
             else:
                 raise ValueError(f"Unknown wiping method: {self.method}")
             
+            if not self.is_running:
+                self.logger.info("Wipe stopped before completion")
+                return False
+            
+            self._collect_bad_sectors()
+            if self.verify:
+                self._verify_final_pass()
+            
+            self._check_coverage()
+            
             end_time = time.time()
             duration = end_time - start_time
             
+            if self.journal:
+                self.resume_summary = self.journal.finish()
+                self.journal = None
+            
             self.logger.info(f"Wipe completed successfully in {duration:.2f} seconds")
             self.update_progress("Wipe completed successfully!", 100)
             
@@ -130,6 +1378,382 @@ class DataWiper:
             raise
         finally:
             self.is_running = False
+            self._save_checkpoint()
+            if self.native_engine:
+                self.pass_stats = self.native_engine.pass_stats
+                self.native_engine.close()
+                self.native_engine = None
+    
+    def _begin_journal(self, device_size):
+        """Open the checkpoint journal and pick the pass and offset to start from"""
+        if not device_size:
+            if self.resume:
+                self.logger.warning("Device size unknown; cannot resume, starting from the beginning")
+            return
+        
+        try:
+            self.journal = WipeJournal(self.device_path, device_size, self.method, self.passes,
+                                       self.engine, journal_dir=self.journal_dir)
+            self.resume_pass, self.resume_offset = self.journal.begin(self.resume)
+        except OSError as e:
+            self.logger.warning(f"Checkpoint journal unavailable ({e}); this wipe cannot be resumed")
+            self.journal = None
+            return
+        
+        if self.journal.resumed:
+            self.update_progress(
+                f"Resuming: {self.resume_pass} pass(es) complete, "
+                f"continuing pass {self.resume_pass + 1} at {self.resume_offset:,} bytes"
+            )
+        elif self.resume:
+            self.logger.info(f"No matching journal in {self.journal_dir}; starting from the beginning")
+    
+    def _begin_seed(self):
+        """Draw the wipe's pattern seed (an interrupted run's when resuming) and record its commitment"""
+        passes = self._seeded_passes()
+        if not passes:
+            # Nothing is regenerated from a seed, so none is drawn or written to the journal
+            return
+        
+        self.seed = os.urandom(KEY_SIZE)
+        if self.journal:
+            self.seed = self.journal.keep_seed(self.seed)
+        
+        # The seed itself stays out of logs and certificates
+        self.seed_record = {
+            'commitment': seed_commitment(self.seed),
+            'derivation': KEY_DERIVATION,
+            'algorithm': DEFAULT_ALGORITHM,
+            'passes': [index + 1 for index in passes],
+        }
+        if self.seed_file:
+            write_seed_file(self.seed_file, self.seed)
+            self.logger.info(f"Pattern seed saved to {self.seed_file} (owner-only)")
+    
+    def _begin_coverage(self, device_size):
+        """Create the coverage maps (continuing the journal's when resuming) and hand them to the engine"""
+        if not device_size:
+            self.logger.warning("Device size unknown; written coverage will not be recorded")
+            return
+        if self._pass_count() > 255:
+            self.logger.warning("Coverage maps track at most 255 passes; written coverage will not be recorded")
+            return
+        
+        self.coverage = CoverageMap(device_size, self.coverage_granularity)
+        if self.journal:
+            try:
+                self.coverage = self.journal.keep_coverage(self.coverage)
+            except OSError as e:
+                self.logger.warning(f"Could not save coverage map to the journal: {e}")
+        if self.native_engine:
+            self.native_engine.coverage = self.coverage
+            if self.journal:
+                self.journal.keep_bad_ranges(self.native_engine.bad_ranges)
+        
+        # Sampled sectors are smaller than a coverage block, so only full read-backs are mapped
+        if self.verify and self.verify_samples is None:
+            self.verified_coverage = CoverageMap(device_size, self.coverage_granularity)
+    
+    def _begin_digest(self, device_size):
+        """Hash the device's final contents during a full read-back, for the certificate"""
+        if self.verify and self.verify_samples is None and self.verify_fraction >= 1 and device_size:
+            self.digest = MerkleDigest(device_size)
+    
+    def _finish_digest(self):
+        """Keep the digest of a verification that read every leaf"""
+        if self.digest is None:
+            return
+        if self.digest.complete and self.verification.get('status') != FAIL:
+            self.device_digest = self.digest.record()
+            self.device_digest_leaves = self.digest.leaves()
+            self.update_progress(f"Device digest ({self.device_digest['algorithm']} Merkle root): "
+                                 f"{self.device_digest['root']}")
+        self.digest.close()
+    
+    def _pass_count(self):
+        """Passes the method writes, as numbered in the coverage map"""
+        if self.method in PASS_TABLES:
+            return len(PASS_TABLES[self.method])
+        return self.passes
+    
+    def _journaled_pass_count(self):
+        """Passes the journal records for a complete run (shred's Gutmann run is journaled as one)"""
+        if self.method == "gutmann" and not self.native_engine:
+            return 1
+        return self._pass_count()
+    
+    def _mark_pass(self, start, end):
+        """Record [start, end) as written by the current pass (dd and shred paths)"""
+        if self.coverage is not None:
+            self.coverage.mark(start, end, self.current_pass + 1)
+    
+    def _record_dd_pass(self, output, description):
+        """Mark what dd reports it copied, and fail the pass if that falls short of the device"""
+        matches = DD_BYTES_COPIED.findall(output or '')
+        if not matches:
+            self.logger.warning(f"{description}: dd reported no byte count; coverage not recorded")
+            return
+        
+        copied = int(matches[-1])
+        self._mark_pass(0, copied)
+        if self.device_size and copied < self.device_size:
+            raise IOError(f"{description}: dd copied {copied:,} of {self.device_size:,} bytes")
+    
+    def _collect_bad_sectors(self):
+        """Certificate record of the sectors the engine could not write, as LBA ranges"""
+        if not self.native_engine or not self.native_engine.bad_ranges:
+            return
+        sector = self.native_engine.sector_size
+        ranges = self.native_engine.bad_ranges
+        self.bad_sectors = {
+            'sector_size': sector,
+            'sectors': sum(-(-(end - start) // sector) for start, end in ranges),
+            'lba_ranges': [[start // sector, -(-end // sector) - 1] for start, end in ranges],
+        }
+        self.update_progress(f"{self.bad_sectors['sectors']:,} unwritable sectors were skipped; "
+                             f"their previous contents may survive")
+    
+    def _known_bad(self):
+        """Ranges the engine could not write, which read-back reports instead of failing"""
+        return list(self.native_engine.bad_ranges) if self.native_engine else None
+    
+    def _check_coverage(self):
+        """Summarize coverage for the certificate; raises if the final pass missed any block"""
+        if self.coverage is None:
+            return
+        
+        verified = self.verified_coverage
+        if not self.verification or self.verification.get('mode') not in ('read-back', 'fused'):
+            verified = None
+        self.coverage_summary = coverage_summary(self.coverage, self._pass_count(), verified)
+        
+        final = self.coverage_summary['passes'][-1]
+        bad_ranges = self.native_engine.bad_ranges if self.native_engine else []
+        gaps = [(start, end) for start, end in self.coverage.missing(self._pass_count())
+                if not any(bad_start < end and bad_end > start for bad_start, bad_end in bad_ranges)]
+        if gaps:
+            raise IOError(
+                f"Final pass covered {final['bytes']:,} of {self.coverage.size:,} bytes "
+                f"(first gaps: {gaps[:3]})"
+            )
+        self.update_progress(f"Coverage: {describe_coverage(self.coverage_summary)}")
+    
+    def _seeded_passes(self):
+        """Zero-based numbers of the passes whose data is regenerated from the wipe seed"""
+        if not self.native_engine and (not self.device_size or self.method == "gutmann"):
+            # dd needs the stream length to be fed a keystream; shred draws its own random data
+            return []
+        if self.method == "random":
+            return list(range(self.passes))
+        return [index for index, pattern in enumerate(PASS_TABLES.get(self.method, [])) if pattern is None]
+    
+    def _random_pattern(self, pass_index):
+        """Keystream of a random pass, regenerable from the wipe seed (None if dd must use /dev/urandom)"""
+        if pass_index not in self._seeded_passes():
+            return None
+        return KeystreamPattern(key=pass_key(self.seed, pass_index))
+    
+    def _pass_start(self, pass_index):
+        """
+        Offset a pass starts at when resuming
+        
+        Returns:
+            int: Start offset, or None if an earlier run already completed the pass
+        """
+        if pass_index < self.resume_pass:
+            return None
+        self.current_pass = pass_index
+        if self.native_engine:
+            self.native_engine.coverage_pass = pass_index + 1
+        if pass_index == self.resume_pass and self.resume_offset:
+            if not self.native_engine:
+                self.logger.info("dd engine resumes interrupted passes from their first byte")
+                return 0
+            return self.resume_offset
+        return 0
+    
+    def _pass_completed(self, pass_index):
+        """Journal a finished pass"""
+        if self.journal and self.is_running:
+            self.journal.complete_pass(pass_index)
+    
+    def _sync_device(self):
+        """Flush written data so a checkpoint never runs ahead of stable storage"""
+        os.fsync(self.native_engine.fd)
+    
+    def _native_progress(self, message, progress=None):
+        """Native engine progress: checkpoint the high-water offset, then report"""
+        if self.journal and self.native_engine:
+            self.journal.checkpoint(self.current_pass, self.native_engine.high_water, sync=self._sync_device)
+        self.update_progress(message, progress)
+    
+    def _save_checkpoint(self):
+        """Checkpoint an interrupted or failed wipe so --resume can continue it"""
+        if not self.journal:
+            return
+        try:
+            if self.native_engine and self.native_engine.fd is not None:
+                self.journal.checkpoint(self.current_pass, self.native_engine.high_water,
+                                        sync=self._sync_device, force=True)
+            self.logger.info(f"Checkpoint saved to {self.journal.path}; rerun with --resume to continue")
+        except OSError as e:
+            self.logger.warning(f"Could not save checkpoint: {e}")
+    
+    def _verify_final_pass(self):
+        """Read the device back against the final pass pattern; raises if it does not match"""
+        if self.native_engine:
+            # Give the write buffers back to the memory budget before reading
+            self.pass_stats = self.native_engine.pass_stats
+            self.native_engine.close()
+        
+        if self.verification is None:
+            # Not already verified while the final pass was written
+            if self.final_pattern is None and self.resume_pass >= self._journaled_pass_count():
+                # An earlier run completed every pass; check the device against what it wrote
+                self.final_pattern = self._final_pass_pattern()
+            if self.final_pattern is None:
+                self.verification = skipped_result("final pass wrote unseeded random data that cannot be regenerated")
+                self.update_progress("Verification skipped: final pass data cannot be regenerated")
+                return
+            
+            if self.verify_samples is not None:
+                self.update_progress(f"Verifying a stratified sample of the device against {self.final_pattern.name}...")
+            else:
+                self.update_progress(
+                    f"Verifying {self.verify_fraction:.0%} of the device against {self.final_pattern.name}..."
+                )
+            try:
+                self.verification = verify_device(self.device_path, self.final_pattern, self.verify_fraction,
+                                                  self.update_progress, self.verify_samples,
+                                                  self.residual_fraction, self.verify_seed,
+                                                  coverage=self.verified_coverage, digest=self.digest,
+                                                  known_bad=self._known_bad())
+            finally:
+                if hasattr(self.final_pattern, 'close'):
+                    self.final_pattern.close()
+        
+        self._finish_digest()
+        result = self.verification
+        if result['status'] == FAIL:
+            raise IOError(
+                f"Verification failed: {result['mismatched_bytes']:,} bytes differ in "
+                f"{result['extent_count']} extents (first: {result['mismatch_extents'][:3]})"
+            )
+        self.update_progress(
+            f"Verification passed ({result.get('mode', 'read-back')}): "
+            f"{result['bytes_checked']:,} bytes @ {result['mb_per_sec']} MB/s"
+        )
+        detection = result.get('detection')
+        if detection:
+            self.update_progress(
+                f"{result['sample_plan']['samples']:,} samples catch {detection['residual_fraction']:.3%} "
+                f"unwiped data with probability {detection['probability']:.2%}"
+            )
+    
+    def _final_pass_pattern(self):
+        """
+        Rebuild the pattern the method's final pass writes
+        
+        Returns:
+            Pattern source, or None if the final pass wrote unseeded random data
+        """
+        if self.method == "zeros" or (self.method == "gutmann" and not self.native_engine):
+            # shred -z finishes with a zero pass
+            return FixedPattern(b'\x00', 'zeros')
+        
+        last = self._pass_count() - 1
+        if self.method in PASS_TABLES and PASS_TABLES[self.method][last] is not None:
+            return FixedPattern(PASS_TABLES[self.method][last])
+        return self._random_pattern(last)
+    
+    def _skip_pass(self, description):
+        """Report a pass that an interrupted run already completed"""
+        self.update_progress(f"{description}: already completed by an earlier run, skipping")
+    
+    def _run_native_pass(self, pattern, description, start=0, final=False):
+        """Run one pass through the native engine (the final pass may verify as it writes or skip clean regions)"""
+        self.final_pattern = pattern
+        try:
+            if final and self.skip_clean:
+                bytes_written = self.native_engine.repair_pass(pattern, description, start)
+            elif final and self.verify and self.fused_verify and not self.tolerate_errors:
+                # Takes precedence over zero-copy: it saves the separate read-back of the whole device
+                bytes_written = self.native_engine.write_verify_pass(pattern, description, start,
+                                                                     lag=self.verify_lag,
+                                                                     coverage=self.verified_coverage,
+                                                                     digest=self.digest)
+                self.verification = self.native_engine.verification
+            elif self.engine == "zerocopy" and pattern.period and not self.tolerate_errors:
+                bytes_written = self.native_engine.zero_copy_pass(pattern, description, start)
+            else:
+                bytes_written = self.native_engine.write_pass(pattern, description, start)
+        finally:
+            if hasattr(pattern, 'close'):
+                pattern.close()
+        
+        if self.is_running and self.native_engine.high_water != self.native_engine.size:
+            raise IOError(
+                f"{description}: wrote up to {self.native_engine.high_water} of {self.native_engine.size} bytes"
+            )
+        
+        stats = self.native_engine.pass_stats[-1]
+        if stats.get('mode') == 'skip-if-clean':
+            self.skip_clean_summary = {
+                'pass': self.current_pass + 1,
+                'bytes_read': stats['bytes_read'],
+                'bytes_rewritten': stats['bytes_written'],
+                'bytes_skipped': stats['bytes_skipped'],
+            }
+            self.update_progress(
+                f"{description} completed (SKIP-IF-CLEAN): {stats['bytes_skipped']:,} bytes already held "
+                f"{pattern.name} and were not rewritten, {bytes_written:,} bytes rewritten @ {stats['mb_per_sec']} MB/s"
+            )
+            return
+        if 'pipeline' in stats:
+            pipeline = stats['pipeline']
+            self.logger.info(
+                f"{description}: producer stall {pipeline['producer_stall_seconds']}s, "
+                f"consumer stall {pipeline['consumer_stall_seconds']}s"
+            )
+        self.update_progress(f"{description} completed: {bytes_written:,} bytes @ {stats['mb_per_sec']} MB/s")
+    
+    def _run_zero_offload_pass(self, description, start=0):
+        """Try the BLKZEROOUT fast path; returns False if the buffered engine must run"""
+        zeroed = self.native_engine.zero_offload_pass(description, discard=self.discard, start=start)
+        if zeroed is None:
+            self.logger.info(f"{description}: zero offload unavailable, using buffered writes")
+            return False
+        
+        if self.is_running and self.native_engine.high_water != self.native_engine.size:
+            raise IOError(
+                f"{description}: zeroed up to {self.native_engine.high_water} of {self.native_engine.size} bytes"
+            )
+        
+        stats = self.native_engine.pass_stats[-1]
+        self.update_progress(
+            f"{description} completed ({stats['offload']} offload): {zeroed:,} bytes @ {stats['mb_per_sec']} MB/s"
+        )
+        return True
+    
+    def _run_pattern_passes(self, patterns, label):
+        """Run a multi-pass method's pass table through the native engine"""
+        total = len(patterns)
+        try:
+            for pass_num, pattern in enumerate(patterns):
+                if not self.is_running:
+                    break
+                start = self._pass_start(pass_num)
+                if start is None:
+                    self._skip_pass(f"{label} Pass {pass_num + 1}/{total}")
+                    continue
+                self.update_progress(f"{label} Pass {pass_num + 1}/{total}: {pattern.name}...")
+                self._run_native_pass(pattern, f"{label} pass {pass_num + 1} ({pattern.name})", start,
+                                      final=pass_num == total - 1)
+                self._pass_completed(pass_num)
+        finally:
+            for pattern in patterns:
+                if hasattr(pattern, 'close'):
+                    pattern.close()
     
     def _wipe_with_zeros(self):
         """Wipe device with zeros using dd - OPTIMIZED FOR SPEED"""
@@ -137,8 +1761,24 @@ class DataWiper:
             if not self.is_running:
                 break
             
+            start = self._pass_start(pass_num)
+            if start is None:
+                self._skip_pass(f"Pass {pass_num + 1}/{self.passes}")
+                continue
+            
             self.update_progress(f"Pass {pass_num + 1}/{self.passes}: Writing zeros (optimized)...")
             
+            if self.native_engine:
+                description = f"zero pass {pass_num + 1}"
+                final = pass_num == self.passes - 1
+                offload = self.zero_offload and not self.tolerate_errors and not (final and self.skip_clean)
+                if offload and self._run_zero_offload_pass(description, start):
+                    self.final_pattern = FixedPattern(b'\x00', 'zeros')
+                else:
+                    self._run_native_pass(FixedPattern(b'\x00', 'zeros'), description, start, final=final)
+                self._pass_completed(pass_num)
+                continue
+            
             # SPEED OPTIMIZATIONS:
             cmd = [
                 'dd',
@@ -148,9 +1788,12 @@ class DataWiper:
                 'status=progress',
                 'oflag=direct',     # Direct I/O bypasses buffer cache
                 'conv=fdatasync'    # Ensure data is written to disk
-            ]
+            ] + self._dd_target_args()
             
-            self._run_command(cmd, f"zero pass {pass_num + 1}")
+            output = self._run_command(cmd, f"zero pass {pass_num + 1}")
+            self._record_dd_pass(output, f"zero pass {pass_num + 1}")
+            self.final_pattern = FixedPattern(b'\x00', 'zeros')
+            self._pass_completed(pass_num)
     
     def _wipe_with_random(self):
         """Wipe device with random data using dd - OPTIMIZED FOR SPEED"""
@@ -158,23 +1801,49 @@ class DataWiper:
             if not self.is_running:
                 break
             
+            start = self._pass_start(pass_num)
+            if start is None:
+                self._skip_pass(f"Pass {pass_num + 1}/{self.passes}")
+                continue
+            
             self.update_progress(f"Pass {pass_num + 1}/{self.passes}: Writing random data (optimized)...")
             
+            if self.native_engine:
+                self._run_native_pass(self._random_pattern(pass_num), f"random pass {pass_num + 1}", start,
+                                      final=pass_num == self.passes - 1)
+                self._pass_completed(pass_num)
+                continue
+            
+            # Seeded keystream piped into dd, so the pass can be regenerated and verified
+            pattern = self._random_pattern(pass_num)
+            
             # SPEED OPTIMIZATIONS:
             cmd = [
                 'dd',
-                'if=/dev/urandom',
+                'if=/dev/stdin' if pattern else 'if=/dev/urandom',
                 f'of={self.device_path}',
                 'bs=32M',           # Large block size (smaller than zeros due to urandom overhead)
+                'iflag=fullblock',  # Pipe reads come up short; keep direct writes whole
                 'status=progress',
                 'oflag=direct',     # Direct I/O for speed
                 'conv=fdatasync'
-            ]
+            ] + self._dd_target_args()
             
-            self._run_command(cmd, f"random pass {pass_num + 1}")
+            try:
+                output = self._run_command(cmd, f"random pass {pass_num + 1}", feed=pattern)
+            finally:
+                if pattern:
+                    pattern.close()
+            self._record_dd_pass(output, f"random pass {pass_num + 1}")
+            self.final_pattern = pattern
+            self._pass_completed(pass_num)
     
     def _wipe_with_dod(self):
         """Wipe device using DoD 5220.22-M standard (3 passes)"""
+        if self.native_engine:
+            self._run_pattern_passes(build_pass_patterns('dod', self.seed), "DoD")
+            return
+        
         patterns = [
             ('zeros', '/dev/zero'),
             ('ones', None),  # We'll create a ones file
@@ -195,11 +1864,20 @@ class DataWiper:
                 if not self.is_running:
                     break
                 
+                if self._pass_start(pass_num) is None:
+                    self._skip_pass(f"DoD Pass {pass_num + 1}/3")
+                    continue
+                
                 self.update_progress(f"DoD Pass {pass_num + 1}/3: {pattern_name}...")
                 
                 if source is None:  # ones pattern
                     source = ones_file
                 
+                # The random pass is fed the seeded keystream when its length is known
+                feed = self._random_pattern(pass_num) if pattern_name == 'random' else None
+                if feed:
+                    source = '/dev/stdin'
+                
                 cmd = [
                     'dd',
                     f'if={source}',
@@ -207,9 +1885,21 @@ class DataWiper:
                     'bs=1M',
                     'status=progress',
                     'conv=fdatasync'
-                ]
+                ] + self._dd_target_args()
+                if feed:
+                    cmd.append('iflag=fullblock')   # Pipe reads come up short
                 
-                self._run_command(cmd, f"DoD pass {pass_num + 1} ({pattern_name})")
+                try:
+                    output = self._run_command(cmd, f"DoD pass {pass_num + 1} ({pattern_name})", feed=feed)
+                finally:
+                    if feed:
+                        feed.close()
+                self._record_dd_pass(output, f"DoD pass {pass_num + 1}")
+                if pattern_name == 'random':
+                    self.final_pattern = feed
+                else:
+                    self.final_pattern = FixedPattern(b'\x00' if pattern_name == 'zeros' else b'\xFF', pattern_name)
+                self._pass_completed(pass_num)
         
         finally:
             # Clean up ones file
@@ -219,9 +1909,19 @@ class DataWiper:
                 pass
     
     def _wipe_with_gutmann(self):
-        """Wipe device using Gutmann method (35 passes) via shred"""
+        """Wipe device using Gutmann method (35 passes) via shred or the native engine"""
         self.update_progress("Starting Gutmann 35-pass wipe...")
         
+        if self.native_engine:
+            # Real Gutmann fixed patterns rather than shred's random passes
+            self._run_pattern_passes(build_pass_patterns('gutmann', self.seed), "Gutmann")
+            return
+        
+        # shred runs all 35 passes as one command, so it resumes as a whole
+        if self._pass_start(0) is None:
+            self._skip_pass("Gutmann 35-pass wipe")
+            return
+        
         cmd = [
             'shred',
             '-v',
@@ -231,20 +1931,52 @@ class DataWiper:
         ]
         
         self._run_command(cmd, "Gutmann 35-pass wipe")
+        # shred reports no byte counts; a clean exit means it wrote every pass over the device
+        if self.device_size:
+            for pass_index in range(self._pass_count()):
+                self.current_pass = pass_index
+                self._mark_pass(0, self.device_size)
+        # shred -z finishes with a zero pass
+        self.final_pattern = FixedPattern(b'\x00', 'zeros')
+        self._pass_completed(0)
     
-    def _run_command(self, cmd, description):
-        """Run a command and handle output with REAL-TIME PROGRESS"""
+    def _run_command(self, cmd, description, feed=None):
+        """
+        Run a command and handle output with REAL-TIME PROGRESS
+        
+        Args:
+            cmd (list): Command line
+            description (str): Label used in progress messages
+            feed: Pattern whose first device-size bytes are piped into the command's stdin
+            
+        Returns:
+            str: Everything the command printed
+        """
         self.logger.info(f"Running command: {' '.join(cmd)}")
         
+        feeder = None
         try:
-            self.current_process = subprocess.Popen(
-                cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT,  # Combine stderr with stdout for dd progress
-                text=True,
-                bufsize=0,  # Unbuffered for real-time output
-                universal_newlines=True
-            )
+            stdin = None
+            if feed is not None:
+                # The feeder owns the write end; if dd never starts, closing the read end stops it
+                stdin, feed_fd = os.pipe()
+                feeder = threading.Thread(target=self._feed_pattern, args=(feed_fd, feed, self.device_size),
+                                          name="trustwipe-feed", daemon=True)
+                feeder.start()
+            
+            try:
+                self.current_process = subprocess.Popen(
+                    cmd,
+                    stdin=stdin,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.STDOUT,  # Combine stderr with stdout for dd progress
+                    text=True,
+                    bufsize=0,  # Unbuffered for real-time output
+                    universal_newlines=True
+                )
+            finally:
+                if stdin is not None:
+                    os.close(stdin)
             
             # Monitor progress with REAL-TIME OUTPUT
             output_lines = []
@@ -270,6 +2002,8 @@ class DataWiper:
             
             # Get final result
             stdout, stderr = self.current_process.communicate()
+            if feeder:
+                feeder.join()
             
             if self.current_process.returncode != 0:
                 error_msg = f"Command failed: {stderr or 'Unknown error'}"
@@ -282,6 +2016,7 @@ class DataWiper:
                 )
             
             self.logger.info(f"Command completed successfully: {description}")
+            return '\n'.join(output_lines + [stdout or ''])
             
         except Exception as e:
             self.logger.error(f"Command execution failed: {e}")
@@ -289,11 +2024,33 @@ class DataWiper:
         finally:
             self.current_process = None
     
+    def _feed_pattern(self, fd, pattern, size):
+        """Write `size` bytes of a pattern into a pipe, then close it"""
+        chunk = bytearray(FEED_CHUNK_SIZE)
+        offset = 0
+        try:
+            while offset < size and self.is_running:
+                length = min(len(chunk), size - offset)
+                with memoryview(chunk)[:length] as view:
+                    pattern.fill(view, offset)
+                    written = 0
+                    while written < length:
+                        written += os.write(fd, view[written:])
+                offset += length
+        except OSError:
+            # The command exited early (stopped or failed); its exit status says why
+            pass
+        finally:
+            os.close(fd)
+    
     def stop(self):
         """Stop the current wiping operation"""
         self.logger.info("Stop requested")
         self.is_running = False
         
+        if self.native_engine:
+            self.native_engine.stop()
+        
         if self.current_process:
             self.logger.info("Terminating current process")
             self.current_process.terminate()
@@ -463,25 +2220,77 @@ class SystemInfo:
         
         return info
 
+def benchmark_wipe_engines(device_path, method="zeros", passes=1, engines=None, callback=None, queue_depth=1):
+    """
+    Benchmark the wipe engines against each other on the same target
+    
+    Args:
+        device_path (str): Device, loop device or regular file to overwrite
+        method (str): Wiping method to run with every engine
+        passes (int): Number of passes
+        engines (list): Engines to compare (default: all)
+        callback (callable): Progress callback function
+        queue_depth (int): Writes kept in flight by the native engine
+        
+    Returns:
+        dict: engine -> {'seconds', 'bytes', 'mb_per_sec', 'cpu_sec_per_gb'}
+    """
+    results = {}
+    
+    def cpu_seconds():
+        # dd runs in a child process, the native engines in this one
+        times = os.times()
+        return times.user + times.system + times.children_user + times.children_system
+    
+    for engine in engines or WIPE_ENGINES:
+        # BLKZEROOUT would pre-empt both the buffered and the zero-copy writers on zero passes
+        wiper = DataWiper(device_path, method, passes, callback, engine=engine, queue_depth=queue_depth,
+                          zero_offload=False)
+        with open(device_path, 'rb') as target:
+            size = target.seek(0, os.SEEK_END)
+        
+        start_time = time.time()
+        start_cpu = cpu_seconds()
+        wiper.wipe()
+        elapsed = time.time() - start_time
+        cpu_used = cpu_seconds() - start_cpu
+        
+        total_bytes = size * passes
+        results[engine] = {
+            'seconds': round(elapsed, 3),
+            'bytes': total_bytes,
+            'mb_per_sec': round((total_bytes / (1024 * 1024)) / elapsed, 1) if elapsed > 0 else None,
+            'cpu_sec_per_gb': round(cpu_used / (total_bytes / 1024 ** 3), 3) if total_bytes else None,
+        }
+    
+    return results
+
 if __name__ == "__main__":
     # Test the backend functionality
     import sys
     
     if len(sys.argv) < 2:
-        print("Usage: python3 backend.py <device_path> [method] [passes]")
+        print("Usage: python3 backend.py <device_path> [method] [passes] [dd|native|zerocopy|benchmark]")
         sys.exit(1)
     
     device = sys.argv[1]
     method = sys.argv[2] if len(sys.argv) > 2 else "zeros"
     passes = int(sys.argv[3]) if len(sys.argv) > 3 else 1
+    engine = sys.argv[4] if len(sys.argv) > 4 else "dd"
     
     def progress_callback(message, progress=None):
         print(f"Progress: {message}")
         if progress is not None:
             print(f"  -> {progress}%")
     
+    if engine == "benchmark":
+        for name, result in benchmark_wipe_engines(device, method, passes).items():
+            print(f"{name:<8} {result['seconds']:8.2f}s  {result['mb_per_sec']} MB/s  "
+                  f"{result['cpu_sec_per_gb']} CPU s/GB")
+        sys.exit(0)
+    
     try:
-        wiper = DataWiper(device, method, passes, progress_callback)
+        wiper = DataWiper(device, method, passes, progress_callback, engine=engine)
         wiper.wipe()
         print("Wipe completed successfully!")
     except Exception as e:
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+TrustWipe Buffer Pool
+Page-aligned, reusable I/O buffers shared by the wipe engines
+
+Buffers are anonymous mmaps (always page aligned, as O_DIRECT requires),
+optionally backed by transparent huge pages, and handed out as memoryview
+slices so no data is copied. Every pool draws from one process-wide memory
+budget, so wiping several drives at once never pushes the host into swap.
+"""
+
+import mmap
+import threading
+
+import psutil
+
+DEFAULT_MEMORY_FRACTION = 0.25         # Share of currently available RAM
+MIN_MEMORY_BUDGET = 64 * 1024 * 1024   # Always allow at least one modest buffer
+
+
+class MemoryBudget:
+    """Process-wide cap on bytes held by buffer pools"""
+
+    def __init__(self, limit):
+        """
+        Args:
+            limit (int): Maximum bytes of buffers allocated at once
+        """
+        self.limit = limit
+        self.reserved = 0
+        self._condition = threading.Condition()
+
+    def reserve(self, size, block=True, timeout=None):
+        """
+        Reserve bytes from the budget
+
+        Args:
+            size (int): Bytes to reserve
+            block (bool): Wait for other pools to release memory
+            timeout (float): Seconds to wait when blocking (None = forever)
+
+        Returns:
+            bool: True if the bytes were reserved
+        """
+        with self._condition:
+            if not block:
+                if self.reserved + size > self.limit:
+                    return False
+            elif not self._condition.wait_for(lambda: self.reserved + size <= self.limit, timeout):
+                return False
+            self.reserved += size
+            return True
+
+    def release(self, size):
+        """Return bytes to the budget"""
+        with self._condition:
+            self.reserved -= size
+            self._condition.notify_all()
+
+
+_shared_budget = None
+_shared_budget_lock = threading.Lock()
+
+
+def configure_memory_budget(limit=None, fraction=DEFAULT_MEMORY_FRACTION):
+    """
+    Set the process-wide buffer budget
+
+    Args:
+        limit (int): Budget in bytes (default: fraction of available RAM)
+        fraction (float): Share of available RAM used when no limit is given
+
+    Returns:
+        MemoryBudget: The shared budget
+    """
+    global _shared_budget
+
+    if limit is None:
+        limit = int(psutil.virtual_memory().available * fraction)
+    limit = max(limit, MIN_MEMORY_BUDGET)
+
+    with _shared_budget_lock:
+        if _shared_budget is None:
+            _shared_budget = MemoryBudget(limit)
+        else:
+            with _shared_budget._condition:
+                _shared_budget.limit = limit
+                _shared_budget._condition.notify_all()
+        return _shared_budget
+
+
+def memory_budget():
+    """Return the shared budget, sizing it from available RAM on first use"""
+    if _shared_budget is None:
+        return configure_memory_budget()
+    return _shared_budget
+
+
+class PooledBuffer:
+    """An aligned buffer on loan from a BufferPool"""
+
+    def __init__(self, pool, buffer):
+        self.pool = pool
+        self.buffer = buffer
+
+    def __len__(self):
+        return len(self.buffer)
+
+    def view(self, length=None):
+        """memoryview over the first `length` bytes - no copy"""
+        view = memoryview(self.buffer)
+        if length is None or length == len(self.buffer):
+            return view
+        try:
+            return view[:length]
+        finally:
+            view.release()
+
+    def release(self):
+        """Return the buffer to its pool"""
+        self.pool.release(self)
+
+
+class BufferPool:
+    """Fixed-size aligned buffers, reused across passes and drawn from the memory budget"""
+
+    def __init__(self, buffer_size, budget=None, huge_pages=False):
+        """
+        Args:
+            buffer_size (int): Bytes per buffer (rounded up to a page)
+            budget (MemoryBudget): Budget to draw from (default: process-wide)
+            huge_pages (bool): Ask for transparent huge pages (MADV_HUGEPAGE)
+        """
+        self.buffer_size = -(-buffer_size // mmap.PAGESIZE) * mmap.PAGESIZE
+        self.budget = budget or memory_budget()
+        self.huge_pages = huge_pages
+        self.allocated = 0
+        self._free = []
+        self._lock = threading.Lock()
+
+    def acquire(self, block=True, timeout=None):
+        """
+        Take a buffer, reusing a released one when possible
+
+        Args:
+            block (bool): Wait for budget when none is free
+            timeout (float): Seconds to wait when blocking
+
+        Returns:
+            PooledBuffer: The buffer, or None if not blocking and over budget
+        """
+        with self._lock:
+            if self._free:
+                return self._free.pop()
+
+        if not self.budget.reserve(self.buffer_size, block, timeout):
+            if block:
+                raise MemoryError(f"Buffer budget exhausted ({self.budget.limit:,} bytes)")
+            return None
+
+        try:
+            buffer = mmap.mmap(-1, self.buffer_size)
+        except Exception:
+            self.budget.release(self.buffer_size)
+            raise
+
+        if self.huge_pages and hasattr(mmap, 'MADV_HUGEPAGE'):
+            try:
+                buffer.madvise(mmap.MADV_HUGEPAGE)
+            except OSError:
+                pass
+
+        with self._lock:
+            self.allocated += 1
+        return PooledBuffer(self, buffer)
+
+    def release(self, pooled):
+        """Return a buffer for reuse"""
+        with self._lock:
+            self._free.append(pooled)
+
+    def close(self):
+        """Unmap free buffers and give their memory back to the budget"""
+        with self._lock:
+            free, self._free = self._free, []
+            self.allocated -= len(free)
+
+        for pooled in free:
+            pooled.buffer.close()
+            self.budget.release(self.buffer_size)
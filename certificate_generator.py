@@ -12,6 +12,8 @@ import hashlib
 import platform
 import subprocess
 
+from coverage_map import describe_coverage
+
 class CertificateGenerator:
     def __init__(self, cert_dir="/boot/trustwipe-certificates"):
         """
@@ -34,7 +36,7 @@ class CertificateGenerator:
             os.makedirs(self.cert_dir, exist_ok=True)
             os.chmod(self.cert_dir, 0o755)
     
-    def generate_certificate(self, system_info, device_info, wipe_details):
+    def generate_certificate(self, system_info, device_info, wipe_details, digest_leaves=None):
         """
         Generate a comprehensive certificate
         
@@ -42,6 +44,7 @@ class CertificateGenerator:
             system_info (dict): System information
             device_info (dict): Device information
             wipe_details (dict): Wiping operation details
+            digest_leaves (bytes): Leaf hashes of wipe_details['device_digest'], saved next to the certificate
             
         Returns:
             tuple: (cert_path, html_path) - paths to generated certificates
@@ -50,6 +53,26 @@ class CertificateGenerator:
         cert_id = str(uuid.uuid4())
         timestamp = datetime.now()
         
+        # Generate filenames
+        device_name = device_info.get('device_path', 'unknown').split('/')[-1]
+        timestamp_str = timestamp.strftime('%Y%m%d_%H%M%S')
+        
+        cert_filename = f'trustwipe_cert_{device_name}_{timestamp_str}.json'
+        html_filename = f'trustwipe_cert_{device_name}_{timestamp_str}.html'
+        leaves_filename = f'trustwipe_cert_{device_name}_{timestamp_str}.leaves'
+        
+        cert_path = os.path.join(self.cert_dir, cert_filename)
+        html_path = os.path.join(self.cert_dir, html_filename)
+        
+        # Leaf hashes let an auditor re-read single regions; the certificate only holds the root
+        if digest_leaves is not None and wipe_details.get('device_digest'):
+            leaves_path = os.path.join(self.cert_dir, leaves_filename)
+            with open(leaves_path, 'wb') as f:
+                f.write(digest_leaves)
+            os.chmod(leaves_path, 0o644)
+            wipe_details = dict(wipe_details, device_digest=dict(wipe_details['device_digest'],
+                                                                 leaves_file=leaves_filename))
+        
         # Create certificate data
         cert_data = {
             'certificate_info': {
@@ -65,16 +88,6 @@ class CertificateGenerator:
             'verification': self.generate_verification_data(system_info, device_info, wipe_details)
         }
         
-        # Generate filenames
-        device_name = device_info.get('device_path', 'unknown').split('/')[-1]
-        timestamp_str = timestamp.strftime('%Y%m%d_%H%M%S')
-        
-        cert_filename = f'trustwipe_cert_{device_name}_{timestamp_str}.json'
-        html_filename = f'trustwipe_cert_{device_name}_{timestamp_str}.html'
-        
-        cert_path = os.path.join(self.cert_dir, cert_filename)
-        html_path = os.path.join(self.cert_dir, html_filename)
-        
         # Save JSON certificate
         with open(cert_path, 'w') as f:
             json.dump(cert_data, f, indent=2, sort_keys=True)
@@ -95,6 +108,11 @@ class CertificateGenerator:
         # Create verification string
         verification_string = f"{system_info.get('hostname', '')}{device_info.get('device_path', '')}{wipe_details.get('start_time', '')}{wipe_details.get('end_time', '')}"
         
+        # Bind the checksum to what was actually on the medium when it was read back
+        device_digest = wipe_details.get('device_digest')
+        if device_digest:
+            verification_string += f"{device_digest['algorithm']}:{device_digest['root']}"
+        
         # Generate checksum
         checksum = hashlib.sha256(verification_string.encode()).hexdigest()
         
@@ -115,6 +133,82 @@ class CertificateGenerator:
         wipe_details = cert_data['wipe_details']
         verification = cert_data['verification']
         
+        # Runs continued from a checkpoint journal list every session
+        resume_rows = ''
+        resume = wipe_details.get('resume')
+        if resume and resume.get('resumed'):
+            resume_rows = f"""
+                    <div class="info-label">Resumed Sessions:</div>
+                    <div class="info-value">{len(resume['sessions'])} (coverage: {resume['coverage']})</div>"""
+        
+        # Read-back verification of the final pass
+        read_back_rows = ''
+        read_back = wipe_details.get('read_back')
+        if read_back:
+            if read_back.get('status') == 'SKIPPED':
+                read_back_text = f"SKIPPED ({read_back.get('reason', 'not verifiable')})"
+            else:
+                read_back_text = (f"{read_back['status']} - {read_back['bytes_checked']:,} bytes checked "
+                                  f"({read_back['fraction']:.0%}), {read_back['mismatched_bytes']:,} mismatched")
+            sample_plan = read_back.get('sample_plan')
+            if sample_plan:
+                # Sampled verification: the seed regenerates the exact sectors that were read
+                detection = read_back['detection']
+                read_back_text += (f", {sample_plan['samples']:,} stratified samples (seed {sample_plan['seed']}), "
+                                   f"{detection['probability']:.2%} chance of detecting "
+                                   f"{detection['residual_fraction']:.3%} unwiped data")
+            regions = read_back.get('regions')
+            if regions:
+                # Fused verification reports a status per region of the final pass
+                passed = sum(1 for region in regions if region['status'] == 'PASS')
+                read_back_text += f", {passed}/{len(regions)} regions verified during the final pass"
+            read_back_rows = f"""
+                    <div class="info-label">Read-Back Verification:</div>
+                    <div class="info-value">{read_back_text}</div>"""
+        
+        # Random passes are keyed from a secret seed; only its commitment is published
+        seed_rows = ''
+        pattern_seed = wipe_details.get('pattern_seed')
+        if pattern_seed:
+            seed_passes = ', '.join(str(number) for number in pattern_seed['passes'])
+            seed_rows = f"""
+                    <div class="info-label">Random Pattern Seed:</div>
+                    <div class="info-value">SHA-256 commitment {pattern_seed['commitment']} ({pattern_seed['algorithm']}, passes {seed_passes})</div>"""
+        
+        # Per-pass written coverage and verified coverage from the coverage map
+        coverage_rows = ''
+        coverage = wipe_details.get('coverage')
+        if coverage:
+            coverage_rows = f"""
+                    <div class="info-label">Coverage:</div>
+                    <div class="info-value">{describe_coverage(coverage)} ({coverage['granularity']:,}-byte blocks)</div>"""
+        
+        # Tree hash of the device contents read back by verification
+        digest_rows = ''
+        device_digest = wipe_details.get('device_digest')
+        if device_digest:
+            digest_rows = f"""
+                    <div class="info-label">Device Digest:</div>
+                    <div class="info-value">{device_digest['algorithm']} Merkle root {device_digest['root']} ({device_digest['leaf_count']:,} leaves of {device_digest['leaf_size']:,} bytes)</div>"""
+        
+        # Sectors the device refused to write; their old contents may survive
+        bad_sector_rows = ''
+        bad_sectors = wipe_details.get('bad_sectors')
+        if bad_sectors:
+            lba_text = ', '.join(str(first) if first == last else f"{first}-{last}"
+                                 for first, last in bad_sectors['lba_ranges'])
+            bad_sector_rows = f"""
+                    <div class="info-label">Bad Sectors:</div>
+                    <div class="info-value">{bad_sectors['sectors']:,} unwritable {bad_sectors['sector_size']}-byte sectors, not overwritten (LBAs {lba_text})</div>"""
+        
+        # A skip-if-clean final pass compared these bytes with its pattern instead of rewriting them
+        skip_clean_rows = ''
+        skip_if_clean = wipe_details.get('skip_if_clean')
+        if skip_if_clean:
+            skip_clean_rows = f"""
+                    <div class="info-label">Skip-If-Clean Final Pass:</div>
+                    <div class="info-value">Pass {skip_if_clean['pass']} read the device and rewrote {skip_if_clean['bytes_rewritten']:,} bytes; {skip_if_clean['bytes_skipped']:,} bytes already held its pattern and were not rewritten</div>"""
+        
         # Format duration if available
         duration = wipe_details.get('duration', 'N/A')
         if isinstance(duration, str) and ':' in duration:
@@ -417,7 +511,7 @@ class CertificateGenerator:
                     <div class="info-label">Completed:</div>
                     <div class="info-value">{wipe_details.get('end_time', 'N/A')}</div>
                     <div class="info-label">Duration:</div>
-                    <div class="info-value">{duration}</div>
+                    <div class="info-value">{duration}</div>{resume_rows}{read_back_rows}{seed_rows}{coverage_rows}{skip_clean_rows}{bad_sector_rows}{digest_rows}
                     <div class="info-label">Status:</div>
                     <div class="info-value success-highlight">{wipe_details.get('status', 'N/A')}</div>
                 </div>
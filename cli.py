@@ -13,8 +13,11 @@ import signal
 import threading
 
 # Import our modules
-from backend import DataWiper, SystemInfo
+from backend import DataWiper, SystemInfo, WIPE_ENGINES
+from coverage_map import describe_coverage
+from buffer_pool import configure_memory_budget
 from certificate_generator import CertificateGenerator
+from wipe_verifier import VERIFY_LAG, DEFAULT_RESIDUAL_FRACTION
 
 class TrustWipeCLI:
     def __init__(self):
@@ -93,7 +96,11 @@ class TrustWipeCLI:
         except Exception as e:
             print(f"❌ Error getting device info: {e}")
     
-    def wipe_device(self, device_path, method, passes, force=False):
+    def wipe_device(self, device_path, method, passes, force=False, engine="dd", queue_depth=1,
+                    zero_offload=True, discard=False, resume=False, verify=False, verify_fraction=1.0,
+                    fused_verify=False, verify_lag=VERIFY_LAG, verify_samples=None,
+                    residual_fraction=DEFAULT_RESIDUAL_FRACTION, verify_seed=None, seed_file=None,
+                    tolerate_errors=False, skip_clean=False):
         """Wipe a device"""
         if not os.path.exists(device_path):
             print(f"❌ Device {device_path} does not exist")
@@ -114,6 +121,7 @@ class TrustWipeCLI:
             print(f"   Device: {device_path}")
             print(f"   Method: {method}")
             print(f"   Passes: {passes}")
+            print(f"   Engine: {engine} (queue depth {queue_depth})")
             print()
             
             confirm = input("Type 'YES' to confirm deletion: ")
@@ -142,7 +150,15 @@ class TrustWipeCLI:
             start_time = datetime.now()
             
             # Create wiper and start
-            self.wiper = DataWiper(device_path, method, passes, self.progress_callback)
+            self.wiper = DataWiper(device_path, method, passes, self.progress_callback,
+                                   engine=engine, queue_depth=queue_depth,
+                                   zero_offload=zero_offload, discard=discard, resume=resume,
+                                   verify=verify or fused_verify or verify_samples is not None,
+                                   verify_fraction=verify_fraction, fused_verify=fused_verify,
+                                   verify_lag=verify_lag, verify_samples=verify_samples,
+                                   residual_fraction=residual_fraction, verify_seed=verify_seed,
+                                   seed_file=seed_file, tolerate_errors=tolerate_errors,
+                                   skip_clean=skip_clean)
             success = self.wiper.wipe()
             
             end_time = datetime.now()
@@ -151,12 +167,37 @@ class TrustWipeCLI:
             if success and not self.interrupted:
                 print(f"\n✅ Wipe completed successfully!")
                 print(f"   Duration: {duration}")
+                if self.wiper.verification:
+                    print(f"   Read-back verification: {self.wiper.verification['status']}")
+                    detection = self.wiper.verification.get('detection')
+                    if detection:
+                        print(f"   Detection probability: {detection['probability']:.2%} "
+                              f"for {detection['residual_fraction']:.3%} unwiped data")
+                if self.wiper.coverage_summary:
+                    print(f"   Coverage: {describe_coverage(self.wiper.coverage_summary)}")
+                if self.wiper.device_digest:
+                    print(f"   Device digest: {self.wiper.device_digest['root']}")
+                if self.wiper.bad_sectors:
+                    print(f"   ⚠️  {self.wiper.bad_sectors['sectors']:,} unwritable sectors skipped "
+                          f"(listed in the certificate)")
+                if self.wiper.skip_clean_summary:
+                    print(f"   ⏭️  Skip-if-clean final pass: {self.wiper.skip_clean_summary['bytes_skipped']:,} bytes "
+                          f"already clean, {self.wiper.skip_clean_summary['bytes_rewritten']:,} bytes rewritten")
                 
                 # Generate certificate
                 wipe_details = {
                     'device_path': device_path,
                     'method': method,
                     'passes': passes,
+                    'engine': engine,
+                    'queue_depth': queue_depth,
+                    'resume': self.wiper.resume_summary,
+                    'read_back': self.wiper.verification,
+                    'pattern_seed': self.wiper.seed_record,
+                    'coverage': self.wiper.coverage_summary,
+                    'device_digest': self.wiper.device_digest,
+                    'bad_sectors': self.wiper.bad_sectors,
+                    'skip_if_clean': self.wiper.skip_clean_summary,
                     'start_time': start_time.isoformat(),
                     'end_time': end_time.isoformat(),
                     'duration': str(duration),
@@ -165,7 +206,7 @@ class TrustWipeCLI:
                 
                 cert_gen = CertificateGenerator()
                 cert_path, html_path = cert_gen.generate_certificate(
-                    system_info, device_info, wipe_details
+                    system_info, device_info, wipe_details, self.wiper.device_digest_leaves
                 )
                 
                 print(f"\n📜 Certificate generated:")
@@ -175,6 +216,8 @@ class TrustWipeCLI:
                 return True
             else:
                 print(f"\n❌ Wipe operation failed or was interrupted")
+                if self.wiper.journal:
+                    print(f"   Progress saved - rerun with --resume to continue")
                 return False
         
         except Exception as e:
@@ -279,6 +322,8 @@ Examples:
   trustwipe-cli --list-devices                    # List available devices
   trustwipe-cli --device-info /dev/sdb            # Show device information
   trustwipe-cli --wipe /dev/sdb --method zeros    # Wipe device with zeros
+  trustwipe-cli --wipe /dev/sdb --engine native   # Wipe in-process (O_DIRECT + pwrite)
+  trustwipe-cli --wipe /dev/nvme0n1 --engine native --queue-depth 32
   trustwipe-cli --list-certs                      # List certificates
   trustwipe-cli --show-cert 12345678              # Show certificate details
 
@@ -308,6 +353,61 @@ WARNING: Data wiping is irreversible. Use with extreme caution!
     parser.add_argument('--passes', type=int, default=3,
                        help='Number of passes (default: 3, ignored for gutmann)')
     
+    parser.add_argument('--engine', choices=WIPE_ENGINES, default='dd',
+                       help='Write engine: dd subprocess, in-process native, or zerocopy '
+                            '(native with kernel-side pattern copies) (default: dd)')
+    
+    parser.add_argument('--queue-depth', type=int, default=1,
+                       help='Writes kept in flight by the native engine (default: 1)')
+    
+    parser.add_argument('--no-offload', action='store_true',
+                       help='Native zero passes: always write buffers instead of BLKZEROOUT')
+    
+    parser.add_argument('--discard', action='store_true',
+                       help='Native zero passes: BLKDISCARD the device before zeroing')
+    
+    parser.add_argument('--verify', action='store_true',
+                       help='Read the device back after the final pass and check every byte')
+    
+    parser.add_argument('--verify-fraction', type=float, default=1.0, metavar='FRACTION',
+                       help='Share of the device to read back with --verify (default: 1.0)')
+    
+    parser.add_argument('--verify-samples', type=int, nargs='?', const=0, metavar='N',
+                       help='Read back N stratified random sectors instead of the whole device '
+                            '(no N: enough for 99%% confidence at --residual-fraction)')
+    
+    parser.add_argument('--residual-fraction', type=float, default=DEFAULT_RESIDUAL_FRACTION,
+                       metavar='FRACTION',
+                       help='Unwiped share sampled verification reports a detection probability for '
+                            '(default: 0.001)')
+    
+    parser.add_argument('--verify-seed', type=int, metavar='SEED',
+                       help='Sample plan seed, to re-read the plan recorded in a certificate')
+    
+    parser.add_argument('--seed-file', metavar='PATH',
+                       help='Save the random pattern seed (owner-only) so random passes can be verified later; '
+                            'certificates record only a commitment to it')
+    
+    parser.add_argument('--fused-verify', action='store_true',
+                       help='Native engine: read regions back while the final pass is still writing')
+    
+    parser.add_argument('--verify-lag', type=int, default=VERIFY_LAG // (1024 * 1024), metavar='MB',
+                       help='Distance kept between the write front and fused read-back (default: 256)')
+    
+    parser.add_argument('--tolerate-bad-sectors', action='store_true',
+                       help='Native engines: isolate and retry failing sectors, record them in the '
+                            'certificate and keep wiping the rest of the device')
+    
+    parser.add_argument('--skip-clean', action='store_true',
+                       help='Native engines, with verification only: the final pass reads the device and '
+                            'rewrites only regions that do not already hold its pattern (re-wipes and repairs)')
+    
+    parser.add_argument('--resume', action='store_true',
+                       help='Continue an interrupted wipe of the same device from its checkpoint journal')
+    
+    parser.add_argument('--memory-budget', type=int, metavar='MB',
+                       help='Cap on RAM used for native write buffers (default: 25%% of available)')
+    
     parser.add_argument('--force', action='store_true',
                        help='Force wipe without confirmation prompts (USE WITH CAUTION!)')
     
@@ -334,7 +434,15 @@ WARNING: Data wiping is irreversible. Use with extreme caution!
         cli.show_device_info(args.device_info)
     
     elif args.wipe:
-        success = cli.wipe_device(args.wipe, args.method, args.passes, args.force)
+        if args.memory_budget:
+            configure_memory_budget(args.memory_budget * 1024 * 1024)
+        success = cli.wipe_device(args.wipe, args.method, args.passes, args.force,
+                                  args.engine, args.queue_depth,
+                                  not args.no_offload, args.discard, args.resume,
+                                  args.verify, args.verify_fraction, args.fused_verify,
+                                  args.verify_lag * 1024 * 1024, args.verify_samples,
+                                  args.residual_fraction, args.verify_seed, args.seed_file,
+                                  args.tolerate_bad_sectors, args.skip_clean)
         sys.exit(0 if success else 1)
     
     elif args.list_certs:
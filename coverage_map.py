@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+TrustWipe Coverage Map
+Records exactly which parts of a device each pass wrote and which parts
+read-back verification confirmed
+
+The device is divided into fixed-size blocks (1 MiB by default) and the map
+holds one byte per block: how many passes, counting from the first, wrote
+all of it (1 for blocks a read-back verified). A block only moves to pass N
+if it already holds pass N - 1, so "covered by pass 3" means passes 1, 2
+and 3 each reached every byte of it. A 10 TB device needs 10 MB at the
+default granularity. Engines mark ranges as their writes complete; whole
+blocks are advanced by one bytes.translate over the range, which needs no
+lock, and only the partially covered blocks at the edges of a range take a
+short lock until they fill up. Queries (bytes covered, uncovered ranges) run as C-level
+bytes.count and regex scans over the map, so they stay cheap for
+multi-terabyte devices, and the map compresses to almost nothing when it is
+persisted in the checkpoint journal.
+"""
+
+import re
+import zlib
+import base64
+import threading
+
+COVERAGE_GRANULARITY = 1024 * 1024   # Bytes per tracked block
+MAX_REPORTED_RANGES = 16             # Uncovered ranges listed in summaries
+
+
+def coverage_percent(covered, size):
+    """Share of `size` covered, in percent rounded down to 3 decimals so it never overstates"""
+    if not size:
+        return 100.0
+    return (covered * 100000 // size) / 1000
+
+
+class CoverageMap:
+    """Per-block count of the consecutive passes that completely covered each block"""
+
+    def __init__(self, size, granularity=COVERAGE_GRANULARITY):
+        """
+        Args:
+            size (int): Device size in bytes
+            granularity (int): Bytes per tracked block
+        """
+        if granularity <= 0:
+            raise ValueError("Coverage granularity must be positive")
+
+        self.size = size
+        self.granularity = granularity
+        self.blocks = -(-size // granularity)
+        self._map = bytearray(self.blocks)
+        self._partial = {}   # block -> (value, merged [start, end) ranges inside it)
+        self._lock = threading.Lock()
+
+    def _block_end(self, block):
+        return min((block + 1) * self.granularity, self.size)
+
+    def mark(self, start, end, value=1):
+        """
+        Record [start, end) as covered by pass `value`
+
+        Blocks only count once they are covered completely, and only advance
+        if the previous pass covered them; a block never moves backwards.
+        Safe to call from many threads at once.
+
+        Args:
+            start (int): First byte covered
+            end (int): End of the covered range
+            value (int): Pass number (1-255)
+        """
+        if not 1 <= value <= 255:
+            raise ValueError("Coverage maps track passes 1-255")
+        start = max(0, start)
+        end = min(end, self.size)
+        if start >= end:
+            return
+
+        first = -(-start // self.granularity)
+        last = end // self.granularity if end < self.size else self.blocks
+        if first < last:
+            # Advance blocks at pass value - 1 and leave every other block as it is
+            advance = bytearray(range(256))
+            advance[value - 1] = value
+            self._map[first:last] = self._map[first:last].translate(advance)
+
+        # Blocks the range only partly covers
+        edges = []
+        if start % self.granularity:
+            edges.append(start // self.granularity)
+        if end < self.size and end % self.granularity:
+            edges.append(end // self.granularity)
+        for block in sorted(set(edges)):
+            block_start = block * self.granularity
+            self._mark_partial(block, max(start, block_start), min(end, self._block_end(block)), value)
+
+    def _mark_partial(self, block, start, end, value):
+        with self._lock:
+            previous, ranges = self._partial.get(block, (value, []))
+            if previous != value:
+                ranges = []
+
+            merged = []
+            for range_start, range_end in sorted(ranges + [(start, end)]):
+                if merged and range_start <= merged[-1][1]:
+                    merged[-1] = (merged[-1][0], max(merged[-1][1], range_end))
+                else:
+                    merged.append((range_start, range_end))
+
+            if merged == [(block * self.granularity, self._block_end(block))]:
+                if self._map[block] == value - 1:
+                    self._map[block] = value
+                self._partial.pop(block, None)
+            else:
+                self._partial[block] = (value, merged)
+
+    def _block_bytes(self, blocks):
+        """Bytes in a count of blocks that includes the last one"""
+        return blocks * self.granularity - (self.blocks * self.granularity - self.size)
+
+    def covered_bytes(self, value=1):
+        """Bytes in blocks covered by pass `value` or a later one"""
+        below = sum(self._map.count(bytes([lower])) for lower in range(value))
+        covered = self.blocks - below
+        if covered and self.blocks and self._map[-1] >= value:
+            return self._block_bytes(covered)
+        return covered * self.granularity
+
+    def ranges(self, value=1):
+        """Merged [start, end) byte ranges covered by pass `value` or a later one"""
+        pattern = re.compile(b'[' + re.escape(bytes([value])) + b'-\xff]+')
+        return [(match.start() * self.granularity, min(match.end() * self.granularity, self.size))
+                for match in pattern.finditer(self._map)]
+
+    def missing(self, value=1):
+        """Merged [start, end) byte ranges not yet covered by pass `value`"""
+        missing = []
+        position = 0
+        for start, end in self.ranges(value):
+            if start > position:
+                missing.append((position, start))
+            position = end
+        if position < self.size:
+            missing.append((position, self.size))
+        return missing
+
+    def summary(self, value=1):
+        """Covered bytes and percentage for pass `value`, with the first uncovered ranges"""
+        covered = self.covered_bytes(value)
+        missing = self.missing(value) if covered < self.size else []
+        return {
+            'bytes': covered,
+            'percent': coverage_percent(covered, self.size),
+            'missing_ranges': [list(extent) for extent in missing[:MAX_REPORTED_RANGES]],
+            'missing_range_count': len(missing),
+        }
+
+    def to_dict(self):
+        """JSON-safe snapshot for the checkpoint journal"""
+        with self._lock:
+            partial = [[block, value, [list(extent) for extent in ranges]]
+                       for block, (value, ranges) in sorted(self._partial.items())]
+            data = bytes(self._map)
+        return {
+            'size': self.size,
+            'granularity': self.granularity,
+            'map': base64.b64encode(zlib.compress(data, 1)).decode('ascii'),
+            'partial': partial,
+        }
+
+    @classmethod
+    def from_dict(cls, state):
+        """Rebuild a map saved with to_dict"""
+        coverage = cls(state['size'], state['granularity'])
+        data = zlib.decompress(base64.b64decode(state['map']))
+        if len(data) != coverage.blocks:
+            raise ValueError("Coverage map does not match its device size")
+        coverage._map[:] = data
+        for block, value, ranges in state.get('partial', []):
+            coverage._partial[block] = (value, [tuple(extent) for extent in ranges])
+        return coverage
+
+
+def coverage_summary(written, passes, verified=None):
+    """
+    Certificate summary of a wipe's coverage
+
+    Args:
+        written (CoverageMap): Blocks marked with the passes that wrote them
+        passes (int): Number of passes in the wipe
+        verified (CoverageMap): Blocks read back and found to match (optional)
+
+    Returns:
+        dict: Granularity, per-pass written coverage and verified coverage
+    """
+    return {
+        'device_size': written.size,
+        'granularity': written.granularity,
+        'passes': [dict(written.summary(number), **{'pass': number}) for number in range(1, passes + 1)],
+        'verified': verified.summary() if verified is not None else None,
+    }
+
+
+def describe_coverage(summary):
+    """One-line text form, e.g. '100% of LBAs written by pass 3, 99.998% verified'"""
+    final = summary['passes'][-1]
+    text = f"{final['percent']:g}% of LBAs written by pass {final['pass']}"
+    if summary.get('verified') is not None:
+        text += f", {summary['verified']['percent']:g}% verified"
+    return text
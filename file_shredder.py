@@ -0,0 +1,644 @@
+#!/usr/bin/env python3
+"""
+TrustWipe File Shredder
+Overwrites individual files in place with constant memory
+
+Every pass of a method streams through one fixed-size, page-aligned buffer
+that is reused for every chunk of every file, so the memory a file
+overwrite needs does not depend on the file's size: a 20 GB VM image is
+written with the same 3 MiB buffer as a 4 KB note. Fixed patterns are
+generated into the buffer once per pass; random passes expand a fresh
+per-file keystream (see pattern_generator.py) into it chunk by chunk.
+Writes go through the page cache by default, or with O_DIRECT where the
+filesystem supports it, which keeps a large overwrite from evicting the
+rest of the page cache.
+
+Only the allocated ranges of a file are overwritten. They are looked up
+once per file with lseek SEEK_DATA/SEEK_HOLE, so the holes of sparse
+files (VM disks, databases, container layers) stay holes instead of
+being filled with allocated zeros, and a sparse 100 GB image costs only
+the writes its data needs. Filesystems without SEEK_DATA report the
+whole file as data and are overwritten in full.
+
+ParallelShredder overwrites many files at once on a worker pool, each
+worker with its own buffer. Instead of an fsync per file and pass, files
+are shredded in batches: every file of a batch is written with one pass,
+then each filesystem the batch touches is flushed once with syncfs(2)
+before the next pass starts. A file is only unlinked after the barrier
+following its final pass has succeeded, so a file whose overwrite did
+not reach stable storage is never removed.
+
+On spinning disks, writing files in the order a directory walk finds
+them turns into a seek storm. When a filesystem's disk reports
+queue/rotational = 1, the shredder looks up the first physical extent of
+each of its files (FIEMAP), sorts them by disk offset, and overwrites
+them one at a time in that order, so the head sweeps the disk once per
+pass. Files on SSDs keep the parallel, unordered path.
+"""
+
+import os
+import sys
+import mmap
+import time
+import errno
+import fcntl
+import ctypes
+import struct
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from pattern_generator import FixedPattern, KeystreamPattern, PASS_TABLES
+
+FILE_CHUNK_SIZE = 3 * 1024 * 1024   # Multiple of 3 (Gutmann triplets), 4 KiB (O_DIRECT) and 1 MiB keystream blocks
+DIRECT_IO_ALIGNMENT = 4096
+FILE_IO_MODES = ['buffered', 'direct']
+FILE_METHODS = ['zeros', 'random', 'dod', 'gutmann']
+
+SHRED_WORKERS = min(16, (os.cpu_count() or 1) * 2)   # Files overwritten at once
+SHRED_BATCH_FILES = 256                # Files per durability barrier (each holds a descriptor)
+SHRED_BATCH_BYTES = 1024 * 1024 * 1024 # Apparent bytes per durability barrier
+PROGRESS_INTERVAL = 0.5
+
+# Work queue order: sort by physical offset on rotational disks, always, or never
+SHRED_ORDERS = ['auto', 'physical', 'none']
+
+# FIEMAP (linux/fiemap.h): _IOWR('f', 11, struct fiemap), with room for one extent
+FS_IOC_FIEMAP = 0xC020660B
+FIEMAP_HEADER = struct.Struct('=QQIIII')     # fm_start, fm_length, fm_flags, fm_mapped_extents, fm_extent_count
+FIEMAP_EXTENT = struct.Struct('=QQQQQIIII')  # fe_logical, fe_physical, fe_length, reserved, fe_flags, reserved
+FIEMAP_EXTENT_UNKNOWN = 0x2                  # Location not known yet (also set for delayed allocation)
+FIEMAP_EXTENT_DATA_INLINE = 0x200            # Data stored in the inode; no extent of its own
+
+try:
+    _libc = ctypes.CDLL(None, use_errno=True)
+    _syncfs = _libc.syncfs
+    _syncfs.argtypes = [ctypes.c_int]
+    HAS_SYNCFS = True
+except (OSError, AttributeError):
+    HAS_SYNCFS = False
+
+
+def syncfs(fd):
+    """Flush the whole filesystem holding `fd` (Linux syncfs(2), which reports writeback errors since 5.8)"""
+    if _syncfs(fd) != 0:
+        error = ctypes.get_errno()
+        raise OSError(error, os.strerror(error))
+
+
+def data_extents(fd, size):
+    """
+    Allocated [start, end) ranges of an open file, aligned to DIRECT_IO_ALIGNMENT
+
+    Args:
+        fd (int): Open file descriptor
+        size (int): Apparent file size
+
+    Returns:
+        list: Merged ranges in file order (the whole file if holes cannot be detected)
+    """
+    if not hasattr(os, 'SEEK_DATA'):
+        return [(0, size)] if size else []
+
+    extents = []
+    position = 0
+    while position < size:
+        try:
+            start = os.lseek(fd, position, os.SEEK_DATA)
+        except OSError as e:
+            if e.errno == errno.ENXIO:
+                # No data past `position`: the rest of the file is a hole
+                break
+            if e.errno == errno.EINVAL and not extents:
+                return [(0, size)]
+            raise
+        end = min(os.lseek(fd, start, os.SEEK_HOLE), size)
+        start -= start % DIRECT_IO_ALIGNMENT
+        end = min(-(-end // DIRECT_IO_ALIGNMENT) * DIRECT_IO_ALIGNMENT, size)
+        if extents and start <= extents[-1][1]:
+            extents[-1] = (extents[-1][0], max(extents[-1][1], end))
+        else:
+            extents.append((start, end))
+        position = end
+    return extents
+
+
+def is_rotational(device):
+    """
+    Whether the disk behind a filesystem spins
+
+    Args:
+        device (int): st_dev of a file on the filesystem
+
+    Returns:
+        bool: queue/rotational of the disk, or None for filesystems without a block device (tmpfs, NFS)
+    """
+    # Partitions keep their queue on the parent disk
+    sys_dir = os.path.realpath(f'/sys/dev/block/{os.major(device)}:{os.minor(device)}')
+    for queue_dir in (os.path.join(sys_dir, 'queue'), os.path.join(os.path.dirname(sys_dir), 'queue')):
+        try:
+            with open(os.path.join(queue_dir, 'rotational'), 'r') as f:
+                return f.read().strip() == '1'
+        except OSError:
+            continue
+    return None
+
+
+def first_physical_offset(path):
+    """
+    Disk byte offset of a file's first extent, from FIEMAP
+
+    Returns:
+        int: Physical offset, or None if the file has no placed extent (empty, inline,
+             not yet allocated) or the filesystem has no FIEMAP
+    """
+    request = bytearray(FIEMAP_HEADER.size + FIEMAP_EXTENT.size)
+    FIEMAP_HEADER.pack_into(request, 0, 0, 0xFFFFFFFFFFFFFFFF, 0, 0, 1, 0)
+    try:
+        fd = os.open(path, os.O_RDONLY | getattr(os, 'O_CLOEXEC', 0) | getattr(os, 'O_NOFOLLOW', 0))
+    except OSError:
+        return None
+    try:
+        fcntl.ioctl(fd, FS_IOC_FIEMAP, request, True)
+    except OSError:
+        return None
+    finally:
+        os.close(fd)
+
+    if not FIEMAP_HEADER.unpack_from(request)[3]:
+        return None
+    extent = FIEMAP_EXTENT.unpack_from(request, FIEMAP_HEADER.size)
+    if extent[5] & (FIEMAP_EXTENT_UNKNOWN | FIEMAP_EXTENT_DATA_INLINE):
+        return None
+    return extent[1]
+
+
+def file_pass_count(method):
+    """Passes a file overwrite with `method` writes"""
+    return len(PASS_TABLES[method]) if method in PASS_TABLES else 1
+
+
+def file_pass_patterns(method):
+    """
+    Pattern source for every pass of a file overwrite
+
+    Random passes get a fresh single-threaded keystream, since files are
+    overwritten one chunk at a time.
+
+    Args:
+        method (str): zeros, random, dod or gutmann
+
+    Returns:
+        list: Pattern objects, one per pass
+    """
+    if method == 'zeros':
+        return [FixedPattern(b'\x00', 'zeros')]
+    if method == 'random':
+        return [KeystreamPattern(workers=1)]
+    if method in PASS_TABLES:
+        names = {b'\x00': 'zeros', b'\xFF': 'ones'}
+        return [FixedPattern(pattern, names.get(pattern)) if pattern is not None else KeystreamPattern(workers=1)
+                for pattern in PASS_TABLES[method]]
+    raise ValueError(f"Unknown wiping method: {method}")
+
+
+class FileOverwriter:
+    """Overwrites files in place through one reusable buffer"""
+
+    def __init__(self, method="zeros", chunk_size=FILE_CHUNK_SIZE, io_mode="buffered", sync=True):
+        """
+        Args:
+            method (str): Wiping method (zeros, random, dod, gutmann)
+            chunk_size (int): Bytes per write (multiple of DIRECT_IO_ALIGNMENT)
+            io_mode (str): "buffered" (page cache) or "direct" (O_DIRECT where supported)
+            sync (bool): fsync each file after every pass
+        """
+        if method not in FILE_METHODS:
+            raise ValueError(f"Unknown wiping method: {method}")
+        if chunk_size <= 0 or chunk_size % DIRECT_IO_ALIGNMENT:
+            raise ValueError(f"Chunk size must be a multiple of {DIRECT_IO_ALIGNMENT} bytes")
+        if io_mode not in FILE_IO_MODES:
+            raise ValueError(f"Unknown I/O mode: {io_mode}")
+
+        self.method = method
+        self.chunk_size = chunk_size
+        self.io_mode = io_mode
+        self.sync = sync
+        self.buffer = mmap.mmap(-1, chunk_size)   # Anonymous maps are page aligned, as O_DIRECT needs
+        self.files_written = 0
+        self.bytes_written = 0
+        self.apparent_bytes = 0    # Sizes of the files overwritten
+        self.allocated_bytes = 0   # Bytes in their allocated ranges, the part actually overwritten
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        """Unmap the buffer"""
+        if not self.buffer.closed:
+            self.buffer.close()
+
+    def open_file(self, path):
+        """Open for writing without truncating, with O_DIRECT in direct mode when the filesystem allows it"""
+        flags = os.O_WRONLY | getattr(os, 'O_CLOEXEC', 0) | getattr(os, 'O_NOFOLLOW', 0)
+        if self.io_mode == "direct" and hasattr(os, 'O_DIRECT'):
+            try:
+                return os.open(path, flags | os.O_DIRECT), True
+            except OSError as e:
+                # tmpfs and some network filesystems reject O_DIRECT
+                if e.errno != errno.EINVAL:
+                    raise
+        return os.open(path, flags), False
+
+    @staticmethod
+    def _set_direct(fd, enabled):
+        flags = fcntl.fcntl(fd, fcntl.F_GETFL)
+        fcntl.fcntl(fd, fcntl.F_SETFL, flags | os.O_DIRECT if enabled else flags & ~os.O_DIRECT)
+
+    def overwrite(self, path):
+        """
+        Overwrite the allocated ranges of a file with every pass of the method, keeping its size and holes
+
+        Args:
+            path (str): File to overwrite (symlinks are refused)
+
+        Returns:
+            int: Bytes written over all passes
+        """
+        fd, direct = self.open_file(path)
+        try:
+            size = os.fstat(fd).st_size
+            extents = data_extents(fd, size)
+            patterns = file_pass_patterns(self.method)
+            try:
+                for pattern in patterns:
+                    self.write_pass(fd, pattern, extents, direct)
+                    if self.sync:
+                        os.fsync(fd)
+            finally:
+                for pattern in patterns:
+                    if hasattr(pattern, 'close'):
+                        pattern.close()
+        finally:
+            os.close(fd)
+
+        allocated = sum(end - start for start, end in extents)
+        written = allocated * len(patterns)
+        self.files_written += 1
+        self.bytes_written += written
+        self.apparent_bytes += size
+        self.allocated_bytes += allocated
+        return written
+
+    def write_pass(self, fd, pattern, extents, direct):
+        """Write one pattern over each [start, end) extent a chunk at a time"""
+        if direct:
+            # An earlier pass may have finished an unaligned tail without O_DIRECT
+            self._set_direct(fd, True)
+
+        # A fixed pattern whose period divides the chunk is the same in every chunk of an
+        # extent, so it is only regenerated when an extent starts at a different phase
+        reusable = bool(pattern.period) and self.chunk_size % pattern.period == 0
+        phase = None
+        with memoryview(self.buffer) as buffer:
+            for start, end in extents:
+                if reusable and start % pattern.period != phase:
+                    phase = start % pattern.period
+                    pattern.fill(buffer, start)
+
+                offset = start
+                while offset < end:
+                    length = min(self.chunk_size, end - offset)
+                    with buffer[:length] as chunk:
+                        if not reusable:
+                            pattern.fill(chunk, offset)
+                        if direct and length % DIRECT_IO_ALIGNMENT:
+                            # Unaligned tail - finish it through the page cache
+                            self._set_direct(fd, False)
+                            direct = False
+                        written = 0
+                        while written < length:
+                            try:
+                                with chunk[written:] as rest:
+                                    written += os.pwrite(fd, rest, offset + written)
+                            except OSError as e:
+                                # Filesystems with larger blocks than DIRECT_IO_ALIGNMENT refuse the write
+                                if e.errno != errno.EINVAL or not direct:
+                                    raise
+                                self._set_direct(fd, False)
+                                direct = False
+                    offset += length
+
+
+class ParallelShredder:
+    """Worker-pool file shredder with per-filesystem durability barriers between passes"""
+
+    def __init__(self, method="zeros", workers=SHRED_WORKERS, chunk_size=FILE_CHUNK_SIZE, io_mode="buffered",
+                 batch_files=SHRED_BATCH_FILES, batch_bytes=SHRED_BATCH_BYTES, order="auto", callback=None):
+        """
+        Args:
+            method (str): Wiping method (zeros, random, dod, gutmann)
+            workers (int): Files overwritten at once
+            chunk_size (int): Bytes per write
+            io_mode (str): "buffered" or "direct"
+            batch_files (int): Most files between barriers
+            batch_bytes (int): Most apparent bytes between barriers (a larger file is a batch of its own)
+            order (str): "auto" sorts files on rotational disks by physical offset, "physical" sorts
+                every filesystem's files, "none" keeps scan order
+            callback (callable): Progress callback (message, progress)
+        """
+        if workers < 1 or batch_files < 1:
+            raise ValueError("Worker and batch counts must be at least 1")
+        if order not in SHRED_ORDERS:
+            raise ValueError(f"Unknown shred order: {order}")
+        # Validates the method, chunk size and I/O mode before any file is touched
+        FileOverwriter(method, chunk_size, io_mode, sync=False).close()
+
+        self.method = method
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.io_mode = io_mode
+        self.batch_files = batch_files
+        self.batch_bytes = batch_bytes
+        self.order = order
+        self.callback = callback
+        self.is_running = False
+        self.stats = None
+        self._local = threading.local()
+        self._overwriters = []
+        self._lock = threading.Lock()
+
+    def stop(self):
+        """Stop after the running batch"""
+        self.is_running = False
+
+    def _overwriter(self):
+        """The calling worker's FileOverwriter (each worker has its own buffer)"""
+        overwriter = getattr(self._local, 'overwriter', None)
+        if overwriter is None:
+            overwriter = FileOverwriter(self.method, self.chunk_size, self.io_mode, sync=False)
+            self._local.overwriter = overwriter
+            with self._lock:
+                self._overwriters.append(overwriter)
+        return overwriter
+
+    def _batches(self, files):
+        batch = []
+        batch_bytes = 0
+        for scanned in files:
+            if batch and (len(batch) >= self.batch_files or batch_bytes + scanned.stat.st_size > self.batch_bytes):
+                yield batch
+                batch = []
+                batch_bytes = 0
+            batch.append(scanned)
+            batch_bytes += scanned.stat.st_size
+        if batch:
+            yield batch
+
+    def _plan(self, files, pool):
+        """
+        Split files into work queues: files on rotational disks sorted by physical offset, the rest in scan order
+
+        Returns:
+            list: (ordered, files) queues
+        """
+        if self.order == 'none':
+            return [(False, files)]
+
+        devices = {}
+        for scanned in files:
+            devices.setdefault(scanned.stat.st_dev, []).append(scanned)
+        sorted_devices = {device for device in devices if self.order == 'physical' or is_rotational(device)}
+
+        # Files FIEMAP cannot place (empty, inline, unsupported) go last, in scan order
+        plan = []
+        unordered = [scanned for scanned in files if scanned.stat.st_dev not in sorted_devices]
+        if unordered:
+            plan.append((False, unordered))
+        for device in sorted_devices:
+            group = devices[device]
+            offsets = pool.map(lambda scanned: first_physical_offset(scanned.path), group)
+            keyed = sorted(zip(offsets, range(len(group))), key=lambda pair: (pair[0] is None, pair[0] or 0, pair[1]))
+            plan.append((True, [group[index] for offset, index in keyed]))
+        return plan
+
+    def shred(self, files):
+        """
+        Overwrite and unlink files
+
+        Args:
+            files (list): ScannedFile entries (see file_scanner.py)
+
+        Returns:
+            dict: Files shredded, their apparent and allocated bytes, bytes written, rates,
+                barriers and per-file errors
+        """
+        self.is_running = True
+        total = len(files)
+        shredded = []
+        errors = []
+        passes = file_pass_count(self.method)
+        apparent_bytes = allocated_bytes = bytes_written = 0
+        barriers = 0
+        ordered_files = 0
+        start_time = time.time()
+        last_report = start_time
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="trustwipe-shred") as pool:
+                plan = self._plan(files, pool)
+                batches = ((ordered, batch) for ordered, queue in plan for batch in self._batches(queue))
+                for ordered, batch in batches:
+                    if not self.is_running:
+                        break
+                    done, apparent, allocated, failed, batch_barriers = self._shred_batch(batch, pool, ordered)
+                    if ordered:
+                        ordered_files += len(done)
+                    shredded.extend(done)
+                    errors.extend(failed)
+                    apparent_bytes += apparent
+                    allocated_bytes += allocated
+                    bytes_written += allocated * passes
+                    barriers += batch_barriers
+
+                    now = time.time()
+                    if self.callback and now - last_report >= PROGRESS_INTERVAL:
+                        last_report = now
+                        self.callback(self._rate_message(len(shredded), bytes_written, now - start_time),
+                                      round((len(shredded) + len(errors)) / total * 100, 1))
+        finally:
+            self.is_running = False
+            for overwriter in self._overwriters:
+                overwriter.close()
+            self._overwriters = []
+            self._local = threading.local()
+
+        elapsed = time.time() - start_time
+        self.stats = {
+            'files': len(shredded),
+            'bytes_written': bytes_written,
+            'apparent_bytes': apparent_bytes,
+            'allocated_bytes': allocated_bytes,
+            'errors': errors,
+            'barriers': barriers,
+            'syncfs': HAS_SYNCFS,
+            'workers': self.workers,
+            'order': self.order,
+            'ordered_files': ordered_files,
+            'seconds': round(elapsed, 3),
+            'files_per_sec': round(len(shredded) / elapsed, 1) if elapsed > 0 else None,
+            'mb_per_sec': round((bytes_written / (1024 * 1024)) / elapsed, 1) if elapsed > 0 else None,
+            'shredded': shredded,
+        }
+        return self.stats
+
+    @staticmethod
+    def _rate_message(files, bytes_written, elapsed):
+        """Progress text with the file and byte rates so far"""
+        if elapsed <= 0:
+            return f"Shredded {files:,} files"
+        return (f"Shredded {files:,} files @ {files / elapsed:,.0f} files/s, "
+                f"{bytes_written / (1024 * 1024) / elapsed:.1f} MB/s")
+
+    def _shred_batch(self, batch, pool, ordered=False):
+        """
+        Write every pass over a batch, with a barrier per filesystem after each, then unlink it
+
+        An ordered batch (files sorted by physical offset on a spinning disk) is written one file at
+        a time in that order, so each pass sweeps the disk once instead of seeking between workers.
+
+        Returns:
+            tuple: (unlinked paths, their apparent and allocated bytes, error messages, barriers run)
+        """
+        live = []      # [scanned, fd, direct, size, patterns, extents] of files still being shredded
+        errors = []
+        barriers = 0
+        for scanned, opened in zip(batch, pool.map(self._open, batch)):
+            if isinstance(opened, OSError):
+                errors.append(f"{scanned.path}: {opened}")
+            else:
+                live.append([scanned, *opened])
+
+        try:
+            write_all = map if ordered else pool.map
+            for pass_index in range(file_pass_count(self.method)):
+                written = []
+                for entry, error in zip(live, write_all(lambda entry: self._write(entry, pass_index), live)):
+                    if error:
+                        errors.append(f"{entry[0].path}: {error}")
+                    else:
+                        written.append(entry)
+                live = written
+
+                # One barrier per filesystem; none of its files count as written if it fails
+                failed_devices = set()
+                for device, barrier_errors in self._barrier(live, pool).items():
+                    barriers += 1
+                    if barrier_errors:
+                        failed_devices.add(device)
+                        errors.extend(barrier_errors)
+                live = [entry for entry in live if entry[0].stat.st_dev not in failed_devices]
+        finally:
+            for entry in live:
+                self._discard(entry)
+
+        unlinked = []
+        apparent = allocated = 0
+        for scanned, fd, direct, size, patterns, extents in live:
+            try:
+                os.unlink(scanned.path)
+            except OSError as e:
+                errors.append(f"{scanned.path}: overwritten but not removed: {e}")
+                continue
+            unlinked.append(scanned.path)
+            apparent += size
+            allocated += sum(end - start for start, end in extents)
+        return unlinked, apparent, allocated, errors, barriers
+
+    def _open(self, scanned):
+        """Open a file for shredding; returns (fd, direct, size, patterns, extents), or the error instead of raising"""
+        try:
+            fd, direct = self._overwriter().open_file(scanned.path)
+        except OSError as e:
+            return e
+        try:
+            size = os.fstat(fd).st_size
+            extents = data_extents(fd, size)
+        except OSError as e:
+            os.close(fd)
+            return e
+        return fd, direct, size, file_pass_patterns(self.method), extents
+
+    def _write(self, entry, pass_index):
+        """Write one pass over an open file; returns the error instead of raising, and closes failed files"""
+        scanned, fd, direct, size, patterns, extents = entry
+        try:
+            self._overwriter().write_pass(fd, patterns[pass_index], extents, direct)
+            return None
+        except OSError as e:
+            self._discard(entry)
+            return e
+
+    @staticmethod
+    def _discard(entry):
+        """Close a file's descriptor and its pattern sources (once)"""
+        if entry[1] is None:
+            return
+        for pattern in entry[4]:
+            if hasattr(pattern, 'close'):
+                pattern.close()
+        os.close(entry[1])
+        entry[1] = None
+
+    def _barrier(self, live, pool):
+        """
+        Make the last pass over `live` durable, once per filesystem
+
+        Returns:
+            dict: st_dev -> error messages (empty when the filesystem's barrier succeeded)
+        """
+        devices = {}
+        for entry in live:
+            devices.setdefault(entry[0].stat.st_dev, []).append(entry)
+
+        def flush(entries):
+            try:
+                if HAS_SYNCFS:
+                    syncfs(entries[0][1])
+                else:
+                    for entry in entries:
+                        os.fsync(entry[1])
+                return []
+            except OSError as e:
+                for entry in entries:
+                    self._discard(entry)
+                return [f"{entry[0].path}: durability barrier failed: {e}" for entry in entries]
+
+        return dict(zip(devices, pool.map(flush, devices.values())))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Overwrite files in place with constant memory")
+    parser.add_argument('files', nargs='+', help='Files to overwrite')
+    parser.add_argument('--method', choices=FILE_METHODS, default='zeros', help='Wiping method')
+    parser.add_argument('--chunk-size', type=int, default=FILE_CHUNK_SIZE // 1024, metavar='KB',
+                        help='Bytes per write in KiB (multiple of 4, default: 3072)')
+    parser.add_argument('--io-mode', choices=FILE_IO_MODES, default='buffered', help='Page cache or O_DIRECT writes')
+    parser.add_argument('--remove', action='store_true', help='Remove each file after overwriting it')
+    args = parser.parse_args()
+
+    start_time = time.time()
+    with FileOverwriter(args.method, args.chunk_size * 1024, args.io_mode) as overwriter:
+        for path in args.files:
+            try:
+                overwriter.overwrite(path)
+                if args.remove:
+                    os.remove(path)
+            except OSError as e:
+                print(f"❌ {path}: {e}", file=sys.stderr)
+    elapsed = time.time() - start_time
+    print(f"🗑️ {overwriter.files_written:,} files, {overwriter.bytes_written:,} bytes written in {elapsed:.2f}s "
+          f"({overwriter.allocated_bytes:,} allocated of {overwriter.apparent_bytes:,} apparent bytes)")
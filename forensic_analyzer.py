@@ -0,0 +1,388 @@
+#!/usr/bin/env python3
+"""
+TrustWipe Forensic Analyzer
+Single-pass analysis of sampled device regions, replacing the
+dd | xxd | fold | sort | uniq pipelines of forensic-verify.sh
+
+Each sampled region is read once. In that pass the analyzer computes the
+byte histogram, Shannon entropy, a chi-square uniformity test, printable
+string runs, file signatures (see signature_scanner) and filesystem magic,
+then classifies the region as zeros, a repeating pattern, random data or
+structured data. Wiped regions (fills and fixed patterns) are recognised
+by a period check in a single memcmp, so only random and structured
+regions pay for a histogram. Regions are spread over a process pool, so
+large sample sets scale across cores, and the result is a structured
+report rather than shell text.
+"""
+
+import os
+import re
+import sys
+import json
+import math
+import mmap
+import errno
+import time
+import argparse
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from pattern_generator import repeat_period
+from signature_scanner import SignatureScanner
+
+try:
+    import numpy
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+ANALYSIS_REGION_SIZE = 4 * 1024 * 1024   # Bytes read per sampled region
+DEFAULT_SAMPLES = 32                     # Regions spread evenly, the first at offset 0
+PARTITION_ALIGNMENT = 1024 * 1024        # Filesystem magic is looked for at these boundaries
+MAX_PATTERN_PERIOD = 16                  # Longest repeating pattern recognised as a wipe fill
+MIN_STRING_LENGTH = 4                    # Same as strings -n 4
+MAX_REPORTED_STRINGS = 5
+MAX_STRING_SAMPLE = 64
+RANDOM_ENTROPY = 7.9                     # Bits per byte above which data may be random
+UNIFORMITY_P = 0.001                     # Chi-square p-value below which data is not uniform
+
+ZEROS = 'zeros'
+PATTERN = 'pattern'
+RANDOM = 'random'
+DATA = 'data'
+
+# (name, offset from the start of a partition, magic)
+FILESYSTEM_MAGIC = [
+    ('MBR partition table', 510, b'\x55\xaa'),
+    ('GPT header', 512, b'EFI PART'),
+    ('LVM2 physical volume', 536, b'LVM2 001'),
+    ('ext2/3/4', 1080, b'\x53\xef'),
+    ('XFS', 0, b'XFSB'),
+    ('Btrfs', 0x10040, b'_BHRfS_M'),
+    ('NTFS', 3, b'NTFS    '),
+    ('exFAT', 3, b'EXFAT   '),
+    ('FAT32', 82, b'FAT32   '),
+    ('FAT12/16', 54, b'FAT1'),
+    ('LUKS', 0, b'LUKS\xba\xbe'),
+    ('Linux swap', 4086, b'SWAPSPACE2'),
+    ('ISO 9660', 0x8001, b'CD001'),
+]
+
+_PRINTABLE_RUN = re.compile(rb'[\x20-\x7e\t]{%d,}' % MIN_STRING_LENGTH)
+_scanner = None   # Signature table compiled on first use in each process
+
+
+def plan_regions(size, samples=DEFAULT_SAMPLES, region_size=ANALYSIS_REGION_SIZE):
+    """
+    Regions to analyse, spread evenly from the first byte to the last
+
+    Args:
+        size (int): Device size in bytes
+        samples (int): Number of regions
+        region_size (int): Bytes per region
+
+    Returns:
+        list: (offset, length) tuples in ascending order, without overlaps
+    """
+    region_size = min(region_size, size)
+    if samples <= 1 or size <= region_size:
+        return [(0, region_size)] if size else []
+
+    regions = []
+    for index in range(samples):
+        # Keep reads sector aligned for O_DIRECT
+        offset = (size - region_size) * index // (samples - 1) // 4096 * 4096
+        if regions and offset < regions[-1][0] + regions[-1][1]:
+            continue
+        regions.append((offset, min(region_size, size - offset)))
+    return regions
+
+
+def byte_histogram(data):
+    """Count of each byte value (numpy when installed, collections.Counter otherwise)"""
+    if HAS_NUMPY:
+        return numpy.bincount(numpy.frombuffer(data, dtype=numpy.uint8), minlength=256).tolist()
+    counts = Counter(data)
+    return [counts.get(value, 0) for value in range(256)]
+
+
+def shannon_entropy(histogram, length):
+    """Entropy in bits per byte"""
+    if not length:
+        return 0.0
+    return max(0.0, -sum(count / length * math.log2(count / length) for count in histogram if count))
+
+
+def chi_square_uniformity(histogram, length):
+    """
+    Chi-square statistic against uniform bytes, and its p-value
+
+    The p-value uses the Wilson-Hilferty normal approximation for 255
+    degrees of freedom, which is accurate well below UNIFORMITY_P.
+
+    Returns:
+        tuple: (statistic, p-value)
+    """
+    if not length:
+        return 0.0, 0.0
+    expected = length / 256
+    statistic = sum((count - expected) ** 2 for count in histogram) / expected
+    df = 255
+    z = ((statistic / df) ** (1 / 3) - (1 - 2 / (9 * df))) / math.sqrt(2 / (9 * df))
+    return statistic, 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def _signature_scanner():
+    global _scanner
+    if _scanner is None:
+        _scanner = SignatureScanner()
+    return _scanner
+
+
+def find_signatures(data, offset):
+    """File signatures anywhere in a region, with device offsets"""
+    return [{'name': hit['name'], 'offset': hit['offset']} for hit in _signature_scanner().scan(data, offset)]
+
+
+def find_filesystems(data, offset, classification):
+    """Filesystem and partition-table magic at partition-aligned positions in a region"""
+    found = []
+    start = -(-offset // PARTITION_ALIGNMENT) * PARTITION_ALIGNMENT
+    for base in range(start, offset + len(data), PARTITION_ALIGNMENT):
+        for name, position, magic in FILESYSTEM_MAGIC:
+            if name == 'MBR partition table' and base != 0:
+                continue
+            if classification == RANDOM and len(magic) < 4:
+                # Two-byte magic turns up in random data by chance
+                continue
+            index = base - offset + position
+            if data[index:index + len(magic)] == magic:
+                found.append({'name': name, 'offset': base})
+    return found
+
+
+def analyze_region(data, offset=0):
+    """
+    Analyse one region in a single pass over its bytes
+
+    Args:
+        data (bytes): Region contents
+        offset (int): Device offset of the region
+
+    Returns:
+        dict: Classification, histogram, entropy, chi-square, strings, signatures and filesystems
+    """
+    length = len(data)
+    period = repeat_period(data, MAX_PATTERN_PERIOD) if length > 1 else (1 if length else None)
+
+    if period is not None:
+        # A fill or fixed pattern: the histogram follows from one period
+        unit = data[:period]
+        histogram = [0] * 256
+        for value in unit:
+            histogram[value] += length // period
+        for value in data[length - length % period:]:
+            histogram[value] += 1
+        classification = ZEROS if unit == bytes(period) else PATTERN
+    else:
+        histogram = byte_histogram(data)
+
+    entropy = shannon_entropy(histogram, length)
+    chi_square, p_value = chi_square_uniformity(histogram, length)
+    if period is None:
+        classification = RANDOM if entropy >= RANDOM_ENTROPY and p_value >= UNIFORMITY_P else DATA
+
+    strings = 0
+    samples = []
+    if period is None:
+        for match in _PRINTABLE_RUN.finditer(data):
+            strings += 1
+            if len(samples) < MAX_REPORTED_STRINGS:
+                samples.append({
+                    'offset': offset + match.start(),
+                    'text': match.group()[:MAX_STRING_SAMPLE].decode('ascii'),
+                })
+
+    return {
+        'offset': offset,
+        'length': length,
+        'classification': classification,
+        'pattern': data[:period].hex() if period else None,
+        'unique_bytes': sum(1 for count in histogram if count),
+        'entropy': round(entropy, 4),
+        'chi_square': round(chi_square, 1),
+        'uniformity_p': round(p_value, 6),
+        'histogram': histogram,
+        'strings': strings,
+        'string_samples': samples,
+        'signatures': find_signatures(data, offset) if period is None else [],
+        'filesystems': find_filesystems(data, offset, classification),
+    }
+
+
+def _read_region(device_path, offset, length):
+    """Read a region with O_DIRECT where supported, so the page cache cannot answer for the device"""
+    flags = os.O_RDONLY | getattr(os, 'O_CLOEXEC', 0)
+    try:
+        fd = os.open(device_path, flags | getattr(os, 'O_DIRECT', 0))
+    except OSError as e:
+        if e.errno != errno.EINVAL:
+            raise
+        fd = os.open(device_path, flags)
+
+    try:
+        # mmap buffers are page aligned, as O_DIRECT requires
+        buffer = mmap.mmap(-1, max(mmap.PAGESIZE, -(-length // 4096) * 4096))
+        try:
+            with memoryview(buffer) as view:
+                total = 0
+                while total < length:
+                    count = os.preadv(fd, [view[total:]], offset + total)
+                    if count == 0:
+                        break
+                    total += count
+                return bytes(view[:min(total, length)])
+        finally:
+            buffer.close()
+    finally:
+        os.close(fd)
+
+
+def _analyze_at(device_path, offset, length):
+    """Worker entry point: read one region and analyse it"""
+    return analyze_region(_read_region(device_path, offset, length), offset)
+
+
+def _check(passed, detail):
+    return {'status': 'PASS' if passed else 'FAIL', 'detail': detail}
+
+
+def analyze_device(device_path, samples=DEFAULT_SAMPLES, region_size=ANALYSIS_REGION_SIZE,
+                   workers=None, callback=None):
+    """
+    Read sampled regions of a device once each and report what they hold
+
+    Args:
+        device_path (str): Device or image file
+        samples (int): Regions to analyse, spread evenly over the device
+        region_size (int): Bytes per region
+        workers (int): Analysis processes (default: CPU count)
+        callback (callable): Progress callback (message, progress)
+
+    Returns:
+        dict: Per-region results, summary counts, checks and verdict
+    """
+    with open(device_path, 'rb') as f:
+        size = f.seek(0, os.SEEK_END)
+    plan = plan_regions(size, samples, region_size)
+    workers = max(1, min(workers or os.cpu_count() or 1, len(plan) or 1))
+
+    start_time = time.time()
+    regions = []
+
+    def progress(done):
+        if callback:
+            callback(f"Analysed {done}/{len(plan)} regions", round(done / len(plan) * 100, 1))
+
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(_analyze_at, device_path, offset, length) for offset, length in plan]
+            for done, _ in enumerate(as_completed(futures), 1):
+                progress(done)
+            regions = [future.result() for future in futures]
+    else:
+        for done, (offset, length) in enumerate(plan, 1):
+            regions.append(_analyze_at(device_path, offset, length))
+            progress(done)
+
+    elapsed = time.time() - start_time
+    bytes_analyzed = sum(region['length'] for region in regions)
+    counts = Counter(region['classification'] for region in regions)
+
+    # Printable runs in random data are chance, not leftovers
+    structured = [region for region in regions if region['classification'] == DATA]
+    strings = sum(region['strings'] for region in structured)
+    signatures = [hit for region in regions for hit in region['signatures']]
+    # Short magic turns up in random wipe data by chance; as in scan_device,
+    # allow the expected count over random regions plus four standard deviations
+    random_bytes = sum(region['length'] for region in regions if region['classification'] == RANDOM)
+    chance = _signature_scanner().chance_hits(random_bytes)
+    chance_limit = math.floor(chance + 4 * math.sqrt(chance))
+    filesystems = [hit for region in regions for hit in region['filesystems']]
+    head = regions[0] if regions else None
+
+    checks = {
+        'pattern_analysis': _check(not structured, f"{len(structured)}/{len(regions)} regions hold structured data"),
+        'file_signatures': _check(len(signatures) <= chance_limit,
+                                  f"{len(signatures)} file signatures ({chance:.2f} expected by chance)"),
+        'strings': _check(not strings, f"{strings} printable strings in structured regions"),
+        'filesystem_magic': _check(not filesystems, f"{len(filesystems)} filesystem or partition structures"),
+        'first_sectors': _check(head is None or head['classification'] != DATA,
+                                f"first region is {head['classification'] if head else 'empty'}"),
+    }
+
+    return {
+        'device_path': device_path,
+        'device_size': size,
+        'region_size': region_size,
+        'regions': regions,
+        'summary': {
+            ZEROS: counts[ZEROS],
+            PATTERN: counts[PATTERN],
+            RANDOM: counts[RANDOM],
+            DATA: counts[DATA],
+            'strings': strings,
+            'signatures': len(signatures),
+            'filesystems': len(filesystems),
+        },
+        'checks': checks,
+        'score': sum(1 for check in checks.values() if check['status'] == 'PASS'),
+        'max_score': len(checks),
+        'verdict': 'PASS' if all(check['status'] == 'PASS' for check in checks.values()) else 'FAIL',
+        'workers': workers,
+        'bytes_analyzed': bytes_analyzed,
+        'seconds': round(elapsed, 3),
+        'mb_per_sec': round((bytes_analyzed / (1024 * 1024)) / elapsed, 1) if elapsed > 0 else None,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Single-pass forensic analysis of a wiped device")
+    parser.add_argument('device', help='Device or image file')
+    parser.add_argument('--samples', type=int, default=DEFAULT_SAMPLES, help='Regions to analyse (default: 32)')
+    parser.add_argument('--region-mb', type=int, default=ANALYSIS_REGION_SIZE // (1024 * 1024),
+                        help='Megabytes per region (default: 4)')
+    parser.add_argument('--workers', type=int, help='Analysis processes (default: CPU count)')
+    parser.add_argument('--json', action='store_true', help='Print the full report as JSON')
+    args = parser.parse_args()
+
+    def progress_display(message, progress):
+        if not args.json:
+            print(f"\r🔬 {message} [{progress:.1f}%]", end="", flush=True)
+
+    report = analyze_device(args.device, args.samples, args.region_mb * 1024 * 1024, args.workers,
+                            progress_display)
+    if args.json:
+        print(json.dumps(report, indent=2))
+        sys.exit(0 if report['verdict'] == 'PASS' else 2)
+
+    print()
+    summary = report['summary']
+    print(f"📊 {len(report['regions'])} regions, {report['bytes_analyzed']:,} bytes @ {report['mb_per_sec']} MB/s "
+          f"({report['workers']} workers)")
+    print(f"   Zeros: {summary[ZEROS]}  Pattern: {summary[PATTERN]}  Random: {summary[RANDOM]}  "
+          f"Data: {summary[DATA]}")
+    for region in report['regions']:
+        if region['classification'] == DATA or region['signatures'] or region['filesystems']:
+            print(f"⚠️  Offset {region['offset']:,}: {region['classification']}, "
+                  f"entropy {region['entropy']}, {region['strings']} strings")
+            for hit in region['filesystems'] + region['signatures']:
+                print(f"     {hit['name']} at {hit['offset']:,}")
+            for sample in region['string_samples']:
+                print(f"     {sample['offset']:,}: {sample['text']!r}")
+    print()
+    for name, check in report['checks'].items():
+        print(f"{'✅' if check['status'] == 'PASS' else '❌'} {name.replace('_', ' ').capitalize()}: "
+              f"{check['status']} ({check['detail']})")
+    print(f"\n📊 FINAL SCORE: {report['score']}/{report['max_score']} - {report['verdict']}")
+    sys.exit(0 if report['verdict'] == 'PASS' else 2)
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+TrustWipe Device Digest
+Merkle tree hash of a device's final contents, computed during read-back
+verification and embedded in the certificate
+
+The device is split into fixed-size leaves (16 MiB by default). Each leaf
+is hashed with BLAKE2b-256 as the verification read passes over it, and
+the leaf hashes are combined pairwise into a single root, with distinct
+prefixes for leaves and inner nodes so one can never pass for the other.
+Leaves that a read contains completely are hashed on a thread pool;
+hashlib releases the GIL for large buffers, so hashing scales across
+cores and keeps pace with sequential reads. The certificate stores the
+root and the tree parameters, and the leaf hashes are written next to it,
+so an auditor can later re-read any leaf, compare it with its stored hash
+and check the stored hashes against the root, without re-hashing the
+whole device.
+"""
+
+import os
+import sys
+import json
+import random
+import hashlib
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+MERKLE_LEAF_SIZE = 16 * 1024 * 1024   # Bytes per leaf
+MERKLE_ALGORITHM = 'blake2b-256'
+DIGEST_SIZE = 32
+LEAF_PREFIX = b'\x00'                 # Domain separation as in RFC 6962
+NODE_PREFIX = b'\x01'
+
+
+def _leaf_hasher():
+    hasher = hashlib.blake2b(digest_size=DIGEST_SIZE)
+    hasher.update(LEAF_PREFIX)
+    return hasher
+
+
+def leaf_hash(data):
+    """Hash of one leaf's contents"""
+    hasher = _leaf_hasher()
+    hasher.update(data)
+    return hasher.digest()
+
+
+def merkle_root(leaves):
+    """
+    Root of the tree over a list of leaf hashes
+
+    Pairs are hashed level by level; an odd hash at the end of a level is
+    carried up unchanged.
+
+    Args:
+        leaves (list): Leaf hashes in device order
+
+    Returns:
+        bytes: Root hash (the hash of an empty leaf for an empty device)
+    """
+    level = list(leaves) or [leaf_hash(b'')]
+    while len(level) > 1:
+        paired = [hashlib.blake2b(NODE_PREFIX + level[i] + level[i + 1], digest_size=DIGEST_SIZE).digest()
+                  for i in range(0, len(level) - 1, 2)]
+        if len(level) % 2:
+            paired.append(level[-1])
+        level = paired
+    return level[0]
+
+
+def split_leaves(data):
+    """Split a leaves file back into the list of leaf hashes"""
+    if len(data) % DIGEST_SIZE:
+        raise ValueError("Leaf hash data is not a whole number of hashes")
+    return [data[i:i + DIGEST_SIZE] for i in range(0, len(data), DIGEST_SIZE)]
+
+
+class MerkleDigest:
+    """Leaf hashes of a device, fed by the blocks of a sequential read"""
+
+    def __init__(self, size, leaf_size=MERKLE_LEAF_SIZE, workers=None):
+        """
+        Args:
+            size (int): Device size in bytes
+            leaf_size (int): Bytes per leaf
+            workers (int): Hashing threads (default: one per CPU)
+        """
+        if leaf_size <= 0:
+            raise ValueError("Leaf size must be positive")
+
+        self.size = size
+        self.leaf_size = leaf_size
+        self.leaf_count = -(-size // leaf_size)
+        self.workers = workers or os.cpu_count() or 1
+        self._leaves = [None] * self.leaf_count
+        self._partial = {}   # leaf -> (hasher, bytes hashed so far) for leaves split across reads
+        self._lock = threading.Lock()
+        self._executor = None
+
+    def _leaf_end(self, leaf):
+        return min((leaf + 1) * self.leaf_size, self.size)
+
+    def update(self, offset, data):
+        """
+        Hash the bytes read at `offset`; the data is not kept after the call returns
+
+        Reads must cover each leaf in order, as a sequential read does.
+
+        Args:
+            offset (int): Device offset of the data
+            data: bytes-like object
+        """
+        end = min(offset + len(data), self.size)
+        position = offset
+        whole = []
+
+        while position < end:
+            leaf = position // self.leaf_size
+            leaf_start = leaf * self.leaf_size
+            leaf_end = self._leaf_end(leaf)
+            if position == leaf_start and leaf_end <= end:
+                whole.append(leaf)
+                position = leaf_end
+                continue
+
+            # Part of a leaf: hash incrementally until the rest of it is read
+            chunk_end = min(leaf_end, end)
+            with self._lock:
+                hasher, done = self._partial.get(leaf, (None, leaf_start))
+                if done != position:
+                    raise ValueError(f"Leaf {leaf} was not read in order")
+                hasher = hasher or _leaf_hasher()
+                hasher.update(data[position - offset:chunk_end - offset])
+                if chunk_end == leaf_end:
+                    self._leaves[leaf] = hasher.digest()
+                    self._partial.pop(leaf, None)
+                else:
+                    self._partial[leaf] = (hasher, chunk_end)
+            position = chunk_end
+
+        if len(whole) == 1 or (whole and self.workers == 1):
+            for leaf in whole:
+                self._leaves[leaf] = self._hash_leaf(data, offset, leaf)
+        elif whole:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="trustwipe-merkle")
+            for leaf, digest in zip(whole, self._executor.map(lambda leaf: self._hash_leaf(data, offset, leaf), whole)):
+                self._leaves[leaf] = digest
+
+    def _hash_leaf(self, data, offset, leaf):
+        start = leaf * self.leaf_size - offset
+        return leaf_hash(data[start:start + self._leaf_end(leaf) - leaf * self.leaf_size])
+
+    @property
+    def complete(self):
+        """True once every leaf has been hashed"""
+        return all(digest is not None for digest in self._leaves)
+
+    def close(self):
+        """Stop the hashing threads"""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def leaves(self):
+        """Concatenated leaf hashes, in device order"""
+        if not self.complete:
+            raise ValueError("Not every leaf of the device has been read")
+        return b''.join(self._leaves)
+
+    def record(self):
+        """
+        Certificate record of the tree
+
+        Returns:
+            dict: Algorithm, leaf size and count, device size and root (hex)
+        """
+        if not self.complete:
+            raise ValueError("Not every leaf of the device has been read")
+        return {
+            'algorithm': MERKLE_ALGORITHM,
+            'leaf_size': self.leaf_size,
+            'leaf_count': self.leaf_count,
+            'device_size': self.size,
+            'root': merkle_root(self._leaves).hex(),
+        }
+
+
+def recheck_leaves(device_path, record, leaves, indices):
+    """
+    Re-read leaves of a device and compare them with a certificate's digest
+
+    Args:
+        device_path (str): Device or image to re-read
+        record (dict): The certificate's device digest record
+        leaves (bytes): Contents of the certificate's leaves file
+        indices (list): Leaves to re-read
+
+    Returns:
+        dict: Whether the leaves file matches the root, and the leaves that differ now
+    """
+    hashes = split_leaves(leaves)
+    root_matches = len(hashes) == record['leaf_count'] and merkle_root(hashes).hex() == record['root']
+
+    leaf_size = record['leaf_size']
+    changed = []
+    with open(device_path, 'rb', buffering=0) as device:
+        for index in sorted(set(indices)):
+            start = index * leaf_size
+            length = min(leaf_size, record['device_size'] - start)
+            data = os.pread(device.fileno(), length, start)
+            if index >= len(hashes) or leaf_hash(data) != hashes[index]:
+                changed.append(index)
+
+    return {
+        'root_matches': root_matches,
+        'leaves_checked': len(set(indices)),
+        'changed_leaves': changed,
+        'status': 'PASS' if root_matches and not changed else 'FAIL',
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Spot-check a wiped device against its certificate's digest")
+    parser.add_argument('device', help='Device or image the certificate covers')
+    parser.add_argument('certificate', help='JSON certificate with a device digest')
+    parser.add_argument('--leaves', type=int, nargs='+', metavar='N', help='Leaf numbers to re-read')
+    parser.add_argument('--sample', type=int, default=16, help='Random leaves to re-read when --leaves is not given')
+    args = parser.parse_args()
+
+    with open(args.certificate) as f:
+        record = json.load(f)['wipe_details'].get('device_digest')
+    if not record:
+        sys.exit("❌ Certificate has no device digest")
+    with open(os.path.join(os.path.dirname(os.path.abspath(args.certificate)), record['leaves_file']), 'rb') as f:
+        leaves = f.read()
+
+    indices = args.leaves or random.sample(range(record['leaf_count']), min(args.sample, record['leaf_count']))
+    result = recheck_leaves(args.device, record, leaves, indices)
+    print(f"🌳 Root {record['root']} ({record['leaf_count']:,} x {record['leaf_size']:,}-byte leaves): "
+          f"{'matches' if result['root_matches'] else 'DOES NOT MATCH'} the leaves file")
+    print(f"{'✅' if result['status'] == 'PASS' else '❌'} {result['leaves_checked']} leaves re-read, "
+          f"{len(result['changed_leaves'])} changed {result['changed_leaves'][:10]}")
+    sys.exit(0 if result['status'] == 'PASS' else 2)
@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+"""
+TrustWipe Pattern Generator
+Pattern sources for wipe passes: fixed byte sequences, the DoD and Gutmann
+pass tables, and a high-throughput random keystream
+
+The kernel CSPRNG is read once for a 256-bit key. The key is then expanded
+into a stream-cipher keystream (AES-256-CTR when the cryptography package is
+installed, SHAKE-256 otherwise) in fixed 1 MiB keystream blocks generated by
+parallel workers, so random passes run at device speed instead of
+/dev/urandom speed.
+
+Each wipe draws one secret seed, and every random pass keys its keystream
+with HMAC-SHA256(seed, pass number). Any block of any random pass can
+therefore be regenerated from the seed alone, in any order, so random passes
+can be verified like fixed ones. The seed itself is never logged or put in a
+certificate; certificates carry a commitment (a domain-separated SHA-256 of
+the seed) that a later verifier holding the seed can check.
+"""
+
+import os
+import sys
+import hmac
+import time
+import hashlib
+import threading
+import multiprocessing
+from itertools import repeat
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+try:
+    from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+    HAS_AES = True
+except ImportError:
+    HAS_AES = False
+
+KEYSTREAM_BLOCK_SIZE = 1024 * 1024       # Unit of parallel generation
+PATTERN_BUFFER_SIZE = 48 * 1024 * 1024   # Multiple of 3 (Gutmann triplets) and of 4 KiB (O_DIRECT)
+KEY_SIZE = 32                            # 256-bit key read from the kernel once
+
+AES_CTR = 'aes-256-ctr'
+SHAKE_256 = 'shake-256'
+ALGORITHMS = [AES_CTR, SHAKE_256]
+DEFAULT_ALGORITHM = AES_CTR if HAS_AES else SHAKE_256
+
+KEY_DERIVATION = 'HMAC-SHA256(seed, "trustwipe-pass" || uint32_be(pass number - 1))'
+
+
+# DoD 5220.22-M: zeros, ones, random (None marks a random pass)
+DOD_PASSES = [b'\x00', b'\xFF', None]
+
+# Gutmann: 4 random passes, 27 fixed patterns, 4 random passes
+GUTMANN_PASSES = [None] * 4 + [
+    b'\x55', b'\xAA',
+    b'\x92\x49\x24', b'\x49\x24\x92', b'\x24\x92\x49',
+    b'\x00', b'\x11', b'\x22', b'\x33', b'\x44', b'\x55', b'\x66', b'\x77',
+    b'\x88', b'\x99', b'\xAA', b'\xBB', b'\xCC', b'\xDD', b'\xEE', b'\xFF',
+    b'\x92\x49\x24', b'\x49\x24\x92', b'\x24\x92\x49',
+    b'\x6D\xB6\xDB', b'\xB6\xDB\x6D', b'\xDB\x6D\xB6',
+] + [None] * 4
+
+PASS_TABLES = {
+    'dod': DOD_PASSES,
+    'gutmann': GUTMANN_PASSES,
+}
+
+
+class FixedPattern:
+    """Repeating byte pattern source (single bytes or multi-byte sequences)"""
+
+    def __init__(self, pattern, name=None):
+        """
+        Args:
+            pattern (bytes): Byte sequence repeated across the target
+            name (str): Human readable pattern name
+        """
+        self.pattern = bytes(pattern)
+        self.period = len(self.pattern)
+        self.name = name or f"0x{self.pattern.hex().upper()}"
+
+    def fill(self, view, offset):
+        """Fill a buffer with the pattern as it appears at a target offset"""
+        length = len(view)
+        if length == 0:
+            return
+
+        # Seed one rotated period, then double it in place - no temporary buffers
+        phase = offset % self.period
+        seed = (self.pattern * 2)[phase:phase + self.period]
+        filled = min(self.period, length)
+        view[:filled] = seed[:filled]
+        while filled < length:
+            count = min(filled, length - filled)
+            view[filled:filled + count] = view[:count]
+            filled += count
+
+
+def repeat_period(data, max_period):
+    """Shortest period (up to max_period) of a buffer that repeats throughout, or None"""
+    with memoryview(data) as view:
+        for period in range(1, min(max_period, len(data) - 1) + 1):
+            # data[:-p] == data[p:] means data repeats every p bytes; startswith is a memcmp
+            if data.startswith(view[period:]):
+                return period
+    return None
+
+
+def pass_key(seed, pass_index):
+    """
+    Keystream key of one random pass, derived from the wipe seed
+
+    Args:
+        seed (bytes): Per-wipe secret seed
+        pass_index (int): Zero-based pass number
+
+    Returns:
+        bytes: KEY_SIZE-byte key
+    """
+    return hmac.new(seed, b'trustwipe-pass' + pass_index.to_bytes(4, 'big'), hashlib.sha256).digest()
+
+
+def seed_commitment(seed):
+    """Hex commitment to a wipe seed - safe to publish, since the seed has 256 bits of entropy"""
+    return hashlib.sha256(b'trustwipe-seed-commitment' + seed).hexdigest()
+
+
+def write_seed_file(path, seed):
+    """Save a wipe seed to a file only its owner can read"""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, 'w') as f:
+        f.write(seed.hex() + '\n')
+
+
+def read_seed_file(path):
+    """Load a wipe seed saved by write_seed_file"""
+    with open(path, 'r') as f:
+        seed = bytes.fromhex(f.read().strip())
+    if len(seed) != KEY_SIZE:
+        raise ValueError(f"Seed file must hold {KEY_SIZE} bytes")
+    return seed
+
+
+def build_pass_patterns(method, seed=None):
+    """
+    Build the pattern source for every pass of a multi-pass method
+
+    Args:
+        method (str): 'dod' or 'gutmann'
+        seed (bytes): Wipe seed random pass keys are derived from (default: fresh keys)
+
+    Returns:
+        list: Pattern objects, one per pass
+    """
+    if method not in PASS_TABLES:
+        raise ValueError(f"No pass table for method: {method}")
+
+    names = {b'\x00': 'zeros', b'\xFF': 'ones'}
+    patterns = []
+    for index, pattern in enumerate(PASS_TABLES[method]):
+        if pattern is not None:
+            patterns.append(FixedPattern(pattern, names.get(pattern)))
+        else:
+            patterns.append(KeystreamPattern(key=pass_key(seed, index) if seed else None))
+    return patterns
+
+
+def _aes_block(key, index):
+    """Keystream block `index`: AES-256-CTR starting at counter index << 64"""
+    nonce = index.to_bytes(8, 'big') + bytes(8)
+    encryptor = Cipher(algorithms.AES(key), modes.CTR(nonce)).encryptor()
+    return encryptor.update(bytes(KEYSTREAM_BLOCK_SIZE))
+
+
+def _shake_block(key, index):
+    """Keystream block `index`: SHAKE-256(key || index)"""
+    return hashlib.shake_256(key + index.to_bytes(8, 'little')).digest(KEYSTREAM_BLOCK_SIZE)
+
+
+class KeystreamPattern:
+    """
+    Random pattern source for the native wipe engine
+
+    Implements the same fill(view, offset) interface as FixedPattern.
+    Keystream block i always covers target bytes [i * 1 MiB, (i + 1) * 1 MiB),
+    so the content written at any offset depends only on the key and the offset.
+    """
+
+    period = None
+
+    def __init__(self, key=None, workers=None, algorithm=None):
+        """
+        Args:
+            key (bytes): 32-byte key (default: read once from the kernel)
+            workers (int): Parallel generators (default: CPU count)
+            algorithm (str): aes-256-ctr or shake-256 (default: best available)
+        """
+        if algorithm is None:
+            algorithm = DEFAULT_ALGORITHM
+        if algorithm not in ALGORITHMS:
+            raise ValueError(f"Unknown keystream algorithm: {algorithm}")
+        if algorithm == AES_CTR and not HAS_AES:
+            raise ValueError("aes-256-ctr requires the cryptography package")
+
+        self.key = key if key is not None else os.urandom(KEY_SIZE)
+        if len(self.key) != KEY_SIZE:
+            raise ValueError(f"Keystream key must be {KEY_SIZE} bytes")
+
+        self.algorithm = algorithm
+        self.name = f"random ({algorithm})"
+        self.workers = workers or os.cpu_count() or 1
+        self._generate = _aes_block if algorithm == AES_CTR else _shake_block
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _pool(self):
+        """Worker pool, created on first parallel fill (fills may come from several threads)"""
+        with self._lock:
+            if self._executor is None:
+                # OpenSSL releases the GIL; hashlib's SHAKE squeeze does not
+                if self.algorithm == AES_CTR:
+                    self._executor = ThreadPoolExecutor(max_workers=self.workers)
+                else:
+                    # Never fork: the wipe's writer and pipeline threads may hold locks the child would inherit
+                    self._executor = ProcessPoolExecutor(max_workers=self.workers,
+                                                         mp_context=multiprocessing.get_context('spawn'))
+            return self._executor
+
+    def keystream_block(self, index):
+        """Return keystream block `index` (KEYSTREAM_BLOCK_SIZE bytes)"""
+        return self._generate(self.key, index)
+
+    def fill(self, view, offset):
+        """Fill a buffer with the keystream as it appears at a target offset"""
+        length = len(view)
+        if length == 0:
+            return
+
+        first = offset // KEYSTREAM_BLOCK_SIZE
+        last = (offset + length - 1) // KEYSTREAM_BLOCK_SIZE
+        indices = range(first, last + 1)
+
+        if self.workers > 1 and len(indices) > 1:
+            blocks = self._pool().map(self._generate, repeat(self.key), indices)
+        else:
+            blocks = (self._generate(self.key, index) for index in indices)
+
+        position = 0
+        for index, block in zip(indices, blocks):
+            block_start = index * KEYSTREAM_BLOCK_SIZE
+            lo = max(offset, block_start) - block_start
+            hi = min(offset + length, block_start + KEYSTREAM_BLOCK_SIZE) - block_start
+            view[position:position + hi - lo] = memoryview(block)[lo:hi]
+            position += hi - lo
+
+    def generate(self, size, offset=0):
+        """Return `size` keystream bytes starting at a target offset"""
+        data = bytearray(size)
+        self.fill(memoryview(data), offset)
+        return data
+
+    def close(self):
+        """Shut down the worker pool"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown()
+
+
+def benchmark_keystream(total_bytes=256 * 1024 * 1024, buffer_size=64 * 1024 * 1024, workers=None):
+    """
+    Measure random pattern throughput against /dev/urandom
+
+    Args:
+        total_bytes (int): Bytes to generate per source
+        buffer_size (int): Size of the reusable fill buffer
+        workers (int): Parallel generators (default: CPU count)
+
+    Returns:
+        dict: source -> MB/s
+    """
+    results = {}
+    buffer = bytearray(buffer_size)
+    view = memoryview(buffer)
+
+    def measure(fill):
+        start = time.time()
+        offset = 0
+        while offset < total_bytes:
+            fill(view, offset)
+            offset += buffer_size
+        elapsed = time.time() - start
+        return round((offset / (1024 * 1024)) / elapsed, 1) if elapsed > 0 else None
+
+    with open('/dev/urandom', 'rb', buffering=0) as urandom:
+        def urandom_fill(target, offset):
+            filled = 0
+            while filled < len(target):
+                filled += urandom.readinto(target[filled:])
+        results['/dev/urandom'] = measure(urandom_fill)
+
+    for algorithm in ALGORITHMS:
+        if algorithm == AES_CTR and not HAS_AES:
+            continue
+        pattern = KeystreamPattern(workers=workers, algorithm=algorithm)
+        try:
+            results[algorithm] = measure(pattern.fill)
+        finally:
+            pattern.close()
+
+    return results
+
+
+if __name__ == "__main__":
+    size_mb = int(sys.argv[1]) if len(sys.argv) > 1 else 256
+
+    print("🎲 Random pattern throughput")
+    print("=" * 40)
+    for source, speed in benchmark_keystream(size_mb * 1024 * 1024).items():
+        print(f"{source:<14} {speed:8.1f} MB/s")
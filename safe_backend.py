@@ -13,11 +13,15 @@ import glob
 from datetime import datetime
 import logging
 from safety_manager import SafetyManager, PersonalDataWiper
+from backend import NativeWipeEngine
+from pattern_generator import KeystreamPattern
+from file_shredder import FileOverwriter, ParallelShredder, FILE_CHUNK_SIZE, SHRED_WORKERS
 
 class SafeDataWiper:
     """SAFE data wiper that prevents OS destruction"""
     
-    def __init__(self, wipe_type="personal_data", method="zeros", passes=3, callback=None):
+    def __init__(self, wipe_type="personal_data", method="zeros", passes=3, callback=None,
+                 chunk_size=FILE_CHUNK_SIZE, io_mode="buffered", workers=SHRED_WORKERS, order="auto"):
         """
         Initialize the SAFE data wiper
         
@@ -26,6 +30,11 @@ class SafeDataWiper:
             method (str): Wiping method (zeros, random, dod, gutmann)
             passes (int): Number of passes for supported methods
             callback (callable): Progress callback function
+            chunk_size (int): Bytes per write when overwriting files (constant memory per file)
+            io_mode (str): File overwrite I/O - "buffered" or "direct" (O_DIRECT where supported)
+            workers (int): Files shredded at once by the personal data wipe
+            order (str): Personal data shred order - "auto" (by physical offset on spinning disks),
+                "physical" or "none"
         """
         self.wipe_type = wipe_type
         self.method = method
@@ -33,6 +42,12 @@ class SafeDataWiper:
         self.callback = callback
         self.is_running = False
         self.current_process = None
+        self.chunk_size = chunk_size
+        self.io_mode = io_mode
+        self.file_overwriter = None
+        self.workers = workers
+        self.order = order
+        self.shredder = None
         
         # Initialize safety components
         self.safety_manager = SafetyManager()
@@ -73,32 +88,47 @@ class SafeDataWiper:
         try:
             # Get list of personal files
             self.update_progress("📁 Scanning for personal data...", 10)
-            personal_files = self.personal_wiper.get_personal_files()
+            personal_files = self.personal_wiper.scan_personal_files()
             
             total_files = len(personal_files)
-            self.update_progress(f"📁 Found {total_files} personal files to wipe", 20)
+            total_bytes = sum(scanned.stat.st_size for scanned in personal_files)
+            self.update_progress(f"📁 Found {total_files} personal files to wipe "
+                                 f"({self._human_readable_size(total_bytes)})", 20)
+            if self.personal_wiper.scan_errors:
+                self.logger.warning(f"{self.personal_wiper.scan_errors} directories could not be scanned")
+                self.update_progress(f"⚠️ {self.personal_wiper.scan_errors} directories could not be read; "
+                                     f"files in them will not be wiped", 20)
             
             if total_files == 0:
-                self.update_progress("✅ No personal data found - system is already clean!", 100)
+                if self.personal_wiper.scan_errors:
+                    self.update_progress("⚠️ No personal data found in the directories that could be read", 100)
+                else:
+                    self.update_progress("✅ No personal data found - system is already clean!", 100)
                 return True
             
-            # Wipe personal files
+            # Wipe personal files on the worker pool, with a durability barrier per batch
             wiped_files = []
             errors = []
             
-            for i, file_path in enumerate(personal_files):
-                if not self.is_running:
-                    break
-                
-                progress = 20 + (i / total_files) * 60
-                self.update_progress(f"🗑️ Wiping: {os.path.basename(file_path)}", progress)
-                
+            if self.is_running:
+                self.shredder = ParallelShredder(self.method, self.workers, self.chunk_size, self.io_mode,
+                                                 order=self.order, callback=self._shred_progress)
                 try:
-                    self._secure_wipe_file(file_path)
-                    wiped_files.append(file_path)
-                except Exception as e:
-                    errors.append(f"{file_path}: {e}")
-                    self.logger.warning(f"Failed to wipe {file_path}: {e}")
+                    stats = self.shredder.shred(personal_files)
+                finally:
+                    self.shredder = None
+                wiped_files = stats['shredded']
+                errors = stats['errors']
+                for error in errors[:20]:
+                    self.logger.warning(f"Failed to wipe {error}")
+                self.update_progress(
+                    f"🗑️ Shredded {stats['files']:,} files in {stats['seconds']}s: "
+                    f"{stats['files_per_sec']} files/s, {stats['mb_per_sec']} MB/s "
+                    f"({stats['barriers']} {'syncfs' if stats['syncfs'] else 'fsync'} barriers; "
+                    f"{stats['ordered_files']:,} in physical order; "
+                    f"{self._human_readable_size(stats['allocated_bytes'])} allocated of "
+                    f"{self._human_readable_size(stats['apparent_bytes'])} apparent)", 80
+                )
             
             # Clear caches and temporary files
             self.update_progress("🧹 Clearing caches and temporary files...", 85)
@@ -126,6 +156,10 @@ class SafeDataWiper:
             self.update_progress(f"❌ Personal data wipe failed: {str(e)}")
             return False
     
+    def _shred_progress(self, message, progress=None):
+        """Map shredder progress onto the 20-80% file-wiping stage"""
+        self.update_progress(f"🗑️ {message}", 20 + progress * 0.6 if progress is not None else None)
+    
     def factory_reset_safe(self):
         """SAFE: Factory reset preserving OS"""
         self.logger.info("🏭 SAFE MODE: Factory reset (preserving OS)")
@@ -184,39 +218,14 @@ class SafeDataWiper:
         return self._wipe_device_safely(device_path)
     
     def _secure_wipe_file(self, file_path):
-        """Securely wipe a single file"""
+        """Securely wipe a single file, streaming every pass through one reusable buffer"""
         if not os.path.exists(file_path):
             return
         
         try:
-            file_size = os.path.getsize(file_path)
-            
-            if self.method == "zeros":
-                # Overwrite with zeros
-                with open(file_path, 'r+b') as f:
-                    f.write(b'\x00' * file_size)
-                    f.flush()
-                    os.fsync(f.fileno())
-            
-            elif self.method == "random":
-                # Overwrite with random data
-                with open(file_path, 'r+b') as f:
-                    f.write(os.urandom(file_size))
-                    f.flush()
-                    os.fsync(f.fileno())
-            
-            elif self.method == "dod":
-                # DoD 5220.22-M: 3 passes
-                patterns = [b'\x00', b'\xFF', os.urandom(file_size)]
-                with open(file_path, 'r+b') as f:
-                    for pattern in patterns:
-                        f.seek(0)
-                        if isinstance(pattern, bytes) and len(pattern) == 1:
-                            f.write(pattern * file_size)
-                        else:
-                            f.write(pattern)
-                        f.flush()
-                        os.fsync(f.fileno())
+            if self.file_overwriter is None:
+                self.file_overwriter = FileOverwriter(self.method, self.chunk_size, self.io_mode)
+            self.file_overwriter.overwrite(file_path)
             
             # Remove the file
             os.remove(file_path)
@@ -401,17 +410,14 @@ class SafeDataWiper:
         subprocess.run(cmd, check=True)
     
     def _wipe_device_with_random(self, device_path):
-        """Wipe device with random data"""
-        cmd = [
-            'dd',
-            'if=/dev/urandom',
-            f'of={device_path}',
-            'bs=64M',
-            'status=progress',
-            'oflag=direct'
-        ]
-        
-        subprocess.run(cmd, check=True)
+        """Wipe device with random data (keystream expanded in-process)"""
+        engine = NativeWipeEngine(device_path, callback=self.update_progress)
+        pattern = KeystreamPattern()
+        try:
+            with engine:
+                engine.write_pass(pattern, "random pass")
+        finally:
+            pattern.close()
     
     def _wipe_device_with_dod(self, device_path):
         """Wipe device with DoD 5220.22-M standard"""
@@ -434,6 +440,8 @@ class SafeDataWiper:
     def stop(self):
         """Stop the wiping process"""
         self.is_running = False
+        if self.shredder:
+            self.shredder.stop()
         if self.current_process:
             self.current_process.terminate()
 
@@ -8,6 +8,7 @@ import argparse
 import sys
 import os
 from safe_backend import SafeDataWiper
+from file_shredder import FILE_CHUNK_SIZE, FILE_IO_MODES, SHRED_WORKERS, SHRED_ORDERS
 from safety_manager import SafetyManager
 from certificate_generator import CertificateGenerator
 
@@ -69,6 +70,35 @@ EXAMPLES:
             help='Number of passes (default: 3)'
         )
         
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=FILE_CHUNK_SIZE // 1024,
+            metavar='KB',
+            help='Bytes per write when overwriting files, in KiB (multiple of 4, default: 3072)'
+        )
+        
+        parser.add_argument(
+            '--io-mode',
+            choices=FILE_IO_MODES,
+            default='buffered',
+            help='File overwrite I/O: page cache or O_DIRECT where supported (default: buffered)'
+        )
+        
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=SHRED_WORKERS,
+            help=f'Files shredded at once by personal-data wipes (default: {SHRED_WORKERS})'
+        )
+        
+        parser.add_argument(
+            '--order',
+            choices=SHRED_ORDERS,
+            default='auto',
+            help='Personal-data shred order: by physical offset on spinning disks (auto), always, or never'
+        )
+        
         parser.add_argument(
             '--force', '-f',
             action='store_true',
@@ -206,7 +236,11 @@ EXAMPLES:
             wipe_type=args.type.replace('-', '_'),  # Convert to snake_case
             method=args.method,
             passes=args.passes,
-            callback=self.progress_callback
+            callback=self.progress_callback,
+            chunk_size=args.chunk_size * 1024,
+            io_mode=args.io_mode,
+            workers=args.workers,
+            order=args.order
         )
         
         wiper.is_running = True
@@ -9,6 +9,8 @@ import subprocess
 import psutil
 import re
 from pathlib import Path
+from file_scanner import FileScanner
+from file_shredder import FileOverwriter, FILE_CHUNK_SIZE
 
 class SafetyManager:
     """Manages safety checks to prevent OS destruction"""
@@ -108,6 +110,7 @@ class PersonalDataWiper:
     """Safely wipes only personal data, preserving OS"""
     
     def __init__(self):
+        self.scan_errors = 0   # Directories the last scan could not read
         self.personal_data_locations = [
             '/home/*/Documents',
             '/home/*/Downloads', 
@@ -136,44 +139,55 @@ class PersonalDataWiper:
             '/home/*/.cache/chromium'
         ]
     
+    def scan_personal_files(self):
+        """
+        Find all personal data files in one parallel walk (see file_scanner.py)
+        
+        Returns:
+            list: ScannedFile entries (path and lstat result) matching personal_data_locations
+        """
+        scanner = FileScanner(self.personal_data_locations)
+        files = scanner.scan()
+        self.scan_errors = scanner.errors
+        return files
+    
     def get_personal_files(self):
         """Get list of all personal data files"""
-        files_to_wipe = []
+        return [scanned.path for scanned in self.scan_personal_files()]
+    
+    def wipe_personal_data(self, method='zeros', passes=3, chunk_size=FILE_CHUNK_SIZE, io_mode='buffered'):
+        """
+        Wipe only personal data files
         
-        for pattern in self.personal_data_locations:
-            try:
-                matches = subprocess.run(['find', '/', '-path', pattern, '-type', 'f'], 
-                                      capture_output=True, text=True)
-                if matches.returncode == 0:
-                    files_to_wipe.extend(matches.stdout.strip().split('\n'))
-            except Exception:
-                continue
+        Files are overwritten through the same constant-memory path as
+        SafeDataWiper (see file_shredder.py), then removed.
         
-        return [f for f in files_to_wipe if f and os.path.exists(f)]
-    
-    def wipe_personal_data(self, method='zeros', passes=3):
-        """Wipe only personal data files"""
-        files = self.get_personal_files()
+        Args:
+            method (str): Wiping method (zeros, random, dod, gutmann)
+            passes (int): Unused; the method defines its passes
+            chunk_size (int): Bytes per write
+            io_mode (str): "buffered" or "direct"
+            
+        Returns:
+            tuple: (wiped file paths, error messages)
+        """
+        files = self.scan_personal_files()
         
         wiped_files = []
         errors = []
         
-        for file_path in files:
-            try:
-                if method == 'zeros':
-                    # Overwrite file with zeros
-                    with open(file_path, 'r+b') as f:
-                        size = os.path.getsize(file_path)
-                        f.write(b'\x00' * size)
-                        f.flush()
-                        os.fsync(f.fileno())
-                
-                # Remove the file
-                os.remove(file_path)
-                wiped_files.append(file_path)
-                
-            except Exception as e:
-                errors.append(f"{file_path}: {e}")
+        with FileOverwriter(method, chunk_size, io_mode) as overwriter:
+            for scanned in files:
+                file_path = scanned.path
+                try:
+                    overwriter.overwrite(file_path)
+                    
+                    # Remove the file
+                    os.remove(file_path)
+                    wiped_files.append(file_path)
+                    
+                except Exception as e:
+                    errors.append(f"{file_path}: {e}")
         
         return wiped_files, errors
     
@@ -0,0 +1,395 @@
+#!/usr/bin/env python3
+"""
+TrustWipe Signature Scanner
+Carving-style residual check: finds file headers and footers anywhere on a
+device, replacing the strings | grep JPEG|PNG|PDF recovery tests
+
+The built-in table of file magic is compiled once into a single
+multi-pattern matcher: an Aho-Corasick automaton when pyahocorasick is
+installed, otherwise a trie-shaped regular expression, which the re engine
+walks in C with the same one-pass, shared-prefix behaviour. Either way every
+byte is examined once, however many signatures the table holds.
+
+Devices are scanned in fixed chunks spread over a process pool. Each chunk
+is read with enough overlap to catch a signature straddling its end, and a
+hit belongs to the chunk its first byte falls in, so nothing is reported
+twice. Wiped chunks (fills and fixed patterns) are recognised by a period
+check in a single memcmp and only one period of them is scanned.
+"""
+
+import os
+import re
+import sys
+import json
+import math
+import mmap
+import errno
+import time
+import argparse
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from pattern_generator import repeat_period
+
+try:
+    import ahocorasick
+    HAS_AHOCORASICK = True
+except ImportError:
+    HAS_AHOCORASICK = False
+
+SCAN_CHUNK_SIZE = 16 * 1024 * 1024   # Bytes per worker task
+MAX_FILL_PERIOD = 16                 # Longest repeating fill scanned by one period only
+MIN_SIGNATURE_LENGTH = 4             # Shorter magic matches random wipe data far too often
+MAX_REPORTED_HITS = 1000
+RANDOM_SAMPLE_SIZE = 64 * 1024       # Head of each chunk checked for random-looking data
+RANDOM_ENTROPY = 7.9                 # Bits per byte above which a sample counts as random
+
+HEADER = 'header'
+FOOTER = 'footer'
+
+# (name, kind, magic, position of the magic from the start of the file).
+# Magic that starts with zero bytes is keyed on its first distinctive bytes
+# instead, so zero-filled space cannot match it.
+SIGNATURES = [
+    # Images
+    ('JPEG (JFIF)', HEADER, b'\xff\xd8\xff\xe0', 0),
+    ('JPEG (Exif)', HEADER, b'\xff\xd8\xff\xe1', 0),
+    ('JPEG (raw)', HEADER, b'\xff\xd8\xff\xdb', 0),
+    ('JPEG (Adobe)', HEADER, b'\xff\xd8\xff\xee', 0),
+    ('PNG', HEADER, b'\x89PNG\r\n\x1a\n', 0),
+    ('GIF87a', HEADER, b'GIF87a', 0),
+    ('GIF89a', HEADER, b'GIF89a', 0),
+    ('TIFF (little-endian)', HEADER, b'II*\x00', 0),
+    ('TIFF (big-endian)', HEADER, b'MM\x00*', 0),
+    ('WebP', HEADER, b'WEBPVP8', 8),
+    ('Photoshop', HEADER, b'8BPS\x00\x01', 0),
+    ('HEIF/HEIC', HEADER, b'ftypheic', 4),
+    # Documents
+    ('PDF', HEADER, b'%PDF-', 0),
+    ('PostScript', HEADER, b'%!PS-Adobe', 0),
+    ('RTF', HEADER, b'{\\rtf1', 0),
+    ('OLE2 (DOC/XLS/PPT/MSG)', HEADER, b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1', 0),
+    ('XML', HEADER, b'<?xml version=', 0),
+    ('HTML', HEADER, b'<!DOCTYPE html', 0),
+    ('Outlook PST', HEADER, b'!BDN', 0),
+    # Archives and containers (DOCX, XLSX, ODT, JAR and APK are ZIP files)
+    ('ZIP/Office Open XML', HEADER, b'PK\x03\x04', 0),
+    ('7-Zip', HEADER, b'7z\xbc\xaf\x27\x1c', 0),
+    ('RAR 4', HEADER, b'Rar!\x1a\x07\x00', 0),
+    ('RAR 5', HEADER, b'Rar!\x1a\x07\x01\x00', 0),
+    ('gzip', HEADER, b'\x1f\x8b\x08\x00', 0),
+    ('gzip (named)', HEADER, b'\x1f\x8b\x08\x08', 0),
+    ('bzip2', HEADER, b'1AY&SY', 4),
+    ('xz', HEADER, b'\xfd7zXZ\x00', 0),
+    ('Zstandard', HEADER, b'\x28\xb5\x2f\xfd', 0),
+    ('tar (POSIX)', HEADER, b'ustar\x0000', 257),
+    ('tar (GNU)', HEADER, b'ustar  \x00', 257),
+    ('Debian package', HEADER, b'!<arch>\ndebian', 0),
+    ('RPM package', HEADER, b'\xed\xab\xee\xdb', 0),
+    # Audio and video
+    ('MP3 (ID3v2.3)', HEADER, b'ID3\x03', 0),
+    ('MP3 (ID3v2.4)', HEADER, b'ID3\x04', 0),
+    ('FLAC', HEADER, b'fLaC\x00\x00\x00\x22', 0),
+    ('Ogg', HEADER, b'OggS\x00\x02', 0),
+    ('WAV', HEADER, b'WAVEfmt ', 8),
+    ('AVI', HEADER, b'AVI LIST', 8),
+    ('MP4', HEADER, b'ftypisom', 4),
+    ('MP4 (v2)', HEADER, b'ftypmp42', 4),
+    ('M4A', HEADER, b'ftypM4A ', 4),
+    ('QuickTime', HEADER, b'ftypqt  ', 4),
+    ('3GP', HEADER, b'ftyp3gp', 4),
+    ('Matroska/WebM', HEADER, b'\x1a\x45\xdf\xa3', 0),
+    ('ASF/WMV/WMA', HEADER, b'0&\xb2\x75\x8e\x66\xcf\x11', 0),
+    ('FLV', HEADER, b'FLV\x01', 0),
+    ('MIDI', HEADER, b'MThd\x00\x00\x00\x06', 0),
+    # Databases, keys and credentials
+    ('SQLite', HEADER, b'SQLite format 3\x00', 0),
+    ('KeePass 2', HEADER, b'\x03\xd9\xa2\x9a\x67\xfb\x4b\xb5', 0),
+    ('PEM block (keys, certificates)', HEADER, b'-----BEGIN ', 0),
+    ('OpenSSH private key', HEADER, b'openssh-key-v1\x00', 0),
+    # Executables and disk images
+    ('ELF executable', HEADER, b'\x7fELF', 0),
+    ('Windows executable', HEADER, b'This program cannot be run in DOS mode', 78),
+    ('Mach-O (64-bit)', HEADER, b'\xcf\xfa\xed\xfe', 0),
+    ('Java class/Mach-O universal', HEADER, b'\xca\xfe\xba\xbe', 0),
+    ('QCOW disk image', HEADER, b'QFI\xfb', 0),
+    ('VMDK disk image', HEADER, b'KDMV', 0),
+    ('VHDX disk image', HEADER, b'vhdxfile', 0),
+    # Footers mark where a carved file ends
+    ('PDF end', FOOTER, b'%%EOF', 0),
+    ('PNG end', FOOTER, b'IEND\xaeB`\x82', 0),
+    ('ZIP end of central directory', FOOTER, b'PK\x05\x06', 0),
+    ('HTML end', FOOTER, b'</html>', 0),
+]
+
+
+def _trie_pattern(magics):
+    """
+    Compile byte strings into one regular expression shaped like their trie
+
+    Shared prefixes are matched once and the longest signature wins, so the
+    re engine does the work of an automaton without backtracking between
+    signatures.
+    """
+    trie = {}
+    for magic in magics:
+        node = trie
+        for value in magic:
+            node = node.setdefault(value, {})
+        node[None] = {}
+
+    def emit(node):
+        branches = [re.escape(bytes([value])) + emit(node[value])
+                    for value in sorted(value for value in node if value is not None)]
+        if not branches:
+            return b''
+        body = branches[0] if len(branches) == 1 else b'(?:' + b'|'.join(branches) + b')'
+        return b'(?:' + body + b')?' if None in node else body
+
+    return re.compile(emit(trie), re.DOTALL)
+
+
+class SignatureScanner:
+    """Multi-pattern matcher for a signature table, compiled once"""
+
+    def __init__(self, signatures=None):
+        """
+        Args:
+            signatures (list): (name, kind, magic, position) tuples (default: SIGNATURES)
+        """
+        self.signatures = list(signatures or SIGNATURES)
+        self._by_magic = {}
+        for signature in self.signatures:
+            magic = signature[2]
+            if len(magic) < MIN_SIGNATURE_LENGTH:
+                raise ValueError(f"Signature {signature[0]!r} is shorter than {MIN_SIGNATURE_LENGTH} bytes")
+            self._by_magic.setdefault(magic, []).append(signature)
+
+        self.max_length = max(len(magic) for magic in self._by_magic)
+        if HAS_AHOCORASICK:
+            self.engine = 'aho-corasick'
+            self._automaton = ahocorasick.Automaton()
+            for magic in self._by_magic:
+                self._automaton.add_word(magic.decode('latin-1'), magic)
+            self._automaton.make_automaton()
+        else:
+            self.engine = 're-trie'
+            self._regex = _trie_pattern(self._by_magic)
+
+    def _matches(self, data):
+        """(position, magic) of every signature in a buffer"""
+        if HAS_AHOCORASICK:
+            for end, magic in self._automaton.iter(data.decode('latin-1')):
+                yield end - len(magic) + 1, magic
+        else:
+            for match in self._regex.finditer(data):
+                yield match.start(), match.group()
+
+    def scan(self, data, offset=0, limit=None):
+        """
+        Find signatures in a buffer
+
+        Args:
+            data (bytes): Buffer contents
+            offset (int): Device offset of the buffer
+            limit (int): Only report matches starting before this buffer index (chunk overlap)
+
+        Returns:
+            list: Hits as dicts with name, kind, offset of the magic and offset of the file start
+        """
+        period = repeat_period(data, MAX_FILL_PERIOD) if len(data) > self.max_length else None
+        if period is not None:
+            # A repeating fill holds a signature only if its first period plus one
+            # signature length does
+            window = data[:period + self.max_length - 1]
+            if next(self._matches(window), None) is None:
+                return []
+
+        limit = len(data) if limit is None else limit
+        hits = []
+        for position, magic in self._matches(data):
+            if position >= limit:
+                continue
+            for name, kind, _, file_position in self._by_magic[magic]:
+                hits.append({
+                    'name': name,
+                    'kind': kind,
+                    'offset': offset + position,
+                    'file_offset': offset + position - file_position if kind == HEADER else None,
+                })
+        return hits
+
+    def chance_hits(self, length):
+        """Expected number of signature matches in `length` bytes of uniform random data"""
+        return sum(len(signatures) * length / 256 ** len(magic) for magic, signatures in self._by_magic.items())
+
+
+def looks_random(data):
+    """True if the head of a buffer has the byte entropy of random wipe data"""
+    sample = data[:RANDOM_SAMPLE_SIZE]
+    if not sample:
+        return False
+    length = len(sample)
+    entropy = -sum(count / length * math.log2(count / length) for count in Counter(sample).values())
+    return entropy >= RANDOM_ENTROPY
+
+
+_worker_scanner = None
+_worker_buffer = None
+
+
+def _init_worker(signatures, chunk_size, overlap):
+    """Compile the table and allocate the read buffer once per worker process"""
+    global _worker_scanner, _worker_buffer
+    _worker_scanner = SignatureScanner(signatures)
+    # mmap buffers are page aligned, as O_DIRECT requires
+    _worker_buffer = mmap.mmap(-1, -(-(chunk_size + overlap) // 4096) * 4096 + 4096)
+
+
+def _read_chunk(device_path, offset, length):
+    """Read a chunk with O_DIRECT where supported, so the page cache cannot answer for the device"""
+    flags = os.O_RDONLY | getattr(os, 'O_CLOEXEC', 0)
+    try:
+        fd = os.open(device_path, flags | getattr(os, 'O_DIRECT', 0))
+    except OSError as e:
+        if e.errno != errno.EINVAL:
+            raise
+        fd = os.open(device_path, flags)
+
+    try:
+        with memoryview(_worker_buffer) as view:
+            # O_DIRECT reads start on a sector boundary
+            skip = offset % 4096
+            target = skip + length
+            total = 0
+            while total < target:
+                count = os.preadv(fd, [view[total:-(-target // 4096) * 4096]], offset - skip + total)
+                if count == 0:
+                    break
+                total += count
+            return bytes(view[skip:max(skip, min(total, target))])
+    finally:
+        os.close(fd)
+
+
+def _scan_chunk(device_path, offset, length, overlap, end):
+    """Worker entry point: scan one chunk, reading past its end by the overlap"""
+    data = _read_chunk(device_path, offset, min(length + overlap, end - offset))
+    return min(length, len(data)), looks_random(data), _worker_scanner.scan(data, offset, limit=length)
+
+
+def scan_device(device_path, start=0, end=None, chunk_size=SCAN_CHUNK_SIZE, workers=None,
+                signatures=None, callback=None):
+    """
+    Scan a device, or a range of it, for file signatures
+
+    Args:
+        device_path (str): Device or image file
+        start (int): First byte to scan
+        end (int): End of the range (default: end of the device)
+        chunk_size (int): Bytes per worker task
+        workers (int): Scanning processes (default: CPU count)
+        signatures (list): Signature table (default: SIGNATURES)
+        callback (callable): Progress callback (message, progress)
+
+    Returns:
+        dict: Hits, per-signature counts, the chance level for random data and a verdict
+    """
+    scanner = SignatureScanner(signatures)
+    with open(device_path, 'rb') as f:
+        size = f.seek(0, os.SEEK_END)
+    end = size if end is None else min(end, size)
+    start = min(start, end)
+
+    overlap = scanner.max_length - 1
+    chunks = [(offset, min(chunk_size, end - offset)) for offset in range(start, end, chunk_size)]
+    workers = max(1, min(workers or os.cpu_count() or 1, len(chunks) or 1))
+
+    start_time = time.time()
+    hits = []
+    bytes_scanned = 0
+    random_bytes = 0
+
+    def collect(done, result):
+        nonlocal bytes_scanned, random_bytes
+        length, random, chunk_hits = result
+        bytes_scanned += length
+        random_bytes += length if random else 0
+        hits.extend(chunk_hits)
+        if callback:
+            callback(f"Scanned {bytes_scanned // (1024 * 1024)} MB, {len(hits)} signatures",
+                     round(done / len(chunks) * 100, 1))
+
+    initargs = (scanner.signatures, chunk_size, overlap)
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=initargs) as executor:
+            futures = [executor.submit(_scan_chunk, device_path, offset, length, overlap, end)
+                       for offset, length in chunks]
+            for done, future in enumerate(as_completed(futures), 1):
+                collect(done, future.result())
+    else:
+        _init_worker(*initargs)
+        for done, (offset, length) in enumerate(chunks, 1):
+            collect(done, _scan_chunk(device_path, offset, length, overlap, end))
+
+    elapsed = time.time() - start_time
+    hits.sort(key=lambda hit: hit['offset'])
+
+    # Short magic turns up in random wipe data by chance; allow for that at
+    # four standard deviations before calling the device dirty. Only chunks
+    # that look random count: in fills and structured data a match is real.
+    chance = scanner.chance_hits(random_bytes)
+    chance_limit = math.floor(chance + 4 * math.sqrt(chance))
+
+    return {
+        'device_path': device_path,
+        'device_size': size,
+        'start': start,
+        'end': end,
+        'engine': scanner.engine,
+        'signatures': len(scanner.signatures),
+        'hit_count': len(hits),
+        'hits': hits[:MAX_REPORTED_HITS],
+        'counts': dict(Counter(hit['name'] for hit in hits).most_common()),
+        'chance_hits': round(chance, 3),
+        'verdict': 'PASS' if len(hits) <= chance_limit else 'FAIL',
+        'workers': workers,
+        'bytes_scanned': bytes_scanned,
+        'seconds': round(elapsed, 3),
+        'mb_per_sec': round((bytes_scanned / (1024 * 1024)) / elapsed, 1) if elapsed > 0 else None,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Scan a device for recoverable file signatures")
+    parser.add_argument('device', help='Device or image file')
+    parser.add_argument('--mb', type=int, help='Only scan the first N megabytes (default: whole device)')
+    parser.add_argument('--workers', type=int, help='Scanning processes (default: CPU count)')
+    parser.add_argument('--json', action='store_true', help='Print the full report as JSON')
+    args = parser.parse_args()
+
+    def progress_display(message, progress):
+        if not args.json:
+            print(f"\r🔎 {message} [{progress:.1f}%]", end="", flush=True)
+
+    report = scan_device(args.device, end=args.mb * 1024 * 1024 if args.mb else None,
+                         workers=args.workers, callback=progress_display)
+    if args.json:
+        print(json.dumps(report, indent=2))
+        sys.exit(0 if report['verdict'] == 'PASS' else 2)
+
+    print()
+    print(f"📊 {report['bytes_scanned']:,} bytes @ {report['mb_per_sec']} MB/s, {report['signatures']} signatures "
+          f"({report['engine']}, {report['workers']} workers)")
+    for hit in report['hits'][:20]:
+        print(f"   {hit['name']} {hit['kind']} at {hit['offset']:,}")
+    if report['hit_count'] > 20:
+        print(f"   ... {report['hit_count'] - 20} more")
+    for name, count in report['counts'].items():
+        print(f"   {name}: {count}")
+    print(f"   Expected by chance in random data: {report['chance_hits']}")
+    if report['verdict'] == 'PASS':
+        print("✅ No recoverable file signatures found")
+    else:
+        print(f"❌ {report['hit_count']} recoverable file signatures found")
+    sys.exit(0 if report['verdict'] == 'PASS' else 2)
@@ -64,11 +64,11 @@ echo "Creating test data file..."
     echo "======================================"
     
     # Add file signatures that recovery tools look for
-    printf "JPEG"  # JPEG signature
+    printf '\xff\xd8\xff\xe0\x00\x10JFIF'  # JPEG signature
     dd if=/dev/zero bs=1024 count=10 2>/dev/null
-    printf "PNG"   # PNG-like signature  
+    printf '\x89PNG\r\n\x1a\n'           # PNG signature
     dd if=/dev/zero bs=1024 count=10 2>/dev/null
-    printf "PDF"   # PDF-like signature
+    printf '%%PDF-1.4'                     # PDF signature
     dd if=/dev/zero bs=1024 count=10 2>/dev/null
     
     # Fill rest with random data
@@ -96,11 +96,13 @@ echo "=================================="
 
 echo "🔎 Checking for test data signatures..."
 
-TEST_CHECK=$(sudo dd if="$DEVICE" bs=1M count=10 2>/dev/null | strings | grep -E "(TRUSTWIPE TEST|John Doe|fake_password|JPEG|PNG|PDF)")
+TEST_CHECK=$(sudo dd if="$DEVICE" bs=1M count=10 2>/dev/null | strings | grep -E "(TRUSTWIPE TEST|John Doe|fake_password)")
+SIGNATURE_CHECK=$(sudo python3 signature_scanner.py "$DEVICE" --mb 10 | grep -E " (header|footer) at ")
 
-if [ -n "$TEST_CHECK" ]; then
+if [ -n "$TEST_CHECK" ] || [ -n "$SIGNATURE_CHECK" ]; then
     echo "✅ Test data confirmed on device:"
     echo "$TEST_CHECK" | head -5
+    echo "$SIGNATURE_CHECK"
 else
     echo "❌ Warning: Test data not detected"
 fi
@@ -148,7 +150,8 @@ else
     
     # Basic verification
     echo "🔎 Checking for test data remnants..."
-    REMNANT_CHECK=$(sudo dd if="$DEVICE" bs=1M count=10 2>/dev/null | strings | grep -E "(TRUSTWIPE TEST|John Doe|fake_password|JPEG|PNG|PDF)")
+    REMNANT_CHECK=$(sudo dd if="$DEVICE" bs=1M count=10 2>/dev/null | strings | grep -E "(TRUSTWIPE TEST|John Doe|fake_password)")
+    REMNANT_CHECK+=$(sudo python3 signature_scanner.py "$DEVICE" | grep -E " (header|footer) at ")
     
     if [ -z "$REMNANT_CHECK" ]; then
         echo "✅ No test data remnants found - WIPE SUCCESSFUL!"
@@ -10,13 +10,28 @@ import os
 import json
 import subprocess
 import sys
+import errno
 from unittest.mock import patch, MagicMock
 
 # Add the parent directory to the path so we can import our modules
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from backend import DataWiper, SystemInfo
+from backend import DataWiper, SystemInfo, NativeWipeEngine, FixedPattern, StripeScheduler, probe_zero_offload
+from buffer_pool import BufferPool, MemoryBudget
 from certificate_generator import CertificateGenerator
+from write_pipeline import WritePipeline
+from wipe_journal import WipeJournal
+from forensic_analyzer import analyze_region, analyze_device, plan_regions
+from signature_scanner import SignatureScanner, SIGNATURES, scan_device
+from coverage_map import CoverageMap, coverage_summary, describe_coverage
+from file_scanner import FileScanner, scan_files
+from file_shredder import FileOverwriter, ParallelShredder, data_extents, first_physical_offset, is_rotational
+from safe_backend import SafeDataWiper
+from safety_manager import PersonalDataWiper
+from merkle_digest import MerkleDigest, leaf_hash, merkle_root, recheck_leaves
+from wipe_verifier import WipeVerifier, StreamingVerifier, sample_plan, detection_probability, samples_for_confidence
+from pattern_generator import (KeystreamPattern, KEYSTREAM_BLOCK_SIZE, SHAKE_256, GUTMANN_PASSES, pass_key,
+                               seed_commitment, build_pass_patterns)
 
 class TestSystemInfo(unittest.TestCase):
     """Test system information collection"""
@@ -148,11 +163,15 @@ class TestDataWiper(unittest.TestCase):
         self.temp_file = tempfile.NamedTemporaryFile(delete=False)
         self.temp_file.write(b'X' * 1024)  # 1KB of test data
         self.temp_file.close()
+        # Keep journals (which hold the pattern seed) out of the system journal directory
+        self.journal_dir = tempfile.mkdtemp()
     
     def tearDown(self):
         """Clean up test environment"""
+        import shutil
         if os.path.exists(self.temp_file.name):
             os.unlink(self.temp_file.name)
+        shutil.rmtree(self.journal_dir)
     
     def test_device_validation(self):
         """Test device validation"""
@@ -185,7 +204,7 @@ class TestDataWiper(unittest.TestCase):
         mock_process.returncode = 0
         mock_popen.return_value = mock_process
         
-        wiper = DataWiper(self.temp_file.name, 'zeros', 1)
+        wiper = DataWiper(self.temp_file.name, 'zeros', 1, journal_dir=self.journal_dir)
         
         # Mock validate_device to avoid permission issues
         with patch.object(wiper, 'validate_device'):
@@ -196,6 +215,1136 @@ class TestDataWiper(unittest.TestCase):
                 # Some tests may fail due to environment constraints
                 self.skipTest(f"Test skipped due to environment: {e}")
 
+class TestNativeWipeEngine(unittest.TestCase):
+    """Test the in-process pwrite engine on regular files"""
+    
+    def setUp(self):
+        """Create an unaligned test file"""
+        self.temp_file = tempfile.NamedTemporaryFile(delete=False)
+        self.temp_file.write(b'X' * 10000)
+        self.temp_file.close()
+        self.journal_dir = tempfile.mkdtemp()
+    
+    def tearDown(self):
+        """Clean up test file"""
+        import shutil
+        if os.path.exists(self.temp_file.name):
+            os.unlink(self.temp_file.name)
+        shutil.rmtree(self.journal_dir)
+    
+    def test_write_pass_counts_every_byte(self):
+        """Test a pass covers the whole file including the unaligned tail"""
+        with NativeWipeEngine(self.temp_file.name, block_size=4096) as engine:
+            written = engine.write_pass(FixedPattern(b'\x00'), "zero pass")
+        
+        self.assertEqual(written, 10000)
+        with open(self.temp_file.name, 'rb') as f:
+            self.assertEqual(f.read(), b'\x00' * 10000)
+        self.assertEqual(engine.pass_stats[0]['bytes_written'], 10000)
+    
+    def test_block_size_must_be_aligned(self):
+        """Test unaligned block sizes are rejected"""
+        with self.assertRaises(ValueError):
+            NativeWipeEngine(self.temp_file.name, block_size=1000)
+    
+    def test_queued_writes_cover_file(self):
+        """Test several in-flight writes still cover every byte exactly once"""
+        with NativeWipeEngine(self.temp_file.name, block_size=4096, queue_depth=4) as engine:
+            written = engine.write_pass(FixedPattern(b'\xFF'), "ones pass")
+        
+        self.assertEqual(written, 10000)
+        with open(self.temp_file.name, 'rb') as f:
+            self.assertEqual(f.read(), b'\xFF' * 10000)
+        self.assertEqual(engine.pass_stats[0]['queue_depth'], 4)
+    
+    def test_unaligned_tail_keeps_direct_io(self):
+        """Test an unaligned tail written with writes in flight leaves O_DIRECT on the shared descriptor"""
+        import fcntl
+        with NativeWipeEngine(self.temp_file.name, block_size=4096, queue_depth=4) as engine:
+            if not engine.direct_supported:
+                self.skipTest("O_DIRECT not supported on the test filesystem")
+            engine.write_pass(FixedPattern(b'\x00'), "zero pass")
+            self.assertTrue(fcntl.fcntl(engine.fd, fcntl.F_GETFL) & os.O_DIRECT)
+            self.assertTrue(engine.direct_active)
+            self.assertEqual(engine.pass_stats[0]['direct_io'], True)
+        
+        with open(self.temp_file.name, 'rb') as f:
+            self.assertEqual(f.read(), bytes(10000))
+    
+    def test_parallel_stripes_cover_file(self):
+        """Test striped workers cover the file with no gaps or overlap"""
+        pattern = KeystreamPattern(key=b'p' * 32, workers=1)
+        with NativeWipeEngine(self.temp_file.name, block_size=4096) as engine:
+            scheduler = engine.write_pass_parallel(pattern, 3, stripe_size=4096)
+        
+        self.assertEqual(scheduler.completed_ranges(), [(0, 10000)])
+        self.assertEqual(scheduler.missing_ranges(), [])
+        self.assertEqual(sum(w['bytes_written'] for w in engine.pass_stats[0]['workers']), 10000)
+        with open(self.temp_file.name, 'rb') as f:
+            self.assertEqual(f.read(), pattern.generate(10000))
+    
+    def test_stripe_scheduler_reports_gaps(self):
+        """Test unfinished stripes show up as missing ranges"""
+        scheduler = StripeScheduler(10000, 4096)
+        first = scheduler.claim()
+        scheduler.claim()
+        third = scheduler.claim()
+        scheduler.complete(*first)
+        scheduler.complete(*third)
+        
+        self.assertIsNone(scheduler.claim())
+        self.assertEqual(scheduler.missing_ranges(), [(4096, 8192)])
+    
+    def test_three_byte_pattern_keeps_phase(self):
+        """Test Gutmann triplets stay continuous across blocks and the tail"""
+        pattern = FixedPattern(b'\x92\x49\x24')
+        with NativeWipeEngine(self.temp_file.name, block_size=4096) as engine:
+            engine.write_pass(pattern, "triplet pass")
+        
+        with open(self.temp_file.name, 'rb') as f:
+            self.assertEqual(f.read(), (b'\x92\x49\x24' * 3334)[:10000])
+    
+    def test_native_gutmann_wipe(self):
+        """Test the native Gutmann run writes all 35 table passes"""
+        wiper = DataWiper(self.temp_file.name, 'gutmann', 1, engine='native', journal_dir=self.journal_dir)
+        with patch.object(wiper, 'validate_device'):
+            self.assertTrue(wiper.wipe())
+        
+        self.assertEqual(len(wiper.pass_stats), len(GUTMANN_PASSES))
+        self.assertEqual(wiper.pass_stats[6]['pattern'], '0x924924')
+        self.assertTrue(all(p['bytes_written'] == 10000 for p in wiper.pass_stats))
+    
+    def test_zero_offload_falls_back_on_files(self):
+        """Test zero passes on a regular file use buffered writes"""
+        self.assertFalse(probe_zero_offload(self.temp_file.name)['block_device'])
+        
+        wiper = DataWiper(self.temp_file.name, 'zeros', 1, engine='native', journal_dir=self.journal_dir)
+        with patch.object(wiper, 'validate_device'):
+            self.assertTrue(wiper.wipe())
+        
+        self.assertNotIn('offload', wiper.pass_stats[0])
+        with open(self.temp_file.name, 'rb') as f:
+            self.assertEqual(f.read(), b'\x00' * 10000)
+    
+    def test_zero_copy_pass(self):
+        """Test the kernel-copy path writes a fixed pattern exactly"""
+        with NativeWipeEngine(self.temp_file.name) as engine:
+            written = engine.zero_copy_pass(FixedPattern(b'\xAA'), "zero-copy pass")
+        
+        self.assertEqual(written, 10000)
+        self.assertIn(engine.pass_stats[0]['zero_copy'], ['copy_file_range', 'sendfile', 'splice'])
+        with open(self.temp_file.name, 'rb') as f:
+            self.assertEqual(f.read(), b'\xAA' * 10000)
+    
+    def test_native_dod_wipe(self):
+        """Test DataWiper with the native engine keeps the file size"""
+        wiper = DataWiper(self.temp_file.name, 'dod', 1, engine='native', queue_depth=2,
+                          journal_dir=self.journal_dir)
+        with patch.object(wiper, 'validate_device'):
+            self.assertTrue(wiper.wipe())
+        
+        self.assertEqual(os.path.getsize(self.temp_file.name), 10000)
+        self.assertEqual(len(wiper.pass_stats), 3)
+        with open(self.temp_file.name, 'rb') as f:
+            self.assertNotIn(b'X' * 64, f.read())
+
+    def _failing_io(self, bad_start, bad_end):
+        """os.pwrite/os.preadv replacements that fail with EIO on [bad_start, bad_end)"""
+        real_pwrite, real_preadv = os.pwrite, os.preadv
+        
+        def check(offset, length):
+            if offset < bad_end and offset + length > bad_start:
+                raise OSError(errno.EIO, "Input/output error")
+        
+        def pwrite(fd, data, offset):
+            check(offset, len(data))
+            return real_pwrite(fd, data, offset)
+        
+        def preadv(fd, buffers, offset):
+            check(offset, sum(len(buffer) for buffer in buffers))
+            return real_preadv(fd, buffers, offset)
+        
+        return pwrite, preadv
+    
+    def test_bad_sectors_are_isolated(self):
+        """Test a failing write is bisected to the bad sector and the rest is still written"""
+        pwrite, _ = self._failing_io(4096, 4608)
+        coverage = CoverageMap(10000, 1024)
+        with patch('backend.BAD_SECTOR_BACKOFF', 0), patch('os.pwrite', pwrite):
+            with NativeWipeEngine(self.temp_file.name, block_size=8192, tolerate_errors=True) as engine:
+                engine.coverage = coverage
+                engine.write_pass(FixedPattern(b'\x00'), "zero pass")
+        
+        self.assertEqual(engine.bad_ranges, [(4096, 4608)])
+        self.assertEqual(coverage.missing(), [(4096, 5120)])
+        with open(self.temp_file.name, 'rb') as f:
+            data = f.read()
+        self.assertEqual(data[4096:4608], b'X' * 512)
+        self.assertEqual(data[:4096] + data[4608:], bytes(10000 - 512))
+        
+        # Without tolerance the first media error fails the pass
+        with patch('os.pwrite', pwrite), self.assertRaises(OSError):
+            with NativeWipeEngine(self.temp_file.name, block_size=8192) as engine:
+                engine.write_pass(FixedPattern(b'\x00'), "zero pass")
+    
+    def test_bisection_uses_sync_descriptor(self):
+        """Test isolating a bad sector writes through its own O_SYNC descriptor and leaves the shared one alone"""
+        import fcntl
+        failing, _ = self._failing_io(4096, 4608)
+        sector_writes = []
+        
+        def pwrite(fd, data, offset):
+            if len(data) <= 4096 and offset < 8192:
+                sector_writes.append((fd, fcntl.fcntl(fd, fcntl.F_GETFL)))
+            return failing(fd, data, offset)
+        
+        with patch('backend.BAD_SECTOR_BACKOFF', 0), patch('os.pwrite', pwrite):
+            with NativeWipeEngine(self.temp_file.name, block_size=8192, queue_depth=2,
+                                  tolerate_errors=True) as engine:
+                engine.write_pass(FixedPattern(b'\x00'), "zero pass")
+                shared_flags = fcntl.fcntl(engine.fd, fcntl.F_GETFL)
+                shared_fd = engine.fd
+        
+        self.assertEqual(engine.bad_ranges, [(4096, 4608)])
+        bisection = [(fd, flags) for fd, flags in sector_writes if fd != shared_fd]
+        self.assertTrue(bisection)
+        self.assertTrue(all(flags & os.O_SYNC == os.O_SYNC for fd, flags in bisection))
+        if engine.direct_supported:
+            self.assertTrue(shared_flags & os.O_DIRECT)
+    
+    def test_wiper_certifies_bad_sectors(self):
+        """Test a tolerant wipe finishes, verifies around the bad sector and reports its LBAs"""
+        with self.assertRaises(ValueError):
+            DataWiper(self.temp_file.name, 'zeros', 1, engine='dd', tolerate_errors=True)
+        
+        pwrite, preadv = self._failing_io(4096, 4608)
+        wiper = DataWiper(self.temp_file.name, 'random', 1, engine='native', verify=True, tolerate_errors=True,
+                          journal_dir=self.journal_dir, coverage_granularity=1024)
+        with patch('backend.BAD_SECTOR_BACKOFF', 0), patch('os.pwrite', pwrite), patch('os.preadv', preadv):
+            self.assertTrue(wiper.wipe())
+        
+        self.assertEqual(wiper.bad_sectors, {'sector_size': 512, 'sectors': 1, 'lba_ranges': [[8, 8]]})
+        self.assertEqual(wiper.verification['status'], 'PASS')
+        self.assertEqual(wiper.verification['unreadable_bad_sector_bytes'], 4096)
+        self.assertEqual(wiper.coverage_summary['passes'][0]['missing_ranges'], [[4096, 5120]])
+
+    def test_repair_pass_rewrites_only_dirty_regions(self):
+        """Test a skip-if-clean pass leaves matching regions alone and rewrites the rest"""
+        with open(self.temp_file.name, 'r+b') as f:
+            f.write(bytes(4096) + b'X' * 1024 + bytes(10000 - 5120))
+        
+        with NativeWipeEngine(self.temp_file.name, block_size=8192) as engine:
+            written = engine.repair_pass(FixedPattern(b'\x00'), "repair pass", region_size=4096)
+        
+        self.assertEqual(written, 4096)
+        stats = engine.pass_stats[0]
+        self.assertEqual(stats['mode'], 'skip-if-clean')
+        self.assertEqual((stats['bytes_read'], stats['bytes_skipped']), (10000, 10000 - 4096))
+        with open(self.temp_file.name, 'rb') as f:
+            self.assertEqual(f.read(), bytes(10000))
+    
+    def test_skip_clean_only_on_verified_final_pass(self):
+        """Test skip-if-clean needs verification and only reads-and-compares the final pass"""
+        with self.assertRaises(ValueError):
+            DataWiper(self.temp_file.name, 'zeros', 1, engine='native', skip_clean=True)
+        
+        # The first zero pass writes everything; the final one finds the file already clean
+        wiper = DataWiper(self.temp_file.name, 'zeros', 2, engine='native', verify=True, skip_clean=True,
+                          journal_dir=self.journal_dir)
+        with patch.object(wiper, 'validate_device'):
+            self.assertTrue(wiper.wipe())
+        
+        self.assertEqual([stats.get('mode') for stats in wiper.pass_stats], [None, 'skip-if-clean'])
+        self.assertEqual(wiper.pass_stats[0]['bytes_written'], 10000)
+        self.assertEqual(wiper.skip_clean_summary,
+                         {'pass': 2, 'bytes_read': 10000, 'bytes_rewritten': 0, 'bytes_skipped': 10000})
+        self.assertEqual(wiper.verification['status'], 'PASS')
+
+class TestKeystreamPattern(unittest.TestCase):
+    """Test the keystream random pattern source"""
+    
+    def test_fill_is_offset_addressable(self):
+        """Test any slice of the keystream can be generated on its own"""
+        pattern = KeystreamPattern(key=b'k' * 32, workers=1)
+        full = pattern.generate(3 * KEYSTREAM_BLOCK_SIZE)
+        
+        offset = KEYSTREAM_BLOCK_SIZE - 100
+        self.assertEqual(pattern.generate(5000, offset), full[offset:offset + 5000])
+        self.assertNotEqual(full[:KEYSTREAM_BLOCK_SIZE], full[KEYSTREAM_BLOCK_SIZE:2 * KEYSTREAM_BLOCK_SIZE])
+    
+    def test_shake_fallback(self):
+        """Test the hashlib fallback and that keys change the stream"""
+        first = KeystreamPattern(key=b'a' * 32, workers=1, algorithm=SHAKE_256)
+        second = KeystreamPattern(key=b'b' * 32, workers=1, algorithm=SHAKE_256)
+        
+        self.assertEqual(len(first.generate(4096)), 4096)
+        self.assertNotEqual(first.generate(4096), second.generate(4096))
+    
+    def test_invalid_key(self):
+        """Test short keys are rejected"""
+        with self.assertRaises(ValueError):
+            KeystreamPattern(key=b'short')
+    
+    def test_seeded_pass_keys(self):
+        """Test random pass keys regenerate from the wipe seed and differ per pass"""
+        seed = b's' * 32
+        patterns = build_pass_patterns('dod', seed)
+        self.assertEqual(patterns[2].key, pass_key(seed, 2))
+        self.assertNotEqual(pass_key(seed, 0), pass_key(seed, 1))
+        self.assertNotIn(seed.hex(), seed_commitment(seed))
+        self.assertEqual(len(seed_commitment(seed)), 64)
+
+class TestBufferPool(unittest.TestCase):
+    """Test the budgeted aligned buffer pool"""
+    
+    def test_budget_caps_allocation(self):
+        """Test acquire stops at the budget and released buffers are reused"""
+        pool = BufferPool(4096, budget=MemoryBudget(8192))
+        first = pool.acquire()
+        second = pool.acquire(block=False)
+        
+        self.assertEqual(len(first), 4096)
+        self.assertIsNone(pool.acquire(block=False))
+        with self.assertRaises(MemoryError):
+            pool.acquire(timeout=0.01)
+        
+        second.release()
+        self.assertIs(pool.acquire(block=False), second)
+        
+        first.release()
+        second.release()
+        pool.close()
+        self.assertEqual(pool.budget.reserved, 0)
+    
+    def test_engine_queue_depth_limited_by_budget(self):
+        """Test the native engine runs with fewer buffers instead of exceeding the budget"""
+        fd, path = tempfile.mkstemp()
+        os.write(fd, b'\x5A' * 20000)
+        os.close(fd)
+        try:
+            pool = BufferPool(8192, budget=MemoryBudget(16384))
+            with NativeWipeEngine(path, block_size=8192, queue_depth=4, pool=pool) as engine:
+                engine.write_pass(KeystreamPattern(workers=1))
+                # Two buffers: one being written, one being filled
+                self.assertEqual(engine.pass_stats[-1]['queue_depth'], 1)
+                self.assertEqual(engine.pass_stats[-1]['pipeline']['buffers'], 2)
+            pool.close()
+            with open(path, 'rb') as f:
+                self.assertNotIn(b'\x5A' * 64, f.read())
+        finally:
+            os.unlink(path)
+
+class TestWritePipeline(unittest.TestCase):
+    """Test the producer/consumer write pipeline"""
+    
+    def test_pipeline_covers_target(self):
+        """Test every chunk is generated and written exactly once"""
+        pool = BufferPool(4096, budget=MemoryBudget(4 * 4096))
+        buffers = [pool.acquire() for _ in range(4)]
+        pattern = KeystreamPattern(key=b'p' * 32, workers=1)
+        target = bytearray(50000)
+        writes = []
+        
+        def write(view, offset):
+            target[offset:offset + len(view)] = view
+            writes.append(offset)
+        
+        pipeline = WritePipeline(buffers, pattern, write, len(target), producers=2, consumers=2)
+        self.assertEqual(pipeline.run(), len(target))
+        self.assertEqual(target, pattern.generate(len(target)))
+        self.assertEqual(sorted(writes), list(range(0, len(target), 4096)))
+        self.assertIn('producer_stall_seconds', pipeline.stats)
+        self.assertIn('consumer_stall_seconds', pipeline.stats)
+        
+        for buffer in buffers:
+            buffer.release()
+        pool.close()
+    
+    def test_pipeline_write_error(self):
+        """Test a failing write stops the pipeline and surfaces the error"""
+        pool = BufferPool(4096, budget=MemoryBudget(2 * 4096))
+        buffers = [pool.acquire() for _ in range(2)]
+        
+        def write(view, offset):
+            raise OSError(5, "I/O error")
+        
+        pipeline = WritePipeline(buffers, FixedPattern(b'\x01\x02\x03'), write, 100000)
+        with self.assertRaises(OSError):
+            pipeline.run()
+        
+        for buffer in buffers:
+            buffer.release()
+        pool.close()
+        self.assertEqual(pool.budget.reserved, 0)
+
+class TestWipeJournal(unittest.TestCase):
+    """Test checkpoint journals and resumed wipes"""
+    
+    def setUp(self):
+        self.journal_dir = tempfile.mkdtemp()
+        fd, self.path = tempfile.mkstemp()
+        os.write(fd, b'\x5A' * 20480)
+        os.close(fd)
+    
+    def tearDown(self):
+        import shutil
+        os.unlink(self.path)
+        shutil.rmtree(self.journal_dir)
+    
+    def test_journal_round_trip(self):
+        """Test checkpoints survive a reload and only match the same wipe"""
+        journal = WipeJournal(self.path, 20480, 'dod', 3, 'native', journal_dir=self.journal_dir, interval=60)
+        self.assertEqual(journal.begin(), (0, 0))
+        self.assertFalse(journal.checkpoint(0, 4096))
+        journal.complete_pass(0)
+        self.assertTrue(journal.checkpoint(1, 8192, force=True))
+        
+        again = WipeJournal(self.path, 20480, 'dod', 3, 'native', journal_dir=self.journal_dir)
+        self.assertEqual(again.begin(resume=True), (1, 8192))
+        self.assertTrue(again.resumed)
+        
+        other = WipeJournal(self.path, 20480, 'gutmann', 3, 'native', journal_dir=self.journal_dir)
+        self.assertIsNone(other.load())
+    
+    def test_resumed_wipe_skips_completed_range(self):
+        """Test a resumed native wipe starts at the checkpoint and certifies full coverage"""
+        journal = WipeJournal(self.path, 20480, 'zeros', 2, 'native', journal_dir=self.journal_dir)
+        journal.begin()
+        journal.complete_pass(0)
+        journal.checkpoint(1, 8192, force=True)
+        
+        wiper = DataWiper(self.path, 'zeros', 2, engine='native', resume=True, journal_dir=self.journal_dir)
+        self.assertTrue(wiper.wipe())
+        
+        with open(self.path, 'rb') as f:
+            data = f.read()
+        # The earlier run's bytes are untouched, the rest of pass 2 was written
+        self.assertEqual(data[:8192], b'\x5A' * 8192)
+        self.assertEqual(data[8192:], bytes(20480 - 8192))
+        self.assertTrue(wiper.resume_summary['resumed'])
+        self.assertEqual(wiper.resume_summary['coverage'], 'full')
+        self.assertFalse(os.path.exists(journal.path))
+    
+    def test_resume_verifies_completed_wipe(self):
+        """Test resuming a wipe whose passes all completed still verifies the final pass"""
+        journal = WipeJournal(self.path, 20480, 'zeros', 1, 'native', journal_dir=self.journal_dir)
+        journal.begin()
+        journal.complete_pass(0)
+        
+        wiper = DataWiper(self.path, 'zeros', 1, engine='native', resume=True, verify=True,
+                          journal_dir=self.journal_dir)
+        with self.assertRaises(IOError):
+            wiper.wipe()
+        self.assertEqual(wiper.verification['status'], 'FAIL')
+        self.assertEqual(wiper.verification['mismatched_bytes'], 20480)
+        # The failed wipe keeps its journal, but a zero wipe has no seed to store in it
+        with open(journal.path) as f:
+            self.assertNotIn('seed', json.load(f))
+    
+    def test_resume_verifies_completed_shred_gutmann(self):
+        """Test resuming a completed shred Gutmann run verifies against its closing zero pass"""
+        journal = WipeJournal(self.path, 20480, 'gutmann', 1, 'dd', journal_dir=self.journal_dir)
+        journal.begin()
+        journal.complete_pass(0)
+        
+        wiper = DataWiper(self.path, 'gutmann', 1, engine='dd', resume=True, verify=True,
+                          journal_dir=self.journal_dir)
+        with self.assertRaises(IOError):
+            wiper.wipe()
+        self.assertEqual(wiper.verification['status'], 'FAIL')
+        self.assertEqual(wiper.verification['mismatched_bytes'], 20480)
+    
+    def test_seed_survives_resume(self):
+        """Test the pattern seed is kept owner-only and reused, but never summarized"""
+        journal = WipeJournal(self.path, 20480, 'random', 1, 'native', journal_dir=self.journal_dir)
+        journal.begin()
+        seed = journal.keep_seed(b'x' * 32)
+        self.assertEqual(os.stat(journal.path).st_mode & 0o777, 0o600)
+        
+        again = WipeJournal(self.path, 20480, 'random', 1, 'native', journal_dir=self.journal_dir)
+        again.begin(resume=True)
+        self.assertEqual(again.keep_seed(b'y' * 32), seed)
+        self.assertNotIn(seed.hex(), json.dumps(again.summary()))
+    
+    def test_coverage_survives_resume(self):
+        """Test the coverage map is checkpointed and picked up by the resumed wipe"""
+        journal = WipeJournal(self.path, 20480, 'zeros', 1, 'native', journal_dir=self.journal_dir)
+        journal.begin()
+        coverage = journal.keep_coverage(CoverageMap(20480, 4096))
+        coverage.mark(0, 6000)
+        journal.checkpoint(0, 6000, force=True)
+        
+        again = WipeJournal(self.path, 20480, 'zeros', 1, 'native', journal_dir=self.journal_dir)
+        again.begin(resume=True)
+        restored = again.keep_coverage(CoverageMap(20480, 4096))
+        self.assertEqual(restored.covered_bytes(), 4096)
+        restored.mark(6000, 8192)
+        self.assertEqual(restored.ranges(), [(0, 8192)])
+        
+        wiper = DataWiper(self.path, 'zeros', 1, engine='native', resume=True, journal_dir=self.journal_dir,
+                          coverage_granularity=4096)
+        self.assertTrue(wiper.wipe())
+        self.assertEqual(wiper.coverage_summary['passes'][0]['percent'], 100.0)
+        self.assertEqual(describe_coverage(wiper.coverage_summary), "100% of LBAs written by pass 1")
+
+class TestCoverageMap(unittest.TestCase):
+    """Test per-block written/verified coverage tracking"""
+    
+    def test_partial_blocks_and_gaps(self):
+        """Test blocks count only once fully covered, and gaps are reported as byte ranges"""
+        coverage = CoverageMap(10000, 1024)
+        coverage.mark(100, 3000)
+        self.assertEqual(coverage.ranges(), [(1024, 2048)])
+        coverage.mark(0, 100)
+        coverage.mark(3000, 3072)
+        self.assertEqual(coverage.ranges(), [(0, 3072)])
+        coverage.mark(9000, 10000)
+        self.assertEqual(coverage.missing(), [(3072, 9216)])
+        self.assertEqual(coverage.covered_bytes(), 3072 + 784)
+        
+        restored = CoverageMap.from_dict(json.loads(json.dumps(coverage.to_dict())))
+        restored.mark(3072, 9216)
+        self.assertEqual(restored.summary()['percent'], 100.0)
+    
+    def test_passes_must_be_consecutive(self):
+        """Test a later pass only counts where every earlier pass reached"""
+        written = CoverageMap(4096, 1024)
+        written.mark(0, 4096, 1)
+        written.mark(0, 4096, 2)
+        written.mark(1024, 4096, 1)
+        written.mark(0, 3000, 3)
+        written.mark(2048, 4096, 3)
+        
+        verified = CoverageMap(4096, 1024)
+        verified.mark(0, 4095)
+        summary = coverage_summary(written, 3, verified)
+        
+        self.assertEqual([row['bytes'] for row in summary['passes']], [4096, 4096, 4096])
+        self.assertEqual(summary['verified']['missing_ranges'], [[3072, 4096]])
+        self.assertEqual(describe_coverage(summary), "100% of LBAs written by pass 3, 75% verified")
+        
+        gap = CoverageMap(4096, 1024)
+        gap.mark(0, 2048, 1)
+        gap.mark(0, 4096, 2)
+        self.assertEqual(gap.summary(2)['percent'], 50.0)
+        self.assertEqual(gap.summary(1)['missing_ranges'], [[2048, 4096]])
+
+class TestWipeVerifier(unittest.TestCase):
+    """Test read-back verification"""
+    
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp()
+        os.write(fd, bytes(100000))
+        os.close(fd)
+    
+    def tearDown(self):
+        os.unlink(self.path)
+    
+    def test_clean_device_passes(self):
+        """Test a zeroed target verifies completely"""
+        result = WipeVerifier(self.path, block_size=12288).verify(FixedPattern(b'\x00'))
+        self.assertEqual(result['status'], 'PASS')
+        self.assertEqual(result['bytes_checked'], 100000)
+        self.assertEqual(result['mismatch_extents'], [])
+    
+    def test_mismatch_extents(self):
+        """Test leftover data is reported as sector extents"""
+        with open(self.path, 'r+b') as f:
+            f.seek(5000)
+            f.write(b'secret')
+            f.seek(99999)
+            f.write(b'!')
+        
+        result = WipeVerifier(self.path, block_size=12288).verify(FixedPattern(b'\x00'))
+        self.assertEqual(result['status'], 'FAIL')
+        self.assertEqual(result['mismatch_extents'], [[4096, 8192], [98304, 100000]])
+        self.assertEqual(result['mismatched_bytes'], 4096 + 1696)
+    
+    def test_fraction_reads_subset(self):
+        """Test fractional verification reads an evenly spread subset of blocks"""
+        self.assertEqual(WipeVerifier.select_blocks(10, 0.3), [0, 3, 6])
+        result = WipeVerifier(self.path, block_size=4096).verify(FixedPattern(b'\x00'), fraction=0.5)
+        self.assertLess(result['bytes_checked'], 100000)
+        self.assertEqual(result['status'], 'PASS')
+    
+    def test_streaming_regions(self):
+        """Test fused verification reports a status per region behind the write front"""
+        with open(self.path, 'r+b') as f:
+            f.seek(20000)
+            f.write(b'leftover')
+        
+        # Pretend the writer got to 80000 bytes before it stopped
+        verifier = StreamingVerifier(self.path, FixedPattern(b'\x00'), lambda: 80000,
+                                     region_size=40960, lag=0, block_size=12288)
+        verifier.start()
+        result = verifier.finish()
+        
+        self.assertEqual(result['status'], 'FAIL')
+        self.assertEqual([region['status'] for region in result['regions']], ['FAIL', 'NOT_VERIFIED'])
+        self.assertEqual(result['regions'][0]['mismatch_extents'], [[16384, 20480]])
+        self.assertEqual(result['regions'][1]['start'], 40960)
+    
+    def test_streaming_resumed_pass_checks_prefix(self):
+        """Test a resumed fused pass also reads back what the earlier run wrote"""
+        with open(self.path, 'r+b') as f:
+            f.seek(20000)
+            f.write(b'leftover')
+        
+        verifier = StreamingVerifier(self.path, FixedPattern(b'\x00'), lambda: 100000, start=40960,
+                                     region_size=40960, lag=0, block_size=12288)
+        verifier.start()
+        result = verifier.finish()
+        
+        self.assertEqual(result['status'], 'FAIL')
+        self.assertEqual(result['bytes_checked'], 100000)
+        self.assertEqual(result['regions'][0]['start'], 0)
+        self.assertEqual(result['mismatch_extents'], [[16384, 20480]])
+    
+    def test_engine_write_verify_pass(self):
+        """Test a fused pass verifies every region it writes"""
+        with NativeWipeEngine(self.path, block_size=8192) as engine:
+            engine.write_verify_pass(KeystreamPattern(workers=1), region_size=32768, lag=8192)
+            result = engine.verification
+        
+        self.assertEqual(result['status'], 'PASS')
+        self.assertEqual(result['bytes_checked'], 100000)
+        self.assertEqual(len(result['regions']), 4)
+        self.assertEqual(engine.pass_stats[-1]['verification']['status'], 'PASS')
+    
+    def test_wiper_verifies_random_pass(self):
+        """Test DataWiper reads a native random pass back against its keystream"""
+        import shutil
+        journal_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, journal_dir)
+        wiper = DataWiper(self.path, 'random', 1, engine='native', verify=True, journal_dir=journal_dir)
+        self.assertTrue(wiper.wipe())
+        self.assertEqual(wiper.verification['status'], 'PASS')
+        self.assertEqual(wiper.verification['bytes_checked'], 100000)
+    
+    def test_fused_verify_wins_over_zero_copy(self):
+        """Test the zero-copy engine's final fixed pass is verified as it is written, not read back again"""
+        import shutil
+        journal_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, journal_dir)
+        wiper = DataWiper(self.path, 'zeros', 2, engine='zerocopy', zero_offload=False, verify=True,
+                          fused_verify=True, journal_dir=journal_dir)
+        self.assertTrue(wiper.wipe())
+        
+        self.assertIn('zero_copy', wiper.pass_stats[0])
+        self.assertNotIn('zero_copy', wiper.pass_stats[1])
+        self.assertEqual(wiper.verification['mode'], 'fused')
+        self.assertEqual(wiper.verification['status'], 'PASS')
+    
+    def test_dd_random_pass_is_verifiable(self):
+        """Test dd random passes are fed the seeded keystream and verify by regeneration"""
+        import shutil
+        journal_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, journal_dir)
+        wiper = DataWiper(self.path, 'random', 1, engine='dd', verify=True, journal_dir=journal_dir)
+        self.assertTrue(wiper.wipe())
+        self.assertEqual(wiper.verification['status'], 'PASS')
+        self.assertEqual(wiper.seed_record['commitment'], seed_commitment(wiper.seed))
+        self.assertEqual(wiper.seed_record['passes'], [1])
+    
+    def test_sample_plan_is_stratified(self):
+        """Test sampled offsets fall one per stratum and regenerate from the seed"""
+        offsets = sample_plan(100 * 4096, 10, seed=42)
+        self.assertEqual(offsets, sample_plan(100 * 4096, 10, seed=42))
+        self.assertEqual([offset // 4096 // 10 for offset in offsets], list(range(10)))
+        self.assertEqual(samples_for_confidence(0.001, 0.99), 4603)
+        self.assertGreaterEqual(detection_probability(4603, 0.001), 0.99)
+    
+    def test_sampled_verify_reports_plan(self):
+        """Test sampled verification records its plan and catches leftover data"""
+        with open(self.path, 'r+b') as f:
+            f.seek(50000)
+            f.write(b'leftover')
+        
+        result = WipeVerifier(self.path).verify_sampled(FixedPattern(b'\x00'), samples=5, seed=1)
+        self.assertEqual(result['mode'], 'sampled')
+        self.assertEqual(result['sample_plan']['seed'], 1)
+        self.assertEqual(result['bytes_checked'], 5 * 4096)
+        
+        # One sample per sector reads everything, so detection is certain
+        result = WipeVerifier(self.path).verify_sampled(FixedPattern(b'\x00'), samples=1000, queue_depth=4)
+        self.assertEqual(result['status'], 'FAIL')
+        self.assertEqual(result['mismatch_extents'], [[49152, 53248]])
+        self.assertEqual(result['detection']['probability'], 1.0)
+    
+    def test_sampled_verify_skips_known_bad_sectors(self):
+        """Test an unreadable sample on a recorded bad sector is reported, not raised, and not counted"""
+        real_preadv = os.preadv
+        
+        def preadv(fd, buffers, offset):
+            if offset < 8192 and offset + sum(len(buffer) for buffer in buffers) > 4096:
+                raise OSError(errno.EIO, "Input/output error")
+            return real_preadv(fd, buffers, offset)
+        
+        with patch('os.preadv', preadv):
+            result = WipeVerifier(self.path, known_bad=[(4096, 4608)]).verify_sampled(
+                FixedPattern(b'\x00'), samples=1000, queue_depth=4)
+            unexplained = WipeVerifier(self.path).verify_sampled(FixedPattern(b'\x00'), samples=1000)
+        
+        self.assertEqual(result['status'], 'PASS')
+        self.assertEqual(result['unreadable_bad_sector_bytes'], 4096)
+        self.assertEqual(result['detection']['known_bad_samples'], 1)
+        self.assertEqual(result['detection']['probability'], 1.0)
+        self.assertEqual(unexplained['status'], 'FAIL')
+        self.assertEqual(unexplained['mismatch_extents'], [[4096, 8192]])
+
+class TestMerkleDigest(unittest.TestCase):
+    """Test the device digest built during read-back"""
+    
+    def test_uneven_reads_match_leaf_hashes(self):
+        """Test leaves split across reads hash the same as leaves read whole"""
+        data = KeystreamPattern(key=b'm' * 32, workers=1).generate(10000)
+        expected = [leaf_hash(data[i:i + 1024]) for i in range(0, 10000, 1024)]
+        
+        for workers, step in ((1, 700), (4, 3000), (4, 10000)):
+            digest = MerkleDigest(10000, leaf_size=1024, workers=workers)
+            for offset in range(0, 10000, step):
+                digest.update(offset, memoryview(data)[offset:offset + step])
+            digest.close()
+            self.assertEqual(digest.leaves(), b''.join(expected))
+            self.assertEqual(digest.record()['root'], merkle_root(expected).hex())
+        
+        self.assertNotEqual(merkle_root(expected[:3]), merkle_root(expected[:2] + [expected[3]]))
+        with self.assertRaises(ValueError):
+            MerkleDigest(10000, leaf_size=1024).update(100, data[100:200])
+    
+    def test_certified_digest_rechecks_leaves(self):
+        """Test a verified wipe records a digest whose leaves can be re-read later"""
+        import shutil
+        journal_dir = tempfile.mkdtemp()
+        cert_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, journal_dir)
+        self.addCleanup(shutil.rmtree, cert_dir)
+        with tempfile.NamedTemporaryFile() as f:
+            f.write(b'X' * 50000)
+            f.flush()
+            wiper = DataWiper(f.name, 'zeros', 1, engine='native', verify=True, journal_dir=journal_dir)
+            self.assertTrue(wiper.wipe())
+            record = wiper.device_digest
+            self.assertEqual(record['root'], merkle_root([leaf_hash(bytes(50000))]).hex())
+            
+            cert_path, _ = CertificateGenerator(cert_dir).generate_certificate(
+                {}, {'device_path': f.name}, {'device_digest': record}, wiper.device_digest_leaves)
+            with open(cert_path) as cert:
+                stored = json.load(cert)['wipe_details']['device_digest']
+            with open(os.path.join(cert_dir, stored['leaves_file']), 'rb') as leaves_file:
+                leaves = leaves_file.read()
+            self.assertEqual(recheck_leaves(f.name, stored, leaves, [0])['status'], 'PASS')
+            
+            f.seek(40000)
+            f.write(b'new data')
+            f.flush()
+            self.assertEqual(recheck_leaves(f.name, stored, leaves, [0])['changed_leaves'], [0])
+
+class TestForensicAnalyzer(unittest.TestCase):
+    """Test single-pass forensic analysis"""
+    
+    def test_region_classification(self):
+        """Test wiped fills, patterns and random data are told apart from leftovers"""
+        self.assertEqual(analyze_region(bytes(65536))['classification'], 'zeros')
+        
+        pattern = analyze_region(b'\x92\x49\x24' * 20000)
+        self.assertEqual(pattern['classification'], 'pattern')
+        self.assertEqual(pattern['pattern'], '924924')
+        self.assertEqual(pattern['histogram'][0x92], 20000)
+        
+        random_region = analyze_region(KeystreamPattern(key=b'r' * 32, workers=1).generate(1 << 20))
+        self.assertEqual(random_region['classification'], 'random')
+        self.assertGreater(random_region['entropy'], 7.99)
+        
+        text = analyze_region(b'quarterly payroll report ' * 4000, offset=4096)
+        self.assertEqual(text['classification'], 'data')
+        self.assertEqual(text['string_samples'][0]['offset'], 4096)
+    
+    def test_device_report(self):
+        """Test leftover structures fail the report and regions are read once each"""
+        self.assertEqual(plan_regions(100, samples=4, region_size=60), [(0, 60)])
+        
+        with tempfile.NamedTemporaryFile() as f:
+            f.write(bytes(3 * 1024 * 1024))
+            f.seek(2 * 1024 * 1024 + 1080)
+            f.write(b'\x53\xef')
+            f.seek(2 * 1024 * 1024 + 8192)
+            f.write(b'%PDF-1.7 confidential')
+            f.flush()
+            
+            report = analyze_device(f.name, samples=3, region_size=1024 * 1024, workers=1)
+        
+        self.assertEqual(report['verdict'], 'FAIL')
+        self.assertEqual(report['bytes_analyzed'], 3 * 1024 * 1024)
+        self.assertEqual(report['summary']['zeros'], 2)
+        self.assertEqual(report['regions'][2]['filesystems'], [{'name': 'ext2/3/4', 'offset': 2 * 1024 * 1024}])
+        self.assertEqual(report['checks']['file_signatures']['status'], 'FAIL')
+        self.assertEqual(report['checks']['first_sectors']['status'], 'PASS')
+    
+    def test_chance_signatures_in_random_data(self):
+        """Test signature matches random data produces by chance do not fail a random wipe"""
+        with tempfile.NamedTemporaryFile() as f:
+            f.write(KeystreamPattern(key=b'r' * 32, workers=1).generate(2 * 1024 * 1024))
+            f.seek(1024 * 1024 + 4096)
+            f.write(b'II*\x00')
+            f.flush()
+            
+            strict = analyze_device(f.name, samples=2, region_size=1024 * 1024, workers=1)
+            with patch.object(SignatureScanner, 'chance_hits', return_value=1.0):
+                allowed = analyze_device(f.name, samples=2, region_size=1024 * 1024, workers=1)
+        
+        self.assertEqual(strict['summary']['random'], 2)
+        self.assertEqual(strict['checks']['file_signatures']['status'], 'FAIL')
+        self.assertEqual(allowed['checks']['file_signatures']['status'], 'PASS')
+
+class TestSignatureScanner(unittest.TestCase):
+    """Test the multi-pattern file signature scanner"""
+    
+    def test_every_signature_matches(self):
+        """Test each table entry is found, with the file start derived from its position"""
+        scanner = SignatureScanner()
+        for name, kind, magic, position in SIGNATURES:
+            data = b'\x00' * 100 + b'x' * position + magic
+            hits = [hit for hit in scanner.scan(data, offset=4096) if hit['name'] == name]
+            self.assertEqual(len(hits), 1, name)
+            self.assertEqual(hits[0]['offset'], 4096 + 100 + position)
+            if kind == 'header':
+                self.assertEqual(hits[0]['file_offset'], 4096 + 100)
+        
+        self.assertEqual(scanner.scan(b'\xaa\x55' * 50000), [])
+    
+    def test_chunk_boundaries(self):
+        """Test signatures straddling chunk edges are reported exactly once"""
+        with tempfile.NamedTemporaryFile() as f:
+            f.write(bytes(4 * 65536))
+            f.seek(65536 - 3)
+            f.write(b'\x89PNG\r\n\x1a\n')
+            f.seek(2 * 65536)
+            f.write(b'%PDF-1.7')
+            f.flush()
+            
+            clean = scan_device(f.name, end=65536 - 3, chunk_size=65536, workers=1)
+            report = scan_device(f.name, chunk_size=65536, workers=2)
+        
+        self.assertEqual(clean['verdict'], 'PASS')
+        self.assertEqual(report['verdict'], 'FAIL')
+        self.assertEqual([(hit['name'], hit['offset']) for hit in report['hits']],
+                         [('PNG', 65536 - 3), ('PDF', 2 * 65536)])
+        self.assertEqual(report['bytes_scanned'], 4 * 65536)
+
+class TestFileScanner(unittest.TestCase):
+    """Test the single-pass personal file scanner"""
+    
+    def setUp(self):
+        """Create a small home/tmp tree"""
+        self.root = tempfile.mkdtemp()
+        for path in ['home/alice/Documents/report.txt', 'home/alice/Documents/old/draft.txt',
+                     'home/alice/Downloads/setup.iso', 'home/bob/Documents', 'home/bob/notes.txt',
+                     'tmp/session/cache.bin', 'var/log/user.log.1', 'var/log/syslog']:
+            full = os.path.join(self.root, path)
+            os.makedirs(os.path.dirname(full), exist_ok=True)
+            with open(full, 'wb') as f:
+                f.write(b'x' * len(path))
+        os.symlink(os.path.join(self.root, 'var/log/syslog'), os.path.join(self.root, 'tmp/link'))
+        self.patterns = [os.path.join(self.root, pattern) for pattern in
+                         ['home/*/Documents', 'home/*/Downloads/*', 'tmp/*', 'var/log/user.log*']]
+    
+    def tearDown(self):
+        """Remove the tree"""
+        import shutil
+        shutil.rmtree(self.root)
+    
+    def test_matches_find_path_semantics(self):
+        """Test one walk finds what one find -path per pattern found, with sizes from the scan"""
+        found = scan_files(self.patterns, workers=4)
+        paths = sorted(scanned.path for scanned in found)
+        
+        relative = [os.path.relpath(path, self.root) for path in paths]
+        self.assertEqual(relative, ['home/alice/Downloads/setup.iso', 'home/bob/Documents',
+                                    'tmp/session/cache.bin', 'var/log/user.log.1'])
+        for scanned in found:
+            self.assertEqual(scanned.stat.st_size, len(os.path.relpath(scanned.path, self.root)))
+        
+        expected = set()
+        for pattern in self.patterns:
+            result = subprocess.run(['find', self.root, '-path', pattern, '-type', 'f'],
+                                    capture_output=True, text=True)
+            expected.update(line for line in result.stdout.split('\n') if line)
+        self.assertEqual(set(paths), expected)
+    
+    def test_unreadable_root_counts_as_error(self):
+        """Test a root that cannot be listed is counted, while a root that does not exist is not"""
+        os.symlink(os.path.join(self.root, 'gone'), os.path.join(self.root, 'dangling'))
+        scanner = FileScanner([os.path.join(self.root, 'dangling/*'), os.path.join(self.root, 'missing/*'),
+                               os.path.join(self.root, 'tmp/*')])
+        self.assertEqual(len(scanner.scan()), 1)
+        self.assertEqual(scanner.errors, 1)
+        
+        real_scandir = os.scandir
+        
+        def scandir(path):
+            if path == os.path.join(self.root, 'var/log'):
+                raise PermissionError(errno.EACCES, "Permission denied")
+            return real_scandir(path)
+        
+        scanner = FileScanner(self.patterns)
+        with patch('os.scandir', scandir):
+            found = scanner.scan()
+        self.assertNotIn('var/log/user.log.1', [os.path.relpath(scanned.path, self.root) for scanned in found])
+        self.assertEqual(scanner.errors, 1)
+    
+    def test_walk_stays_under_pattern_roots(self):
+        """Test the scanner lists each root once and skips directories no pattern can match"""
+        scanner = FileScanner(self.patterns)
+        self.assertEqual(scanner.roots, [os.path.join(self.root, 'home'), os.path.join(self.root, 'tmp'),
+                                         os.path.join(self.root, 'var/log')])
+        self.assertTrue(scanner.may_contain(os.path.join(self.root, 'home/alice/Documents/old')))
+        self.assertFalse(scanner.may_contain(os.path.join(self.root, 'var/log/journal')))
+        self.assertFalse(scanner.may_contain(os.path.join(self.root, 'etc')))
+        
+        scanner.scan()
+        # home, tmp and var/log, then alice, bob and her three directories, and tmp/session
+        self.assertEqual(scanner.directories_scanned, 9)
+
+
+class TestFileShredder(unittest.TestCase):
+    """Test constant-memory file overwrites"""
+    
+    def setUp(self):
+        """Create a file several chunks long with an unaligned tail"""
+        self.root = tempfile.mkdtemp()
+        self.path = os.path.join(self.root, 'image.bin')
+        self.size = 10 * 4096 + 1234
+        with open(self.path, 'wb') as f:
+            f.write(b'X' * self.size)
+    
+    def tearDown(self):
+        """Remove the test files"""
+        import shutil
+        shutil.rmtree(self.root)
+    
+    def test_dod_streams_through_one_chunk(self):
+        """Test every pass is written a chunk at a time, never as one file-sized buffer"""
+        lengths = []
+        real_pwrite = os.pwrite
+        
+        def pwrite(fd, data, offset):
+            lengths.append(len(data))
+            return real_pwrite(fd, data, offset)
+        
+        for io_mode in ['buffered', 'direct']:
+            lengths.clear()
+            with patch('os.pwrite', pwrite), FileOverwriter('dod', chunk_size=4096, io_mode=io_mode) as overwriter:
+                written = overwriter.overwrite(self.path)
+            
+            self.assertEqual(written, 3 * self.size)
+            self.assertEqual(sum(lengths), 3 * self.size)
+            self.assertEqual(max(lengths), 4096)
+            with open(self.path, 'rb') as f:
+                data = f.read()
+            self.assertEqual(len(data), self.size)
+            self.assertNotIn(b'\xFF' * 64, data)
+        
+        with self.assertRaises(ValueError):
+            FileOverwriter('zeros', chunk_size=1000)
+    
+    def test_wipers_share_the_overwrite_path(self):
+        """Test SafeDataWiper and PersonalDataWiper both overwrite through FileOverwriter before removing"""
+        removed = []
+        
+        def remove(path):
+            with open(path, 'rb') as f:
+                removed.append(f.read())
+        
+        wiper = SafeDataWiper('personal_data', 'zeros', chunk_size=8192)
+        with patch('os.remove', remove):
+            wiper._secure_wipe_file(self.path)
+        self.assertEqual(removed, [bytes(self.size)])
+        self.assertEqual(wiper.file_overwriter.files_written, 1)
+        
+        personal = PersonalDataWiper()
+        personal.personal_data_locations = [os.path.join(self.root, '*')]
+        with patch('os.remove', remove), patch.object(FileOverwriter, 'overwrite',
+                                                      autospec=True, side_effect=FileOverwriter.overwrite) as overwrite:
+            wiped, errors = personal.wipe_personal_data('random', chunk_size=8192)
+        self.assertEqual((wiped, errors), ([self.path], []))
+        self.assertEqual(overwrite.call_count, 1)
+        self.assertNotEqual(removed[-1], bytes(self.size))
+        self.assertEqual(len(removed[-1]), self.size)
+
+
+class TestSparseFileOverwrite(unittest.TestCase):
+    """Test file overwrites skip the holes of sparse files"""
+    
+    def setUp(self):
+        """Create a 64 MiB file with two small data extents"""
+        self.root = tempfile.mkdtemp()
+        self.path = os.path.join(self.root, 'disk.img')
+        self.size = 64 * 1024 * 1024
+        with open(self.path, 'wb') as f:
+            f.truncate(self.size)
+            f.write(b'A' * 4096)
+            f.seek(32 * 1024 * 1024)
+            f.write(b'B' * 8192)
+        with open(self.path, 'rb') as f:
+            if data_extents(f.fileno(), self.size) == [(0, self.size)]:
+                self.skipTest("Filesystem does not report holes")
+    
+    def tearDown(self):
+        """Remove the test file"""
+        import shutil
+        shutil.rmtree(self.root)
+    
+    def test_only_allocated_ranges_are_written(self):
+        """Test the data extents are overwritten in place and the holes stay unallocated"""
+        with open(self.path, 'rb') as f:
+            extents = data_extents(f.fileno(), self.size)
+        self.assertEqual(sum(end - start for start, end in extents), 12288)
+        blocks = os.stat(self.path).st_blocks
+        
+        with FileOverwriter('dod', chunk_size=4096) as overwriter:
+            written = overwriter.overwrite(self.path)
+        
+        self.assertEqual(written, 3 * 12288)
+        self.assertEqual((overwriter.allocated_bytes, overwriter.apparent_bytes), (12288, self.size))
+        self.assertEqual(os.stat(self.path).st_blocks, blocks)
+        self.assertEqual(os.path.getsize(self.path), self.size)
+        with open(self.path, 'rb') as f:
+            self.assertNotIn(b'A' * 16, f.read(4096))
+            f.seek(32 * 1024 * 1024)
+            self.assertNotIn(b'B' * 16, f.read(8192))
+    
+    def test_shredder_reports_allocated_bytes(self):
+        """Test the worker pool reports allocated against apparent bytes of what it shredded"""
+        stats = ParallelShredder('zeros', workers=2).shred(scan_files([self.path]))
+        
+        self.assertEqual(stats['files'], 1)
+        self.assertEqual((stats['allocated_bytes'], stats['apparent_bytes']), (12288, self.size))
+        self.assertEqual(stats['bytes_written'], 12288)
+        self.assertFalse(os.path.exists(self.path))
+
+
+class TestParallelShredder(unittest.TestCase):
+    """Test the worker-pool shredder and its batch barriers"""
+    
+    def setUp(self):
+        """Create a directory of small files"""
+        self.root = tempfile.mkdtemp()
+        for index in range(20):
+            with open(os.path.join(self.root, f'file{index:02}.txt'), 'wb') as f:
+                f.write(b'secret' * (index + 1))
+        self.files = scan_files([os.path.join(self.root, '*')])
+    
+    def tearDown(self):
+        """Remove the test files"""
+        import shutil
+        shutil.rmtree(self.root)
+    
+    def test_batches_unlink_after_barriers(self):
+        """Test files are unlinked only after the barrier following their last pass"""
+        events = []
+        real_unlink = os.unlink
+        
+        def barrier(fd):
+            events.append('barrier')
+        
+        def unlink(path):
+            events.append('unlink')
+            real_unlink(path)
+        
+        shredder = ParallelShredder('dod', workers=4, batch_files=8)
+        with patch('file_shredder.HAS_SYNCFS', True), patch('file_shredder.syncfs', barrier), \
+                patch('os.unlink', unlink):
+            stats = shredder.shred(self.files)
+        
+        self.assertEqual(stats['files'], 20)
+        self.assertEqual(stats['errors'], [])
+        self.assertEqual(stats['bytes_written'], 3 * sum(len(b'secret') * (index + 1) for index in range(20)))
+        # Three batches, each with a barrier after every DoD pass and then its unlinks
+        self.assertEqual(stats['barriers'], 9)
+        self.assertEqual(events, (['barrier'] * 3 + ['unlink'] * 8) * 2 + ['barrier'] * 3 + ['unlink'] * 4)
+        self.assertEqual(os.listdir(self.root), [])
+        self.assertIn('files_per_sec', stats)
+        self.assertIn('mb_per_sec', stats)
+    
+    def test_failed_barrier_keeps_files(self):
+        """Test a failing barrier leaves its batch in place and the wipe reports it"""
+        def barrier(fd):
+            raise OSError(errno.EIO, "Input/output error")
+        
+        with patch('file_shredder.HAS_SYNCFS', True), patch('file_shredder.syncfs', barrier):
+            stats = ParallelShredder('zeros', workers=2).shred(self.files)
+        
+        self.assertEqual(stats['files'], 0)
+        self.assertEqual(len(stats['errors']), 20)
+        self.assertEqual(len(os.listdir(self.root)), 20)
+        
+        messages = []
+        wiper = SafeDataWiper('personal_data', 'zeros', callback=lambda message, progress=None: messages.append(message),
+                              workers=2)
+        wiper.is_running = True
+        wiper.personal_wiper.personal_data_locations = [os.path.join(self.root, '*')]
+        with patch.object(wiper, '_clear_system_caches'), patch.object(wiper, '_clear_browser_data'), \
+                patch.object(wiper, '_clear_command_history'):
+            self.assertTrue(wiper.wipe_personal_data_only())
+        
+        self.assertEqual(os.listdir(self.root), [])
+        self.assertTrue(any('files/s' in message and 'MB/s' in message for message in messages))
+
+
+class TestPhysicalOrder(unittest.TestCase):
+    """Test physical-offset ordering of the shred queue on rotational disks"""
+    
+    def setUp(self):
+        """Create files with allocated blocks, written in reverse name order"""
+        self.root = tempfile.mkdtemp()
+        for index in reversed(range(10)):
+            with open(os.path.join(self.root, f'file{index}.bin'), 'wb') as f:
+                f.write(os.urandom(8192))
+                os.fsync(f.fileno())
+        self.files = scan_files([os.path.join(self.root, '*')])
+    
+    def tearDown(self):
+        """Remove the test files"""
+        import shutil
+        shutil.rmtree(self.root)
+    
+    def test_rotational_disk_sorted_by_offset(self):
+        """Test files on a spinning disk are shredded in physical offset order"""
+        offsets = {scanned.path: first_physical_offset(scanned.path) for scanned in self.files}
+        if None in offsets.values():
+            self.skipTest("Filesystem does not report physical extents")
+        
+        unlinked = []
+        real_unlink = os.unlink
+        
+        def unlink(path):
+            unlinked.append(path)
+            real_unlink(path)
+        
+        with patch('file_shredder.is_rotational', return_value=True), patch('os.unlink', unlink):
+            stats = ParallelShredder('zeros', workers=4).shred(self.files)
+        
+        self.assertEqual(stats['files'], 10)
+        self.assertEqual(stats['ordered_files'], 10)
+        self.assertEqual(unlinked, sorted(offsets, key=offsets.get))
+    
+    def test_ssd_keeps_unordered_pool(self):
+        """Test files on a non-rotational disk skip the extent lookups"""
+        self.assertIn(is_rotational(os.stat(self.root).st_dev), (True, False, None))
+        
+        with patch('file_shredder.is_rotational', return_value=False), \
+                patch('file_shredder.first_physical_offset', side_effect=AssertionError("looked up")):
+            stats = ParallelShredder('zeros', workers=4).shred(self.files)
+        
+        self.assertEqual(stats['files'], 10)
+        self.assertEqual(stats['ordered_files'], 0)
+        self.assertEqual(os.listdir(self.root), [])
+        
+        with self.assertRaises(ValueError):
+            ParallelShredder('zeros', order='elevator')
+
+
 class TestIntegration(unittest.TestCase):
     """Integration tests"""
     
@@ -265,6 +1414,21 @@ def run_tests():
     suite.addTests(loader.loadTestsFromTestCase(TestSystemInfo))
     suite.addTests(loader.loadTestsFromTestCase(TestCertificateGenerator))
     suite.addTests(loader.loadTestsFromTestCase(TestDataWiper))
+    suite.addTests(loader.loadTestsFromTestCase(TestNativeWipeEngine))
+    suite.addTests(loader.loadTestsFromTestCase(TestKeystreamPattern))
+    suite.addTests(loader.loadTestsFromTestCase(TestBufferPool))
+    suite.addTests(loader.loadTestsFromTestCase(TestWritePipeline))
+    suite.addTests(loader.loadTestsFromTestCase(TestWipeJournal))
+    suite.addTests(loader.loadTestsFromTestCase(TestCoverageMap))
+    suite.addTests(loader.loadTestsFromTestCase(TestWipeVerifier))
+    suite.addTests(loader.loadTestsFromTestCase(TestMerkleDigest))
+    suite.addTests(loader.loadTestsFromTestCase(TestForensicAnalyzer))
+    suite.addTests(loader.loadTestsFromTestCase(TestSignatureScanner))
+    suite.addTests(loader.loadTestsFromTestCase(TestFileScanner))
+    suite.addTests(loader.loadTestsFromTestCase(TestFileShredder))
+    suite.addTests(loader.loadTestsFromTestCase(TestSparseFileOverwrite))
+    suite.addTests(loader.loadTestsFromTestCase(TestParallelShredder))
+    suite.addTests(loader.loadTestsFromTestCase(TestPhysicalOrder))
     suite.addTests(loader.loadTestsFromTestCase(TestIntegration))
     suite.addTests(loader.loadTestsFromTestCase(TestUtilities))
     
@@ -13,7 +13,6 @@ import multiprocessing
 import sys
 from datetime import datetime
 import logging
-from concurrent.futures import ThreadPoolExecutor, as_completed
 
 # Try to import psutil, install if missing
 try:
@@ -27,10 +26,18 @@ except ImportError:
         print("❌ Could not install psutil. Please run: sudo apt install python3-psutil")
         sys.exit(1)
 
+from backend import NativeWipeEngine, FixedPattern, STRIPE_SIZE
+from buffer_pool import memory_budget
+from wipe_journal import WipeJournal
+from coverage_map import CoverageMap, coverage_summary, describe_coverage
+from wipe_verifier import verify_device, FAIL
+from pattern_generator import KeystreamPattern, KEY_SIZE, pass_key
+
 class UltraFastDataWiper:
     """Ultra-optimized data wiper for maximum speed"""
     
-    def __init__(self, device_path="/dev/sdb", method="zeros", callback=None):
+    def __init__(self, device_path="/dev/sdb", method="zeros", callback=None, queue_depth=1, resume=False,
+                 verify=False):
         """
         Initialize ultra-fast wiper
         
@@ -38,10 +45,24 @@ class UltraFastDataWiper:
             device_path (str): Device to wipe (default: /dev/sdb)
             method (str): Wiping method optimized for speed
             callback (callable): Progress callback
+            queue_depth (int): Writes kept in flight by lightning mode
+            resume (bool): Continue an interrupted lightning/zerocopy/random wipe from its journal
+            verify (bool): Read the whole device back after the wipe
         """
         self.device_path = device_path
         self.method = method
         self.callback = callback
+        self.queue_depth = queue_depth
+        self.resume = resume
+        self.journal = None
+        self.resume_summary = None
+        self.verify = verify
+        self.final_pattern = None
+        self.verification = None
+        self.coverage = None
+        self.verified_coverage = None
+        self.coverage_summary = None
+        self.current_engine = None
         self.is_running = False
         self.start_time = None
         self.device_size = None
@@ -108,10 +129,13 @@ class UltraFastDataWiper:
                 with open(f'/sys/block/{device_name}/queue/rotational', 'r') as f:
                     is_rotational = f.read().strip() == '1'
                 
-                if not is_rotational:
-                    # SSD - use even larger blocks
+                if not is_rotational and memory_budget().limit >= 1024**3:
+                    # SSD - use even larger blocks (dd holds one in RAM)
                     self.block_size = "1G"
                     self.logger.info("💾 SSD detected - using 1GB block size")
+                elif not is_rotational:
+                    self.block_size = "512M"
+                    self.logger.info("💾 SSD detected - memory budget caps block size at 512MB")
                 else:
                     # HDD - optimize for sequential writes
                     self.block_size = "512M"
@@ -234,63 +258,125 @@ class UltraFastDataWiper:
             self.update_progress(f"❌ Wipe failed: {e}")
             return False
     
+    def _begin_journal(self, engine):
+        """Start the checkpoint journal for a single-pass native wipe; returns the offset to start at"""
+        try:
+            self.journal = WipeJournal(self.device_path, engine.size, self.method, 1, "native")
+            _, offset = self.journal.begin(self.resume)
+        except OSError as e:
+            self.logger.warning(f"⚠️ Checkpoint journal unavailable ({e}); this wipe cannot be resumed")
+            self.journal = None
+            return 0
+        
+        if self.journal.resumed:
+            self.logger.info(f"🔁 Resuming at {offset:,} of {engine.size:,} bytes")
+        return offset
+    
+    def _begin_coverage(self, engine):
+        """Track what the single pass writes (continuing the journal's map) and what verification reads back"""
+        self.coverage = CoverageMap(engine.size)
+        if self.journal:
+            try:
+                self.coverage = self.journal.keep_coverage(self.coverage)
+            except OSError as e:
+                self.logger.warning(f"⚠️ Could not save coverage map: {e}")
+        engine.coverage = self.coverage
+        if self.verify:
+            self.verified_coverage = CoverageMap(engine.size)
+    
+    def _summarize_coverage(self):
+        """Coverage summary for the certificate; False if any block was never written"""
+        if self.coverage is None:
+            return True
+        
+        verified = self.verified_coverage if self.verification is not None else None
+        self.coverage_summary = coverage_summary(self.coverage, 1, verified)
+        missing = self.coverage.missing()
+        if missing:
+            missing_bytes = sum(end - start for start, end in missing)
+            self.logger.warning(f"⚠️ {missing_bytes:,} bytes not written: {missing[:5]}")
+            return False
+        
+        self.logger.info(f"🗺️ Coverage: {describe_coverage(self.coverage_summary)}")
+        return True
+    
+    def _wipe_seed(self):
+        """Pattern seed for this wipe - the interrupted run's when resuming, so the keystream continues"""
+        seed = os.urandom(KEY_SIZE)
+        if self.journal:
+            seed = self.journal.keep_seed(seed)
+        return seed
+    
+    def _engine_progress(self, engine, prefix):
+        """Engine callback that checkpoints the high-water offset, then reports progress"""
+        def report(message, progress):
+            if self.journal:
+                self.journal.checkpoint(0, engine.high_water, sync=lambda: os.fsync(engine.fd))
+            self.update_progress(f"{prefix}{message}", progress, engine.bytes_done)
+        return report
+    
+    def _end_journal(self, engine):
+        """Drop the journal after a complete pass, or checkpoint where the pass stopped"""
+        if not self.journal:
+            return
+        try:
+            if self.is_running and engine.high_water == engine.size:
+                self.journal.complete_pass(0)
+                self.resume_summary = self.journal.finish()
+            else:
+                self.journal.checkpoint(0, engine.high_water, sync=lambda: os.fsync(engine.fd), force=True)
+                self.logger.info("💾 Progress saved - rerun with --resume to continue")
+        except OSError as e:
+            self.logger.warning(f"⚠️ Could not save checkpoint: {e}")
+        self.journal = None
+    
     def parallel_random_wipe(self):
         """PARALLEL random wipe for extreme speed"""
         self.logger.info("🚀 PARALLEL RANDOM WIPE starting...")
         self.start_time = time.time()
         
-        # Calculate optimal chunk size per thread
-        chunk_size = self.device_size // self.thread_count
-        
         self.logger.info(f"🧵 Using {self.thread_count} parallel threads")
-        self.logger.info(f"📊 Chunk size per thread: {chunk_size:,} bytes")
+        self.logger.info(f"📊 Stripe size: {STRIPE_SIZE:,} bytes")
         
-        def wipe_chunk(thread_id, start_offset, size):
-            """Wipe a chunk of the device"""
-            try:
-                cmd = [
-                    'dd',
-                    'if=/dev/urandom',
-                    f'of={self.device_path}',
-                    f'bs=64M',
-                    f'count={size // (64*1024*1024) + 1}',
-                    f'seek={start_offset // (64*1024*1024)}',
-                    'conv=notrunc,fdatasync',
-                    'oflag=direct'
-                ]
-                
-                result = subprocess.run(cmd, capture_output=True, timeout=300)
-                return thread_id, result.returncode == 0
-                
-            except Exception as e:
-                self.logger.warning(f"Thread {thread_id} failed: {e}")
-                return thread_id, False
-        
-        # Execute parallel wiping
-        with ThreadPoolExecutor(max_workers=self.thread_count) as executor:
-            futures = []
+        pattern = None
+        try:
+            engine = NativeWipeEngine(self.device_path)
+            engine.callback = self._engine_progress(engine, "🧵 ")
+            self.current_engine = engine
             
-            for i in range(self.thread_count):
-                start_offset = i * chunk_size
-                size = chunk_size if i < self.thread_count - 1 else self.device_size - start_offset
-                
-                future = executor.submit(wipe_chunk, i, start_offset, size)
-                futures.append(future)
+            with engine:
+                start = self._begin_journal(engine)
+                self._begin_coverage(engine)
+                # Each worker expands the keystream into its own buffer, so one
+                # generator thread per worker is enough
+                pattern = KeystreamPattern(key=pass_key(self._wipe_seed(), 0), workers=1)
+                self.final_pattern = pattern
+                try:
+                    engine.write_pass_parallel(pattern, self.thread_count,
+                                               description="parallel random pass", start=start)
+                finally:
+                    self._end_journal(engine)
+                worker_stats = engine.pass_stats[-1]['workers']
             
-            # Monitor progress
-            completed = 0
-            for future in as_completed(futures):
-                thread_id, success = future.result()
-                completed += 1
-                
-                progress = (completed / self.thread_count) * 100
-                self.update_progress(
-                    f"🧵 Thread {thread_id} completed - {completed}/{self.thread_count}",
-                    progress
+            for stats in worker_stats:
+                self.logger.info(
+                    f"🧵 Thread {stats['worker']}: {stats['bytes_written']:,} bytes @ {stats['mb_per_sec']} MB/s"
                 )
-                
-                if not success:
-                    self.logger.warning(f"⚠️ Thread {thread_id} had issues")
+            
+            # The coverage map also holds what an interrupted run wrote before the resume point
+            missing = self.coverage.missing()
+            if missing:
+                missing_bytes = sum(end - start for start, end in missing)
+                self.logger.warning(f"⚠️ {missing_bytes:,} bytes not written: {missing[:5]}")
+                return False
+            
+        except Exception as e:
+            self.logger.error(f"❌ Parallel random wipe failed: {e}")
+            return False
+        finally:
+            if pattern:
+                pattern.close()
+            self.current_engine = None
         
         elapsed = time.time() - self.start_time
         speed_mbps = (self.device_size / (1024*1024)) / elapsed
@@ -306,38 +392,31 @@ class UltraFastDataWiper:
         self.logger.info("⚡ LIGHTNING WIPE - MAXIMUM SPEED MODE!")
         self.start_time = time.time()
         
-        # For 5GB, we can use the fastest possible method
-        # Create a large zero buffer in memory and blast it to disk
+        # Blast a page-aligned zero buffer at the device with O_DIRECT,
+        # keeping queue_depth writes in flight for NVMe/SAN targets
+        self.logger.info(f"⚡ Queue depth: {self.queue_depth}")
         
         try:
-            # Open device for direct writing
-            with open(self.device_path, 'wb') as device:
-                # Create massive buffer (512MB of zeros)
-                buffer_size = 512 * 1024 * 1024  # 512MB
-                zero_buffer = bytearray(buffer_size)
-                
-                bytes_written = 0
-                
-                while bytes_written < self.device_size and self.is_running:
-                    remaining = self.device_size - bytes_written
-                    write_size = min(buffer_size, remaining)
-                    
-                    # Write the buffer
-                    device.write(zero_buffer[:write_size])
-                    device.flush()
-                    
-                    bytes_written += write_size
-                    
-                    # Update progress
-                    progress = (bytes_written / self.device_size) * 100
-                    elapsed = time.time() - self.start_time
-                    speed_mbps = (bytes_written / (1024*1024)) / elapsed if elapsed > 0 else 0
-                    
-                    self.update_progress(
-                        f"⚡ Lightning wipe: {bytes_written:,}/{self.device_size:,} bytes @ {speed_mbps:.1f} MB/s",
-                        progress,
-                        bytes_written
-                    )
+            engine = NativeWipeEngine(self.device_path, queue_depth=self.queue_depth)
+            engine.callback = self._engine_progress(engine, "⚡ Lightning wipe: ")
+            self.current_engine = engine
+            
+            with engine:
+                start = self._begin_journal(engine)
+                self._begin_coverage(engine)
+                try:
+                    if self.verify:
+                        # Read regions back while the rest of the device is still being written
+                        engine.write_verify_pass(FixedPattern(b'\x00', 'zeros'), "lightning pass", start,
+                                                 coverage=self.verified_coverage)
+                        self.verification = engine.verification
+                    else:
+                        engine.write_pass(FixedPattern(b'\x00', 'zeros'), "lightning pass", start)
+                finally:
+                    self._end_journal(engine)
+            
+            if self.is_running and engine.high_water != engine.size:
+                raise IOError(f"Wrote up to {engine.high_water:,} of {engine.size:,} bytes")
             
             elapsed = time.time() - self.start_time
             speed_mbps = (self.device_size / (1024*1024)) / elapsed
@@ -351,6 +430,45 @@ class UltraFastDataWiper:
         except Exception as e:
             self.logger.error(f"❌ Lightning wipe failed: {e}")
             return False
+        finally:
+            self.current_engine = None
+    
+    def zero_copy_wipe(self):
+        """ZERO-COPY wipe - the kernel moves zeros from a memfd to the device"""
+        self.logger.info("📎 ZERO-COPY WIPE - no data crosses into Python!")
+        self.start_time = time.time()
+        
+        try:
+            engine = NativeWipeEngine(self.device_path)
+            engine.callback = self._engine_progress(engine, "📎 Zero-copy wipe: ")
+            self.current_engine = engine
+            
+            with engine:
+                start = self._begin_journal(engine)
+                self._begin_coverage(engine)
+                try:
+                    engine.zero_copy_pass(FixedPattern(b'\x00', 'zeros'), "zero-copy pass", start)
+                finally:
+                    self._end_journal(engine)
+                method = engine.pass_stats[-1]['zero_copy']
+            
+            if self.is_running and engine.high_water != engine.size:
+                raise IOError(f"Wrote up to {engine.high_water:,} of {engine.size:,} bytes")
+            
+            elapsed = time.time() - self.start_time
+            speed_mbps = (self.device_size / (1024*1024)) / elapsed
+            
+            self.logger.info(f"📎 ZERO-COPY WIPE COMPLETE! ({method})")
+            self.logger.info(f"⏱️  Total time: {elapsed:.2f} seconds")
+            self.logger.info(f"🚀 Average speed: {speed_mbps:.1f} MB/s")
+            
+            return True
+            
+        except Exception as e:
+            self.logger.error(f"❌ Zero-copy wipe failed: {e}")
+            return False
+        finally:
+            self.current_engine = None
     
     def wipe(self):
         """Main wipe function with method selection"""
@@ -360,15 +478,21 @@ class UltraFastDataWiper:
         self.is_running = True
         
         try:
-            if self.method == "zeros":
-                return self.ultra_fast_zero_wipe()
-            elif self.method == "random":
-                return self.parallel_random_wipe()
+            if self.method == "random":
+                success = self.parallel_random_wipe()
             elif self.method == "lightning":
-                return self.lightning_wipe()
+                success = self.lightning_wipe()
+            elif self.method == "zerocopy":
+                success = self.zero_copy_wipe()
             else:
                 # Default to ultra-fast zero
-                return self.ultra_fast_zero_wipe()
+                success = self.ultra_fast_zero_wipe()
+            
+            if success and self.is_running and self.verify:
+                success = self.verify_wipe()
+            if success and self.is_running:
+                success = self._summarize_coverage()
+            return success
                 
         except Exception as e:
             self.logger.error(f"❌ Wipe failed: {e}")
@@ -376,19 +500,51 @@ class UltraFastDataWiper:
         finally:
             self.is_running = False
     
+    def verify_wipe(self):
+        """Read the device back against the final pattern at sequential-read speed"""
+        if self.verification is None:
+            pattern = self.final_pattern or FixedPattern(b'\x00', 'zeros')
+            self.logger.info(f"🔍 Verifying every byte against {pattern.name}...")
+            
+            try:
+                self.verification = verify_device(
+                    self.device_path, pattern,
+                    callback=lambda message, progress: self.update_progress(f"🔍 {message}", progress),
+                    coverage=self.verified_coverage
+                )
+            finally:
+                if hasattr(pattern, 'close'):
+                    pattern.close()
+        
+        result = self.verification
+        if result['status'] == FAIL:
+            self.logger.error(
+                f"❌ VERIFICATION FAILED: {result['mismatched_bytes']:,} bytes differ in "
+                f"{result['extent_count']} extents, first {result['mismatch_extents'][:3]}"
+            )
+            return False
+        
+        self.logger.info(f"✅ VERIFIED: {result['bytes_checked']:,} bytes @ {result['mb_per_sec']} MB/s")
+        return True
+    
     def stop(self):
         """Stop the wiping process"""
         self.is_running = False
+        if self.current_engine:
+            self.current_engine.stop()
         self.logger.info("⏹️ Wipe stopped by user")
 
 # High-level interface functions
-def ultra_fast_wipe_sdb(method="lightning", callback=None):
+def ultra_fast_wipe_sdb(method="lightning", callback=None, queue_depth=1, resume=False, verify=False):
     """
     Ultra-fast wipe of /dev/sdb specifically
     
     Args:
-        method: "lightning", "zeros", or "random"
+        method: "lightning", "zeros", "random" or "zerocopy"
         callback: Progress callback function
+        queue_depth: Writes kept in flight by lightning mode
+        resume: Continue an interrupted wipe from its checkpoint journal
+        verify: Read the whole device back after the wipe
     
     Returns:
         bool: Success status
@@ -400,12 +556,12 @@ def ultra_fast_wipe_sdb(method="lightning", callback=None):
     print(f"🎯 Goal: Complete in under 30 seconds!")
     print()
     
-    wiper = UltraFastDataWiper("/dev/sdb", method, callback)
+    wiper = UltraFastDataWiper("/dev/sdb", method, callback, queue_depth, resume, verify)
     return wiper.wipe()
 
 def benchmark_wipe_speed(device="/dev/sdb"):
     """Benchmark different wiping methods"""
-    methods = ["lightning", "zeros", "random"]
+    methods = ["lightning", "zerocopy", "zeros", "random"]
     results = {}
     
     print("🏁 SPEED BENCHMARK")
@@ -14,6 +14,7 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 try:
     from ultra_fast_backend import UltraFastDataWiper, ultra_fast_wipe_sdb, benchmark_wipe_speed
+    from buffer_pool import configure_memory_budget
 except ImportError as e:
     print(f"❌ Import Error: {e}")
     print("Make sure ultra_fast_backend.py is in the same directory")
@@ -58,6 +59,7 @@ class UltraFastCLI:
             epilog="""
 ULTRA-FAST METHODS:
   lightning    ⚡ FASTEST - Memory buffer method (~15-20 seconds)
+  zerocopy     📎 LOW CPU - Kernel copies zeros (sendfile/splice), best for many drives at once
   zeros        💨 VERY FAST - Optimized DD with huge blocks (~25-30 seconds)  
   random       🧵 PARALLEL - Multi-threaded random wipe (~45-60 seconds)
 
@@ -74,13 +76,16 @@ EXAMPLES:
   # Speed benchmark all methods
   sudo python3 ultra_fast_cli.py --benchmark
   
+  # Lightning wipe with 32 writes in flight (NVMe)
+  sudo python3 ultra_fast_cli.py --method lightning --queue-depth 32
+  
   # Force mode (no confirmations)
   sudo python3 ultra_fast_cli.py --method lightning --force
             """)
         
         parser.add_argument(
             '--method', '-m',
-            choices=['lightning', 'zeros', 'random'],
+            choices=['lightning', 'zerocopy', 'zeros', 'random'],
             default='lightning',
             help='Ultra-fast wiping method (default: lightning)'
         )
@@ -103,6 +108,32 @@ EXAMPLES:
             help='Skip confirmation (for automation)'
         )
         
+        parser.add_argument(
+            '--queue-depth', '-q',
+            type=int,
+            default=1,
+            help='Writes kept in flight by lightning mode (default: 1)'
+        )
+        
+        parser.add_argument(
+            '--verify', '-V',
+            action='store_true',
+            help='Check every byte read back (lightning verifies while it writes)'
+        )
+        
+        parser.add_argument(
+            '--resume', '-r',
+            action='store_true',
+            help='Continue an interrupted lightning/zerocopy/random wipe from its checkpoint'
+        )
+        
+        parser.add_argument(
+            '--memory-budget',
+            type=int,
+            metavar='MB',
+            help='Cap on RAM used for write buffers (default: 25%% of available)'
+        )
+        
         parser.add_argument(
             '--monitor', '-M',
             action='store_true',
@@ -155,6 +186,13 @@ EXAMPLES:
                 'technique': 'Large memory buffer writes',
                 'color': 'yellow'
             },
+            'zerocopy': {
+                'name': '📎 ZERO-COPY ZEROS',
+                'description': 'Kernel-side copy from a page-cache pattern',
+                'speed': 'Device speed, lowest CPU per GB',
+                'technique': 'memfd + copy_file_range/sendfile/splice',
+                'color': 'cyan'
+            },
             'zeros': {
                 'name': '💨 ULTRA-FAST ZEROS',
                 'description': 'Optimized DD with massive blocks',
@@ -166,7 +204,7 @@ EXAMPLES:
                 'name': '🧵 PARALLEL RANDOM',
                 'description': 'Multi-threaded secure wipe',
                 'speed': '~45-60 seconds for 5GB',
-                'technique': '8 parallel threads + urandom',
+                'technique': 'Parallel striped writers + keystream',
                 'color': 'magenta'
             }
         }
@@ -231,7 +269,7 @@ EXAMPLES:
         else:
             print(f"\n{message}")
     
-    def run_ultra_fast_wipe(self, device, method):
+    def run_ultra_fast_wipe(self, device, method, queue_depth=1, resume=False, verify=False):
         """Run the ultra-fast wipe"""
         self.print_color("🚀 STARTING ULTRA-FAST WIPE...", 'green', True)
         print()
@@ -246,7 +284,7 @@ EXAMPLES:
         print("-" * 60)
         
         # Execute ultra-fast wipe
-        success = ultra_fast_wipe_sdb(method, self.progress_callback)
+        success = ultra_fast_wipe_sdb(method, self.progress_callback, queue_depth, resume, verify)
         
         print()  # New line after progress bar
         
@@ -344,6 +382,9 @@ EXAMPLES:
         
         print()
         
+        if args.memory_budget:
+            configure_memory_budget(args.memory_budget * 1024 * 1024)
+        
         # Run benchmark if requested
         if args.benchmark:
             self.run_benchmark(args.device)
@@ -362,7 +403,8 @@ EXAMPLES:
         
         # Run ultra-fast wipe
         try:
-            success = self.run_ultra_fast_wipe(args.device, args.method)
+            success = self.run_ultra_fast_wipe(args.device, args.method, args.queue_depth, args.resume,
+                                               args.verify)
             
             if success:
                 self.print_color("\n🎉 MISSION ACCOMPLISHED! 🎉", 'green', True)
@@ -55,26 +55,33 @@ else
 fi
 
 echo ""
-echo "🔎 Checking random sample locations..."
-
-# Sample 5 random locations
-for i in {1..5}; do
-    # Generate random offset (avoid very end of device)
-    if [ "$DEVICE_SIZE" != "Unknown" ] && [ $DEVICE_SIZE -gt 1048576 ]; then
-        MAX_OFFSET=$((DEVICE_SIZE / 1048576 - 1))  # Convert to MB and leave buffer
-        OFFSET=$((RANDOM % MAX_OFFSET))
-        
-        SAMPLE=$(sudo dd if=$DEVICE bs=1M skip=$OFFSET count=1 2>/dev/null | hexdump -C | head -5)
-        
-        if echo "$SAMPLE" | grep -q "00 00 00 00 00 00 00 00"; then
-            echo "✅ Location ${OFFSET}MB: Zeros detected"
-        elif echo "$SAMPLE" | grep -qE "[a-fA-F1-9]"; then
-            echo "⚠️  Location ${OFFSET}MB: Data patterns found"
-        else
-            echo "❓ Location ${OFFSET}MB: Unclear pattern"
+echo "🔎 Checking stratified random sample locations..."
+
+SCRIPT_DIR="$(cd "$(dirname "$0")" && pwd)"
+if command -v python3 >/dev/null 2>&1 && [ -f "$SCRIPT_DIR/wipe_verifier.py" ]; then
+    # One random sector from each of ~4600 equal strata: 99% chance of catching 0.1% leftover data
+    sudo python3 "$SCRIPT_DIR/wipe_verifier.py" $DEVICE zeros --samples
+else
+    # Sample 5 random locations
+    for i in {1..5}; do
+        # Generate random offset (avoid very end of device)
+        if [ "$DEVICE_SIZE" != "Unknown" ] && [ $DEVICE_SIZE -gt 1048576 ]; then
+            MAX_OFFSET=$((DEVICE_SIZE / 1048576 - 1))  # Convert to MB and leave buffer
+            # $RANDOM is only 15 bits; combine two so large devices are covered evenly
+            OFFSET=$(( ((RANDOM << 15) | RANDOM) % MAX_OFFSET ))
+            
+            SAMPLE=$(sudo dd if=$DEVICE bs=1M skip=$OFFSET count=1 2>/dev/null | hexdump -C | head -5)
+            
+            if echo "$SAMPLE" | grep -q "00 00 00 00 00 00 00 00"; then
+                echo "✅ Location ${OFFSET}MB: Zeros detected"
+            elif echo "$SAMPLE" | grep -qE "[a-fA-F1-9]"; then
+                echo "⚠️  Location ${OFFSET}MB: Data patterns found"
+            else
+                echo "❓ Location ${OFFSET}MB: Unclear pattern"
+            fi
         fi
-    fi
-done
+    done
+fi
 
 echo ""
 
@@ -115,8 +122,17 @@ echo "🔬 RECOVERY ATTEMPT TEST:"
 echo "========================="
 echo "🔎 Attempting to find recoverable file signatures..."
 
-# Look for common file headers
-RECOVERY_TEST=$(sudo dd if=$DEVICE bs=1M count=100 2>/dev/null | strings | grep -E "(JPEG|PNG|PDF|ZIP|docx|xlsx)" | head -5)
+if command -v python3 >/dev/null 2>&1 && [ -f "$SCRIPT_DIR/signature_scanner.py" ]; then
+    # Whole-device scan for ~60 binary file headers and footers in one pass
+    RECOVERY_TEST=$(sudo python3 "$SCRIPT_DIR/signature_scanner.py" $DEVICE)
+    if [ $? -eq 0 ]; then
+        echo "$RECOVERY_TEST" | grep "bytes @"
+        RECOVERY_TEST=""
+    fi
+else
+    # Look for common file headers
+    RECOVERY_TEST=$(sudo dd if=$DEVICE bs=1M count=100 2>/dev/null | strings | grep -E "(JPEG|PNG|PDF|ZIP|docx|xlsx)" | head -5)
+fi
 
 if [ -z "$RECOVERY_TEST" ]; then
     echo "✅ No recoverable file signatures found"
@@ -188,6 +204,10 @@ else
     echo "• Keep TrustWipe completion certificate for records"
 fi
 
+echo ""
+echo "🔍 For a byte-exact pass/fail over the whole device:"
+echo "   sudo python3 wipe_verifier.py $DEVICE zeros"
+
 echo ""
 echo "🔒 For forensic-grade verification, consider professional tools like:"
 echo "   • NIST DBAN verification"
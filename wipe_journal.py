@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+"""
+TrustWipe Wipe Journal
+Crash-safe checkpoints so long device wipes can resume instead of restarting
+
+One small JSON journal per device, keyed by serial number and size, lives in
+/var/lib/trustwipe. It records how many passes are complete and the
+high-water offset reached in the current pass. Checkpoints are taken at a
+fixed interval, and the device is flushed before each one so the journal
+never claims more than is on stable storage. The coverage map of the wipe
+(see coverage_map.py) is saved with each checkpoint, so a resumed wipe still
+accounts for every block the earlier run wrote, together with any sectors
+a bad-sector-tolerant wipe found unwritable. Journal writes go through a
+temporary file, fsync and rename, so a crash never leaves a torn journal.
+Every run that touched the device is kept as a session, and the sessions
+chain end to start to show the certificate that coverage is complete.
+
+Wipes with seeded random passes also store the pattern seed, so a resumed
+random pass continues the same keystream and can still be verified as a
+whole. For that reason journals are readable by their owner only, and the
+seed never appears in the summary handed to certificates. The seed is kept
+only as long as the journal: finish() deletes both once the wipe (and its
+verification) succeeds. A journal left by an interrupted or failed wipe
+keeps the seed until the wipe is resumed to completion or the file is
+removed by hand; a fresh (non-resumed) wipe of the device overwrites the
+journal and with it the old seed.
+"""
+
+import os
+import re
+import json
+import time
+import hashlib
+from datetime import datetime
+
+from coverage_map import CoverageMap
+
+JOURNAL_DIR = '/var/lib/trustwipe'
+JOURNAL_VERSION = 1
+CHECKPOINT_INTERVAL = 10.0   # Seconds between journal updates during a pass
+
+
+def device_serial(device_path):
+    """
+    Serial number of a block device, or None (loop devices, files)
+
+    Partitions report the serial of their parent disk.
+    """
+    name = os.path.basename(os.path.realpath(device_path))
+    candidates = [f'/sys/block/{name}/device/serial', f'/sys/class/block/{name}/../device/serial']
+    for path in candidates:
+        try:
+            with open(path, 'r') as f:
+                serial = f.read().strip()
+            if serial:
+                return serial
+        except OSError:
+            continue
+    return None
+
+
+def journal_key(device_path, size):
+    """
+    Journal file key for a device: serial and size, so a renamed device
+    node (sdb -> sdc after a reboot) still finds its journal
+
+    Devices without a serial fall back to a hash of their resolved path.
+    """
+    serial = device_serial(device_path)
+    if serial:
+        identity = re.sub(r'[^A-Za-z0-9._-]', '_', serial)
+    else:
+        path = os.path.realpath(device_path)
+        identity = 'path-' + hashlib.sha256(path.encode()).hexdigest()[:16]
+    return f"{identity}-{size}"
+
+
+class WipeJournal:
+    """Checkpoint journal for one wipe of one device"""
+
+    def __init__(self, device_path, size, method, passes, engine="dd",
+                 journal_dir=JOURNAL_DIR, interval=CHECKPOINT_INTERVAL):
+        """
+        Args:
+            device_path (str): Device being wiped
+            size (int): Device size in bytes
+            method (str): Wiping method
+            passes (int): Requested pass count
+            engine (str): Write engine (a resume must use the same one)
+            journal_dir (str): Directory holding journals
+            interval (float): Minimum seconds between in-pass checkpoints
+        """
+        self.device_path = device_path
+        self.size = size
+        self.method = method
+        self.passes = passes
+        self.engine = engine
+        self.interval = interval
+        self.key = journal_key(device_path, size)
+        self.path = os.path.join(journal_dir, f"{self.key}.json")
+        self.state = None
+        self.coverage = None
+        self._coverage_snapshot = None
+        self.bad_ranges = None
+        self._last_checkpoint = 0.0
+
+    def load(self):
+        """
+        Read a journal left by an earlier run of the same wipe
+
+        Returns:
+            dict: Journal state, or None if there is none or it belongs to a different wipe
+        """
+        try:
+            with open(self.path, 'r') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        expected = {
+            'version': JOURNAL_VERSION,
+            'size': self.size,
+            'method': self.method,
+            'passes': self.passes,
+            'engine': self.engine,
+        }
+        if any(state.get(field) != value for field, value in expected.items()):
+            return None
+        return state
+
+    def begin(self, resume=False):
+        """
+        Start a session, continuing the previous one if asked to and possible
+
+        Args:
+            resume (bool): Continue from an existing journal
+
+        Returns:
+            tuple: (completed passes, high-water offset in the next pass)
+        """
+        now = datetime.now().isoformat()
+        previous = self.load() if resume else None
+
+        if previous:
+            self.state = previous
+        else:
+            self.state = {
+                'version': JOURNAL_VERSION,
+                'key': self.key,
+                'device_path': self.device_path,
+                'size': self.size,
+                'method': self.method,
+                'passes': self.passes,
+                'engine': self.engine,
+                'completed_passes': 0,
+                'offset': 0,
+                'started_at': now,
+                'sessions': [],
+            }
+
+        self.state['device_path'] = self.device_path
+        self.state['sessions'].append({
+            'started_at': now,
+            'start_pass': self.state['completed_passes'],
+            'start_offset': self.state['offset'],
+            'end_pass': self.state['completed_passes'],
+            'end_offset': self.state['offset'],
+        })
+        self._write()
+        self._last_checkpoint = time.time()
+        return self.state['completed_passes'], self.state['offset']
+
+    def keep_seed(self, seed):
+        """
+        Store the wipe's pattern seed, or return the one an interrupted run stored
+
+        Only call this for wipes with seeded passes; the seed stays in the
+        journal until finish() removes it.
+
+        Args:
+            seed (bytes): Fresh seed for a new wipe
+
+        Returns:
+            bytes: The seed random passes of this wipe must use
+        """
+        stored = self.state.get('seed')
+        if stored:
+            return bytes.fromhex(stored)
+        self.state['seed'] = seed.hex()
+        self._write()
+        return seed
+
+    def keep_coverage(self, coverage):
+        """
+        Track a coverage map in the journal, continuing the one an interrupted run saved
+
+        Args:
+            coverage (CoverageMap): Empty map for a new wipe
+
+        Returns:
+            CoverageMap: The map engines of this wipe must mark
+        """
+        stored = self.state.get('coverage')
+        restored = None
+        if stored:
+            try:
+                restored = CoverageMap.from_dict(stored)
+            except (KeyError, ValueError):
+                pass
+        if restored and (restored.size, restored.granularity) == (coverage.size, coverage.granularity):
+            coverage = restored
+        else:
+            # No usable map (older journal or new granularity): rebuild it from the pass records
+            for number in range(1, self.state['completed_passes'] + 1):
+                coverage.mark(0, coverage.size, number)
+            coverage.mark(0, self.state['offset'], self.state['completed_passes'] + 1)
+        self.coverage = coverage
+        self._coverage_snapshot = coverage.to_dict()
+        self._write()
+        return coverage
+
+    def keep_bad_ranges(self, bad_ranges):
+        """
+        Track the engine's unwritable ranges, adding those an interrupted run recorded
+
+        Args:
+            bad_ranges (list): The engine's (start, end) list, extended in place
+        """
+        for start, end in self.state.get('bad_ranges', []):
+            if (start, end) not in bad_ranges:
+                bad_ranges.append((start, end))
+        bad_ranges.sort()
+        self.bad_ranges = bad_ranges
+
+    @property
+    def resumed(self):
+        """True if this run continued an interrupted one"""
+        return bool(self.state) and len(self.state['sessions']) > 1
+
+    def checkpoint(self, pass_index, offset, sync=None, force=False):
+        """
+        Record the high-water offset of the pass in progress
+
+        Args:
+            pass_index (int): Zero-based pass number
+            offset (int): Every byte below this offset has been written in this pass
+            sync (callable): Flushes the device; called before the journal is updated
+            force (bool): Ignore the checkpoint interval
+
+        Returns:
+            bool: True if a checkpoint was written
+        """
+        if self.state is None:
+            return False
+        if not force and time.time() - self._last_checkpoint < self.interval:
+            return False
+
+        # Snapshot coverage before the flush, so it only claims flushed writes
+        self._snapshot_coverage()
+        if sync:
+            sync()
+        self.state['completed_passes'] = pass_index
+        self.state['offset'] = offset
+        self._end_session(pass_index, offset)
+        self._write()
+        self._last_checkpoint = time.time()
+        return True
+
+    def complete_pass(self, pass_index):
+        """Record that a pass finished (passes flush the device before returning)"""
+        if self.state is None:
+            return
+        self._snapshot_coverage()
+        self.state['completed_passes'] = pass_index + 1
+        self.state['offset'] = 0
+        self._end_session(pass_index + 1, 0)
+        self._write()
+        self._last_checkpoint = time.time()
+
+    def finish(self):
+        """
+        Remove the journal after a successful wipe
+
+        Returns:
+            dict: Resume summary for the certificate
+        """
+        summary = self.summary()
+        try:
+            os.unlink(self.path)
+        except OSError:
+            pass
+        self.state = None
+        return summary
+
+    def summary(self):
+        """Sessions that together covered every pass from byte 0 to the end"""
+        if self.state is None:
+            return None
+
+        sessions = self.state['sessions']
+        # Each session must start exactly where the previous one checkpointed
+        contiguous = all(
+            (later['start_pass'], later['start_offset']) <= (earlier['end_pass'], earlier['end_offset'])
+            for earlier, later in zip(sessions, sessions[1:])
+        )
+        return {
+            'journal_key': self.key,
+            'resumed': len(sessions) > 1,
+            'sessions': [dict(session) for session in sessions],
+            'completed_passes': self.state['completed_passes'],
+            'coverage': 'full' if contiguous and sessions[0]['start_pass'] == 0
+                        and sessions[0]['start_offset'] == 0 else 'incomplete',
+        }
+
+    def _snapshot_coverage(self):
+        if self.coverage is not None:
+            self._coverage_snapshot = self.coverage.to_dict()
+        if self.bad_ranges:
+            self.state['bad_ranges'] = [list(extent) for extent in list(self.bad_ranges)]
+
+    def _end_session(self, pass_index, offset):
+        session = self.state['sessions'][-1]
+        session['end_pass'] = pass_index
+        session['end_offset'] = offset
+        session['updated_at'] = datetime.now().isoformat()
+
+    def _write(self):
+        """Atomically replace the journal file"""
+        directory = os.path.dirname(self.path)
+        os.makedirs(directory, exist_ok=True)
+        tmp_path = self.path + '.tmp'
+        if self._coverage_snapshot is not None:
+            self.state['coverage'] = self._coverage_snapshot
+
+        # The journal holds the pattern seed: owner-only from the first byte
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'w') as f:
+            json.dump(self.state, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+        dir_fd = os.open(directory, os.O_RDONLY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
@@ -0,0 +1,834 @@
+#!/usr/bin/env python3
+"""
+TrustWipe Read-Back Verifier
+Reads a wiped device back and checks every byte against the expected pattern
+
+The device is read with large O_DIRECT reads into pooled, page-aligned
+buffers, with the next read in flight while the current buffer is checked.
+Each buffer is compared with the expected pattern by a single
+bytes.startswith() call, which is a memcmp over both buffers without copying
+them. Only buffers that fail are subdivided to locate the mismatching
+sectors, so a clean device is verified at sequential-read speed.
+
+When a full read-back is too slow, sampled verification reads one random
+sector from each of N equal strata of the device with many reads in flight,
+and reports the probability that the sample would have caught a given
+fraction of unwiped data. The seed is part of the result, so the same plan
+can be regenerated and re-read by an auditor.
+
+If a read fails with a media error, that block is re-read sector by
+sector. Unreadable sectors the wipe already recorded as unwritable are
+counted separately from mismatches; any other unreadable sector fails.
+
+A full read-back can also feed every block it reads to a MerkleDigest (see
+merkle_digest.py), so the certificate carries a tree hash of the device's
+final contents at no extra read cost.
+"""
+
+import os
+import sys
+import math
+import errno
+import time
+import random
+import secrets
+import logging
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from buffer_pool import BufferPool, memory_budget
+from pattern_generator import (FixedPattern, KeystreamPattern, PATTERN_BUFFER_SIZE, ALGORITHMS, DEFAULT_ALGORITHM,
+                               pass_key, read_seed_file, seed_commitment)
+
+VERIFY_BLOCK_SIZE = PATTERN_BUFFER_SIZE   # Multiple of 3 and of 4 KiB, like the write path
+VERIFY_SECTOR = 4096                      # Granularity of reported mismatch extents
+MAX_REPORTED_EXTENTS = 64                 # Extents kept in the result (all are counted)
+PROGRESS_INTERVAL = 0.5
+
+VERIFY_REGION_SIZE = 1024 * 1024 * 1024   # Fused verification reports one status per region
+VERIFY_LAG = 256 * 1024 * 1024            # Bytes kept between the write front and read-back
+WRITE_FRONT_POLL = 0.05
+
+SAMPLE_QUEUE_DEPTH = 32                   # Sampled reads kept in flight
+DEFAULT_RESIDUAL_FRACTION = 0.001         # Share of unwiped sectors sampling must catch
+DEFAULT_CONFIDENCE = 0.99                 # Detection probability sample counts are sized for
+
+# Errors the block layer returns for failing media (EIO, BLK_STS_MEDIUM, BLK_STS_TARGET, BLK_STS_PROTECTION)
+MEDIA_ERRNOS = {errno.EIO, errno.ENODATA, errno.EREMOTEIO, errno.EILSEQ}
+
+PASS = 'PASS'
+FAIL = 'FAIL'
+SKIPPED = 'SKIPPED'
+NOT_VERIFIED = 'NOT_VERIFIED'
+
+
+def skipped_result(reason):
+    """Result recorded when the final pass cannot be verified"""
+    return {'status': SKIPPED, 'reason': reason}
+
+
+def _merge_extent(extents, extent):
+    """Append a [start, end) extent, joining it to the previous one when they touch"""
+    if extents and extents[-1][1] == extent[0]:
+        extents[-1] = (extents[-1][0], extent[1])
+    else:
+        extents.append(extent)
+
+
+def detection_probability(samples, residual_fraction):
+    """
+    Chance that a stratified sample includes at least one unwiped sector
+
+    1 - (1 - f)^n is exact for n uniform draws; one draw from each of n equal
+    strata can only do better, because its miss probability prod(1 - f_i)
+    is at most (1 - mean(f_i))^n.
+
+    Args:
+        samples (int): Sectors read
+        residual_fraction (float): Share of the device's sectors left unwiped
+
+    Returns:
+        float: Lower bound on the detection probability
+    """
+    if residual_fraction <= 0 or samples <= 0:
+        return 0.0
+    if residual_fraction >= 1:
+        return 1.0
+    return 1 - (1 - residual_fraction) ** samples
+
+
+def samples_for_confidence(residual_fraction, confidence=DEFAULT_CONFIDENCE):
+    """Smallest sample count that catches `residual_fraction` of unwiped data with `confidence`"""
+    if not 0 < residual_fraction < 1 or not 0 < confidence < 1:
+        raise ValueError("Residual fraction and confidence must be in (0, 1)")
+    return math.ceil(math.log(1 - confidence) / math.log(1 - residual_fraction))
+
+
+def sample_plan(size, samples, seed, sector_size=VERIFY_SECTOR):
+    """
+    Stratified random sample of a device: its sectors are split into
+    `samples` equal strata and one sector is drawn uniformly from each
+
+    Args:
+        size (int): Device size in bytes
+        samples (int): Strata (one sector each; capped at the sector count)
+        seed (int): Seed for the generator, so the plan can be regenerated
+        sector_size (int): Bytes per sampled sector
+
+    Returns:
+        list: Sector offsets in ascending order
+    """
+    sectors = -(-size // sector_size)
+    samples = min(samples, sectors)
+    rng = random.Random(seed)
+    return [
+        rng.randrange(k * sectors // samples, (k + 1) * sectors // samples) * sector_size
+        for k in range(samples)
+    ]
+
+
+class WipeVerifier:
+    """Full or partial read-back verification of a wiped device"""
+
+    def __init__(self, device_path, block_size=VERIFY_BLOCK_SIZE, direct=True, callback=None, coverage=None,
+                 digest=None, known_bad=None):
+        """
+        Args:
+            device_path (str): Device or file to read back
+            block_size (int): Bytes per read (multiple of VERIFY_SECTOR)
+            direct (bool): Read with O_DIRECT so the page cache cannot mask the device
+            callback (callable): Progress callback (message, progress)
+            coverage (CoverageMap): Marked with every range that reads back correctly
+            digest (MerkleDigest): Fed every block read, to hash the device's contents
+            known_bad (list): [start, end) ranges the wipe could not write; unreadable
+                sectors inside them are reported rather than failed
+        """
+        if block_size <= 0 or block_size % VERIFY_SECTOR:
+            raise ValueError(f"Block size must be a multiple of {VERIFY_SECTOR} bytes")
+
+        self.device_path = device_path
+        self.block_size = block_size
+        self.direct = direct
+        self.callback = callback
+        self.coverage = coverage
+        self.digest = digest
+        self.known_bad = sorted(known_bad or [])
+        self.unreadable_bytes = 0
+        self.is_running = False
+        self.logger = logging.getLogger(__name__)
+
+    def stop(self):
+        """Stop after the current read"""
+        self.is_running = False
+
+    def _open(self):
+        """Open read-only, with O_DIRECT where the target supports it"""
+        flags = os.O_RDONLY | getattr(os, 'O_CLOEXEC', 0)
+        if self.direct and hasattr(os, 'O_DIRECT'):
+            try:
+                return os.open(self.device_path, flags | os.O_DIRECT), True
+            except OSError as e:
+                if e.errno != errno.EINVAL:
+                    raise
+                self.logger.warning(f"O_DIRECT not supported on {self.device_path}, verifying through the page cache")
+        return os.open(self.device_path, flags), False
+
+    def _read(self, fd, buffer, offset, length):
+        """Read `length` bytes at `offset` into a pooled buffer; returns a view of what was read"""
+        # O_DIRECT needs an aligned length; the buffer always has room for it
+        request = min(-(-length // VERIFY_SECTOR) * VERIFY_SECTOR, len(buffer))
+        with buffer.view(request) as target:
+            total = 0
+            while total < length:
+                # Release the slice even when the read fails, or the pool cannot unmap the buffer
+                with target[total:] as rest:
+                    count = os.preadv(fd, [rest], offset + total)
+                if count == 0:
+                    break
+                total += count
+        return buffer.view(min(total, length))
+
+    @staticmethod
+    def select_blocks(block_count, fraction):
+        """
+        Indices of the blocks to read for a fractional verification, spread evenly
+
+        Args:
+            block_count (int): Blocks on the device
+            fraction (float): Share of blocks to read (0 < fraction <= 1)
+
+        Returns:
+            list: Block indices in ascending order
+        """
+        if fraction >= 1:
+            return list(range(block_count))
+        wanted = max(1, int(block_count * fraction + 0.5))
+        return sorted({int(k * block_count / wanted) for k in range(wanted)})
+
+    def _mismatch_extents(self, expected, view, offset, skip=0):
+        """Sector-granular [start, end) extents of `view` that differ from `expected[skip:]`"""
+        extents = []
+        length = len(view)
+        step = 1024 * 1024
+        # Narrow down in two levels: 1 MiB regions, then sectors inside failing regions
+        for region in range(0, length, step):
+            region_end = min(region + step, length)
+            if expected.startswith(view[region:region_end], skip + region):
+                continue
+            for sector in range(region, region_end, VERIFY_SECTOR):
+                sector_end = min(sector + VERIFY_SECTOR, region_end)
+                if expected.startswith(view[sector:sector_end], skip + sector):
+                    continue
+                _merge_extent(extents, (offset + sector, offset + sector_end))
+        return extents
+
+    def _record_verified(self, start, end, extents):
+        """Mark the parts of [start, end) outside the mismatch extents as verified"""
+        if self.coverage is None:
+            return
+        position = start
+        for extent_start, extent_end in extents:
+            self.coverage.mark(position, extent_start)
+            position = max(position, extent_end)
+        self.coverage.mark(position, end)
+
+    def _is_known_bad(self, start, end):
+        return any(bad_start < end and bad_end > start for bad_start, bad_end in self.known_bad)
+
+    def _known_bad_sectors(self, size):
+        """Verification sectors of a `size`-byte device that overlap the known-bad ranges"""
+        sectors = set()
+        for bad_start, bad_end in self.known_bad:
+            bad_end = min(bad_end, size)
+            if bad_start < bad_end:
+                sectors.update(range(bad_start // VERIFY_SECTOR, -(-bad_end // VERIFY_SECTOR)))
+        return len(sectors)
+
+    def _check_by_sector(self, fd, buffer, expected, offset, length, pattern, reusable):
+        """
+        Check a block whose read failed one sector at a time
+
+        Returns:
+            list: Mismatching and unexplained unreadable extents
+        """
+        if not reusable:
+            with memoryview(expected)[:length] as target:
+                pattern.fill(target, offset)
+
+        extents = []
+        for sector in range(0, length, VERIFY_SECTOR):
+            start = offset + sector
+            end = start + min(VERIFY_SECTOR, length - sector)
+            try:
+                with self._read(fd, buffer, start, end - start) as view:
+                    matches = len(view) == end - start and expected.startswith(view, sector)
+            except OSError as e:
+                if e.errno not in MEDIA_ERRNOS:
+                    raise
+                if self._is_known_bad(start, end):
+                    self.unreadable_bytes += end - start
+                    continue
+                matches = False
+            if matches:
+                self._record_verified(start, end, [])
+            else:
+                _merge_extent(extents, (start, end))
+        return extents
+
+    def _check_block(self, expected, view, offset, pattern, reusable):
+        """
+        Compare one block read from `offset` with the pattern
+
+        Returns:
+            list: Mismatching extents (empty when the block matches)
+        """
+        if not reusable:
+            with memoryview(expected)[:len(view)] as target:
+                pattern.fill(target, offset)
+        if expected.startswith(view):
+            return []
+        return self._mismatch_extents(expected, view, offset)
+
+    def _block_size(self, budget, size):
+        """
+        Read size that fits the memory budget three times over (two read
+        buffers and the expected data), kept a multiple of 3 sectors so
+        3-byte patterns stay in phase
+        """
+        unit = 3 * VERIFY_SECTOR
+        block_size = min(self.block_size, max(unit, budget.limit // 3 // unit * unit))
+        return min(block_size, max(VERIFY_SECTOR, -(-size // VERIFY_SECTOR) * VERIFY_SECTOR))
+
+    def verify(self, pattern, fraction=1.0, description="verify"):
+        """
+        Read the device back and compare it with a pattern
+
+        Args:
+            pattern: Object with fill(view, offset) and an optional period
+                (FixedPattern or the KeystreamPattern of the final pass)
+            fraction (float): Share of the device to read, spread evenly
+            description (str): Label used in progress messages
+
+        Returns:
+            dict: Result with status PASS/FAIL, bytes checked and mismatch extents
+        """
+        if not 0 < fraction <= 1:
+            raise ValueError("Verification fraction must be in (0, 1]")
+
+        fd, direct_active = self._open()
+        self.is_running = True
+        budget = memory_budget()
+        pool = None
+        buffers = []
+        reserved = 0
+
+        try:
+            size = os.lseek(fd, 0, os.SEEK_END)
+            block_size = self._block_size(budget, size)
+            blocks = self.select_blocks(-(-size // block_size), fraction)
+
+            # Two read buffers (one in flight, one being checked) plus the expected data
+            pool = BufferPool(block_size)
+            buffers = [pool.acquire() for _ in range(2)]
+            budget.reserve(block_size)
+            reserved = block_size
+            expected = bytearray(block_size)
+
+            # Fixed patterns whose period divides the block are identical for every block
+            reusable = bool(pattern.period) and block_size % pattern.period == 0
+            if reusable:
+                pattern.fill(memoryview(expected), 0)
+
+            bytes_checked = 0
+            mismatched_bytes = 0
+            extents = []
+            start_time = time.time()
+            last_report = start_time
+
+            with ThreadPoolExecutor(max_workers=1) as reader:
+                def submit(position):
+                    offset = blocks[position] * block_size
+                    length = min(block_size, size - offset)
+                    return reader.submit(self._read, fd, buffers[position % 2], offset, length), offset, length
+
+                pending = submit(0) if blocks else None
+                try:
+                    for position in range(len(blocks)):
+                        if not self.is_running:
+                            break
+                        future, offset, length = pending
+                        pending = None
+                        try:
+                            view = future.result()
+                        except OSError as e:
+                            if e.errno not in MEDIA_ERRNOS:
+                                raise
+                            view = None
+                        pending = submit(position + 1) if position + 1 < len(blocks) else None
+
+                        if view is None:
+                            # A media error somewhere in the block: narrow it down to sectors
+                            self.logger.warning(f"Read error in block at {offset:,}; checking it sector by sector")
+                            block_extents = self._check_by_sector(fd, buffers[position % 2], expected, offset,
+                                                                  length, pattern, reusable)
+                            if self.digest is not None:
+                                self.digest = None
+                                self.logger.warning("Device digest dropped: part of the device cannot be read")
+                        else:
+                            with view:
+                                if len(view) < length:
+                                    raise IOError(f"Short read at offset {offset + len(view)} of {self.device_path}")
+                                block_extents = self._check_block(expected, view, offset, pattern, reusable)
+                                self._record_verified(offset, offset + length, block_extents)
+                                if self.digest is not None:
+                                    self.digest.update(offset, view)
+                        for extent in block_extents:
+                            mismatched_bytes += extent[1] - extent[0]
+                            _merge_extent(extents, extent)
+                        bytes_checked += length
+
+                        now = time.time()
+                        if self.callback and (now - last_report >= PROGRESS_INTERVAL or position + 1 == len(blocks)):
+                            last_report = now
+                            speed = (bytes_checked / (1024 * 1024)) / (now - start_time) if now > start_time else 0
+                            self.callback(
+                                f"{description}: {bytes_checked:,} bytes checked @ {speed:.1f} MB/s",
+                                round((position + 1) / len(blocks) * 100, 1)
+                            )
+                finally:
+                    # Release the read-ahead buffer's view before the pool is closed
+                    if pending:
+                        try:
+                            pending[0].result().release()
+                        except OSError:
+                            pass
+
+            elapsed = time.time() - start_time
+            complete = self.is_running
+            return {
+                'status': PASS if complete and not extents else FAIL,
+                'mode': 'read-back',
+                'pattern': pattern.name,
+                'device_size': size,
+                'fraction': fraction,
+                'bytes_checked': bytes_checked,
+                'mismatched_bytes': mismatched_bytes,
+                'mismatch_extents': [list(extent) for extent in extents[:MAX_REPORTED_EXTENTS]],
+                'extent_count': len(extents),
+                'sector_size': VERIFY_SECTOR,
+                'unreadable_bad_sector_bytes': self.unreadable_bytes,
+                'direct_io': direct_active,
+                'complete': complete,
+                'seconds': round(elapsed, 3),
+                'mb_per_sec': round((bytes_checked / (1024 * 1024)) / elapsed, 1) if elapsed > 0 else None,
+            }
+        finally:
+            self.is_running = False
+            for buffer in buffers:
+                buffer.release()
+            if pool is not None:
+                pool.close()
+            if reserved:
+                budget.release(reserved)
+            os.close(fd)
+
+    def verify_sampled(self, pattern, samples=None, residual_fraction=DEFAULT_RESIDUAL_FRACTION,
+                       seed=None, queue_depth=SAMPLE_QUEUE_DEPTH, description="sampled verify"):
+        """
+        Read a stratified random sample of sectors back and compare them with a pattern
+
+        Args:
+            pattern: Pattern source of the final pass
+            samples (int): Sectors to read (default: enough for DEFAULT_CONFIDENCE
+                at `residual_fraction`)
+            residual_fraction (float): Share of unwiped data the detection probability is reported for
+            seed (int): Plan seed (default: fresh from the kernel); recorded in the result
+            queue_depth (int): Sector reads kept in flight
+            description (str): Label used in progress messages
+
+        Returns:
+            dict: Result with status PASS/FAIL, the sample plan and the detection probability
+        """
+        if not samples:
+            samples = samples_for_confidence(residual_fraction)
+        if seed is None:
+            seed = secrets.randbits(64)
+
+        fd, direct_active = self._open()
+        self.is_running = True
+        pool = None
+        buffers = []
+
+        try:
+            size = os.lseek(fd, 0, os.SEEK_END)
+            offsets = sample_plan(size, samples, seed)
+            workers = max(1, min(queue_depth, len(offsets)))
+            pool = BufferPool(VERIFY_SECTOR)
+            buffers = [pool.acquire() for _ in range(workers)]
+            lock = threading.Lock()
+            checked = [0, 0, 0]   # samples, bytes, samples on known-bad sectors
+
+            def check(worker):
+                # Each worker walks every `workers`-th sample in ascending order with its own buffer
+                buffer = buffers[worker]
+                expected = bytearray(VERIFY_SECTOR)
+                failed = []
+                for offset in offsets[worker::workers]:
+                    if not self.is_running:
+                        break
+                    length = min(VERIFY_SECTOR, size - offset)
+                    known_bad = self._is_known_bad(offset, offset + length)
+                    try:
+                        with self._read(fd, buffer, offset, length) as view:
+                            if len(view) < length:
+                                raise IOError(f"Short read at offset {offset + len(view)} of {self.device_path}")
+                            with memoryview(expected)[:length] as target:
+                                pattern.fill(target, offset)
+                            if not expected.startswith(view):
+                                failed.append((offset, offset + length))
+                    except OSError as e:
+                        if e.errno not in MEDIA_ERRNOS:
+                            raise
+                        if known_bad:
+                            with lock:
+                                self.unreadable_bytes += length
+                        else:
+                            failed.append((offset, offset + length))
+                    with lock:
+                        checked[0] += 1
+                        checked[1] += length
+                        checked[2] += known_bad
+                return failed
+
+            start_time = time.time()
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = [executor.submit(check, worker) for worker in range(workers)]
+                pending = set(futures)
+                while pending:
+                    _, pending = wait(pending, timeout=PROGRESS_INTERVAL)
+                    if self.callback:
+                        self.callback(f"{description}: {checked[0]:,}/{len(offsets):,} samples checked",
+                                      round(checked[0] / len(offsets) * 100, 1) if offsets else 100.0)
+                failed = sorted(extent for future in futures for extent in future.result())
+
+            extents = []
+            for extent in failed:
+                _merge_extent(extents, extent)
+            elapsed = time.time() - start_time
+            bytes_checked = checked[1]
+            complete = self.is_running
+            sectors = -(-size // VERIFY_SECTOR)
+            # Sectors the wipe could not write say nothing about leftover data on the rest
+            bad_sectors = self._known_bad_sectors(size)
+            counted = checked[0] - checked[2]
+            # Reading every sector detects any amount of leftover data
+            if counted and counted == sectors - bad_sectors:
+                probability = 1.0
+            else:
+                probability = detection_probability(counted, residual_fraction)
+
+            return {
+                'status': PASS if complete and not failed else FAIL,
+                'mode': 'sampled',
+                'pattern': pattern.name,
+                'device_size': size,
+                'fraction': round(bytes_checked / size, 6) if size else 0,
+                'bytes_checked': bytes_checked,
+                'mismatched_bytes': sum(end - start for start, end in failed),
+                'mismatch_extents': [list(extent) for extent in extents[:MAX_REPORTED_EXTENTS]],
+                'extent_count': len(extents),
+                'sector_size': VERIFY_SECTOR,
+                'unreadable_bad_sector_bytes': self.unreadable_bytes,
+                'sample_plan': {
+                    'method': 'stratified',
+                    'generator': 'random.Random (MT19937)',
+                    'seed': seed,
+                    'samples': len(offsets),
+                    'stratum_sectors': round(sectors / len(offsets), 3) if offsets else 0,
+                    'queue_depth': workers,
+                },
+                'detection': {
+                    'residual_fraction': residual_fraction,
+                    'probability': probability,
+                    'failed_samples': len(failed),
+                    'known_bad_samples': checked[2],
+                },
+                'direct_io': direct_active,
+                'complete': complete,
+                'seconds': round(elapsed, 3),
+                'mb_per_sec': round((bytes_checked / (1024 * 1024)) / elapsed, 1) if elapsed > 0 else None,
+            }
+        finally:
+            self.is_running = False
+            for buffer in buffers:
+                buffer.release()
+            if pool is not None:
+                pool.close()
+            os.close(fd)
+
+
+class StreamingVerifier(WipeVerifier):
+    """
+    Fused write-then-verify: reads regions back while later regions are written
+
+    A background thread follows the writer's contiguous high-water mark and
+    verifies each region once the write front is `lag` bytes past its end,
+    so the final pass and its verification finish almost together. Reads
+    use their own O_DIRECT descriptor, so they come from the device rather
+    than from the page cache. When the pass was resumed, the part an earlier
+    run wrote is already on the device and is verified first.
+    """
+
+    def __init__(self, device_path, pattern, written, region_size=VERIFY_REGION_SIZE, lag=VERIFY_LAG,
+                 start=0, block_size=VERIFY_BLOCK_SIZE, direct=True, coverage=None, digest=None):
+        """
+        Args:
+            device_path (str): Device or file being written
+            pattern: Pattern source of the pass being written
+            written (callable): Returns the writer's contiguous high-water offset
+            region_size (int): Bytes per reported region (multiple of VERIFY_SECTOR)
+            lag (int): Bytes the write front must be past a region before it is read
+            start (int): First offset written by this session (resumed passes); bytes
+                before it were written by an earlier run and are read back without waiting
+            block_size (int): Bytes per read
+            direct (bool): Read with O_DIRECT
+            coverage (CoverageMap): Marked with every range that reads back correctly
+            digest (MerkleDigest): Fed every block read, to hash the device's contents
+        """
+        super().__init__(device_path, block_size, direct, coverage=coverage, digest=digest)
+        if region_size <= 0 or region_size % VERIFY_SECTOR:
+            raise ValueError(f"Region size must be a multiple of {VERIFY_SECTOR} bytes")
+
+        self.pattern = pattern
+        self.written = written
+        self.region_size = region_size
+        self.lag = max(0, lag)
+        self.start_offset = start
+        self.size = 0
+        self.direct_active = False
+        self.regions = []
+        self.error = None
+        self._final = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Start following the write front"""
+        self.is_running = True
+        self._thread = threading.Thread(target=self._run, name="trustwipe-verify", daemon=True)
+        self._thread.start()
+        return self
+
+    def _wait_for(self, offset, size):
+        """Wait until `offset` is written and the lag window is clear; False if the writer stopped short"""
+        target = min(size, offset + self.lag)
+        while self.is_running:
+            written = self.written()
+            if written >= target:
+                return True
+            if self._final.is_set():
+                # The pass is over; whatever was written is all there will be
+                return self.written() >= offset
+            self._final.wait(WRITE_FRONT_POLL)
+        return False
+
+    def _run(self):
+        fd, self.direct_active = self._open()
+        budget = memory_budget()
+        pool = None
+        buffer = None
+        reserved = 0
+
+        try:
+            size = os.lseek(fd, 0, os.SEEK_END)
+            self.size = size
+            block_size = self._block_size(budget, size)
+            pool = BufferPool(block_size)
+            buffer = pool.acquire()
+            budget.reserve(block_size)
+            reserved = block_size
+            expected = bytearray(block_size)
+
+            reusable = bool(self.pattern.period) and block_size % self.pattern.period == 0
+            if reusable:
+                self.pattern.fill(memoryview(expected), 0)
+
+            region_start = 0
+            while region_start < size:
+                region_end = min(region_start + self.region_size, size)
+                if region_end > self.start_offset and not self._wait_for(region_end, size):
+                    break
+
+                region_begin = time.time()
+                extents = []
+                mismatched = 0
+                offset = region_start
+                while offset < region_end:
+                    # A reusable expected block holds the pattern as it appears at any
+                    # block-aligned offset, so a read starting mid-block compares
+                    # against it from the same position
+                    skip = offset % block_size if reusable else 0
+                    length = min(block_size - skip, region_end - offset)
+                    with self._read(fd, buffer, offset, length) as view:
+                        if len(view) < length:
+                            raise IOError(f"Short read at offset {offset + len(view)} of {self.device_path}")
+                        if not reusable:
+                            with memoryview(expected)[:length] as target:
+                                self.pattern.fill(target, offset)
+                        block_extents = []
+                        if not expected.startswith(view, skip):
+                            block_extents = self._mismatch_extents(expected, view, offset, skip)
+                            extents += block_extents
+                        self._record_verified(offset, offset + length, block_extents)
+                        if self.digest is not None:
+                            self.digest.update(offset, view)
+                    offset += length
+
+                merged = []
+                for extent in extents:
+                    mismatched += extent[1] - extent[0]
+                    _merge_extent(merged, extent)
+                self.regions.append({
+                    'start': region_start,
+                    'end': region_end,
+                    'status': FAIL if merged else PASS,
+                    'mismatched_bytes': mismatched,
+                    'mismatch_extents': [list(extent) for extent in merged[:MAX_REPORTED_EXTENTS]],
+                    'seconds': round(time.time() - region_begin, 3),
+                })
+                region_start = region_end
+        except Exception as e:
+            self.error = e
+            self.logger.error(f"Fused verification failed: {e}")
+        finally:
+            if buffer is not None:
+                buffer.release()
+            if pool is not None:
+                pool.close()
+            if reserved:
+                budget.release(reserved)
+            os.close(fd)
+
+    def finish(self, timeout=None):
+        """
+        Tell the verifier the pass is over and wait for it to check what was written
+
+        Returns:
+            dict: Result with overall status and per-region statuses
+        """
+        self._final.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self.is_running = False
+
+        size = self.size
+        verified_to = self.regions[-1]['end'] if self.regions else 0
+        regions = list(self.regions)
+        if verified_to < size:
+            regions.append({'start': verified_to, 'end': size, 'status': NOT_VERIFIED})
+
+        failed = [region for region in self.regions if region['status'] == FAIL]
+        bytes_checked = sum(region['end'] - region['start'] for region in self.regions)
+        seconds = sum(region['seconds'] for region in self.regions)
+        extents = [extent for region in failed for extent in region['mismatch_extents']]
+        complete = self.error is None and verified_to >= size
+
+        return {
+            'status': PASS if complete and not failed else FAIL,
+            'mode': 'fused',
+            'pattern': self.pattern.name,
+            'device_size': size,
+            'fraction': round(bytes_checked / size, 6) if size else 0,
+            'bytes_checked': bytes_checked,
+            'mismatched_bytes': sum(region['mismatched_bytes'] for region in failed),
+            'mismatch_extents': extents[:MAX_REPORTED_EXTENTS],
+            'extent_count': len(extents),
+            'sector_size': VERIFY_SECTOR,
+            'region_size': self.region_size,
+            'lag': self.lag,
+            'regions': regions,
+            'direct_io': self.direct_active,
+            'complete': complete,
+            'error': str(self.error) if self.error else None,
+            'seconds': round(seconds, 3),
+            'mb_per_sec': round((bytes_checked / (1024 * 1024)) / seconds, 1) if seconds > 0 else None,
+        }
+
+
+def verify_device(device_path, pattern, fraction=1.0, callback=None, samples=None,
+                  residual_fraction=DEFAULT_RESIDUAL_FRACTION, seed=None, coverage=None, digest=None,
+                  known_bad=None):
+    """
+    Verify a wiped device against the pattern of its final pass
+
+    Args:
+        device_path (str): Device or file to read back
+        pattern: FixedPattern/KeystreamPattern of the final pass, or None if unknown
+        fraction (float): Share of the device to read
+        callback (callable): Progress callback (message, progress)
+        samples (int): Read a stratified sample of this many sectors instead
+            (0 = enough for DEFAULT_CONFIDENCE at `residual_fraction`)
+        residual_fraction (float): Leftover-data share sampled results report a detection probability for
+        seed (int): Sample plan seed (default: random)
+        coverage (CoverageMap): Marked with the ranges a read-back confirmed
+            (sampled sectors are smaller than its blocks and are not marked)
+        digest (MerkleDigest): Fed the device's contents (complete only for a full read-back)
+        known_bad (list): Ranges the wipe recorded as unwritable
+
+    Returns:
+        dict: Verification result
+    """
+    if pattern is None:
+        return skipped_result("final pass pattern is not reproducible")
+    verifier = WipeVerifier(device_path, callback=callback, coverage=coverage, digest=digest, known_bad=known_bad)
+    if samples is not None:
+        return verifier.verify_sampled(pattern, samples, residual_fraction, seed)
+    return verifier.verify(pattern, fraction)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check a wiped device against its final pattern")
+    parser.add_argument('device', help='Device or file to read back')
+    parser.add_argument('pattern', nargs='?', default='zeros',
+                        help='zeros, ones, a hex byte sequence, or random (needs --seed-file)')
+    parser.add_argument('fraction', nargs='?', type=float, default=1.0, help='Share of the device to read')
+    parser.add_argument('--samples', type=int, nargs='?', const=0, metavar='N',
+                        help='Read N stratified random sectors (no N: enough for 99%% confidence)')
+    parser.add_argument('--residual-fraction', type=float, default=DEFAULT_RESIDUAL_FRACTION,
+                        help='Unwiped share the detection probability is reported for (default: 0.001)')
+    parser.add_argument('--seed', type=int, help='Sample plan seed, to re-read a recorded plan')
+    parser.add_argument('--seed-file', help='Pattern seed saved by the wipe, to regenerate a random pass')
+    parser.add_argument('--pass', dest='pass_number', type=int, default=1,
+                        help='Random pass to regenerate, as numbered in the certificate (default: 1)')
+    parser.add_argument('--algorithm', choices=ALGORITHMS, default=DEFAULT_ALGORITHM,
+                        help='Keystream algorithm recorded in the certificate')
+    args = parser.parse_args()
+
+    if args.pattern == 'random':
+        if not args.seed_file:
+            parser.error("random pattern needs --seed-file")
+        seed = read_seed_file(args.seed_file)
+        # Compare with the certificate's commitment before trusting the result
+        print(f"🔑 Seed commitment: {seed_commitment(seed)}")
+        expected = KeystreamPattern(key=pass_key(seed, args.pass_number - 1), algorithm=args.algorithm)
+    else:
+        patterns = {'zeros': b'\x00', 'ones': b'\xFF'}
+        expected = FixedPattern(patterns.get(args.pattern) or bytes.fromhex(args.pattern), args.pattern)
+
+    def progress_display(message, progress):
+        print(f"\r🔍 {message} [{progress:.1f}%]", end="", flush=True)
+
+    result = verify_device(args.device, expected, args.fraction, progress_display,
+                           args.samples, args.residual_fraction, args.seed)
+    print()
+    print(f"{'✅' if result['status'] == PASS else '❌'} {result['status']}: "
+          f"{result['bytes_checked']:,} bytes checked @ {result['mb_per_sec']} MB/s, "
+          f"{result['mismatched_bytes']:,} bytes in {result['extent_count']} mismatching extents")
+    if 'sample_plan' in result:
+        plan, detection = result['sample_plan'], result['detection']
+        print(f"🎯 {plan['samples']:,} stratified samples (seed {plan['seed']}): "
+              f"{detection['probability']:.2%} chance of catching "
+              f"{detection['residual_fraction']:.3%} unwiped data")
+    for start, end in result['mismatch_extents'][:10]:
+        print(f"   {start:,} - {end:,}")
+    sys.exit(0 if result['status'] == PASS else 2)
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+TrustWipe Write Pipeline
+Producer/consumer stage that overlaps pattern generation with device writes
+
+Producers claim the next chunk of the target, fill a free pooled buffer from
+the pattern source and hand it on; consumers write filled buffers and return
+them to the free queue. The buffers themselves are the bounded queue, so a
+fast producer blocks until a consumer frees a buffer (back-pressure) and no
+memory is allocated while the pass runs.
+
+Stall metrics show which side is the bottleneck: producer stall is time spent
+waiting for a free buffer (I/O bound), consumer stall is time spent waiting
+for filled data (generation bound).
+"""
+
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+POLL_INTERVAL = 0.1   # How often blocked stages check for a stop request
+
+
+class WriteWatermark:
+    """Contiguous written prefix for chunks issued in order but completed out of order"""
+
+    def __init__(self, start=0):
+        """
+        Args:
+            start (int): Offset the first chunk starts at
+        """
+        self.offset = start
+        self._done = {}
+        self._lock = threading.Lock()
+
+    def complete(self, start, end):
+        """Record [start, end) as written and advance past any now-contiguous chunks"""
+        with self._lock:
+            self._done[start] = end
+            while self.offset in self._done:
+                self.offset = self._done.pop(self.offset)
+
+
+class WritePipeline:
+    """Bounded producer/consumer pipeline over a fixed set of pooled buffers"""
+
+    def __init__(self, buffers, pattern, write, size, producers=1, consumers=1, start=0, completed=None):
+        """
+        Args:
+            buffers (list): PooledBuffer objects cycled through the pipeline
+            pattern: Object with fill(view, offset)
+            write (callable): write(view, offset) called by consumers
+            size (int): End of the range to cover
+            producers (int): Threads generating pattern data
+            consumers (int): Threads writing filled buffers
+            start (int): Offset to start at (resumed passes)
+            completed (callable): Called with (start, end) as each chunk is written
+        """
+        if not buffers:
+            raise ValueError("WritePipeline needs at least one buffer")
+
+        self.pattern = pattern
+        self.write = write
+        self.completed = completed
+        self.size = size
+        self.producers = max(1, producers)
+        self.consumers = max(1, consumers)
+        self.chunk_size = min(len(buffer) for buffer in buffers)
+        self.depth = len(buffers)
+        self.bytes_done = 0
+        self.is_running = True
+
+        self._free = queue.Queue()
+        for buffer in buffers:
+            self._free.put(buffer)
+        self._filled = queue.Queue()
+        self._next_offset = start
+        self.watermark = WriteWatermark(start)
+        self._producers_left = self.producers
+        self._lock = threading.Lock()
+
+        self.stats = {
+            'producers': self.producers,
+            'consumers': self.consumers,
+            'buffers': self.depth,
+            'fill_seconds': 0.0,
+            'write_seconds': 0.0,
+            'producer_stall_seconds': 0.0,
+            'consumer_stall_seconds': 0.0,
+        }
+
+    @property
+    def high_water(self):
+        """End of the contiguous range written so far"""
+        return self.watermark.offset
+
+    def stop(self):
+        """Ask every stage to finish its current chunk and exit"""
+        self.is_running = False
+
+    def _add_stat(self, key, seconds):
+        with self._lock:
+            self.stats[key] += seconds
+
+    def _claim(self):
+        """Next (offset, length) chunk of the target, or None when all are claimed"""
+        with self._lock:
+            offset = self._next_offset
+            if offset >= self.size:
+                return None
+            length = min(self.chunk_size, self.size - offset)
+            self._next_offset += length
+            return offset, length
+
+    def _get(self, source, stall_key):
+        """Take an item from a queue, timing the wait and honouring stop()"""
+        start = time.time()
+        try:
+            while True:
+                try:
+                    return source.get(timeout=POLL_INTERVAL)
+                except queue.Empty:
+                    if not self.is_running:
+                        return None
+        finally:
+            self._add_stat(stall_key, time.time() - start)
+
+    def _produce(self):
+        try:
+            while self.is_running:
+                buffer = self._get(self._free, 'producer_stall_seconds')
+                if buffer is None:
+                    break
+
+                chunk = self._claim()
+                if chunk is None:
+                    self._free.put(buffer)
+                    break
+
+                offset, length = chunk
+                view = buffer.view(length)
+                start = time.time()
+                try:
+                    self.pattern.fill(view, offset)
+                except Exception:
+                    view.release()
+                    self._free.put(buffer)
+                    raise
+                self._add_stat('fill_seconds', time.time() - start)
+                self._filled.put((buffer, view, offset))
+        finally:
+            with self._lock:
+                self._producers_left -= 1
+                last = self._producers_left == 0
+            if last:
+                # One end-of-stream marker per consumer
+                for _ in range(self.consumers):
+                    self._filled.put(None)
+
+    def _consume(self):
+        while True:
+            item = self._get(self._filled, 'consumer_stall_seconds')
+            if item is None:
+                break
+
+            buffer, view, offset = item
+            length = len(view)
+            start = time.time()
+            try:
+                self.write(view, offset)
+            finally:
+                view.release()
+                self._free.put(buffer)
+            self._add_stat('write_seconds', time.time() - start)
+            self.watermark.complete(offset, offset + length)
+            if self.completed:
+                self.completed(offset, offset + length)
+            with self._lock:
+                self.bytes_done += length
+
+    def _run_stage(self, stage):
+        try:
+            stage()
+        except Exception:
+            # Stop the other stages so the pass fails fast
+            self.is_running = False
+            raise
+
+    def run(self, report=None, interval=0.5):
+        """
+        Run the pipeline to completion
+
+        Args:
+            report (callable): Called with bytes written every `interval` seconds
+            interval (float): Seconds between progress reports
+
+        Returns:
+            int: Bytes written
+        """
+        workers = self.producers + self.consumers
+        try:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                futures = [pool.submit(self._run_stage, self._consume) for _ in range(self.consumers)]
+                futures += [pool.submit(self._run_stage, self._produce) for _ in range(self.producers)]
+                pending = set(futures)
+                while pending:
+                    _, pending = wait(pending, timeout=interval)
+                    if report:
+                        report(self.bytes_done)
+
+                for future in futures:
+                    future.result()
+        finally:
+            # Release views still queued after a stop or failure
+            while True:
+                try:
+                    item = self._filled.get_nowait()
+                except queue.Empty:
+                    break
+                if item is not None:
+                    buffer, view, _ = item
+                    view.release()
+                    self._free.put(buffer)
+
+        for key in ('fill_seconds', 'write_seconds', 'producer_stall_seconds', 'consumer_stall_seconds'):
+            self.stats[key] = round(self.stats[key], 3)
+        return self.bytes_done